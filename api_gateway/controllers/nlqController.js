@@ -43,7 +43,7 @@ const handleGetCollections = async (req, res) => {
 // POST /run-nlp — forward URI + db + collection + NL query + pagination, receive results
 const handleRunNLP = async (req, res) => {
     try {
-        const { mongo_uri, database_name, collection_name, query, page, page_size, history, user_email } = req.body;
+        const { mongo_uri, database_name, collection_name, query, page, page_size, pagination_mode, after, history, user_email } = req.body;
         if (!mongo_uri || !database_name || !collection_name || !query) {
             return res.status(400).json({
                 error: "mongo_uri, database_name, collection_name, and query are required",
@@ -57,6 +57,8 @@ const handleRunNLP = async (req, res) => {
         };
         if (page !== undefined) payload.page = page;
         if (page_size !== undefined) payload.page_size = page_size;
+        if (pagination_mode !== undefined) payload.pagination_mode = pagination_mode;
+        if (after !== undefined && after !== null) payload.after = after;
         if (history && Array.isArray(history) && history.length > 0) payload.history = history;
         if (user_email) payload.user_email = user_email;
 
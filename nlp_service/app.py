@@ -18,24 +18,37 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:          # orjson not installed — stdlib json fallback
+    orjson = None
+
 from parser import parse_to_ir
-from llm_parser import parse_with_llm
+from llm_parser import parse_with_llm, clear_llm_cache
 from ir_validator import validate_ir, resolve_field_name
 from ir_compiler import compile_ir_to_mongo
 from config import PARSER_MODE
-from cluster_manager import list_databases, list_collections
-from db_executor import execute_query, stream_query, MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE
+from cluster_manager import list_databases, list_collections, sample_field_types
+from db_executor import (
+    execute_query,
+    stream_query_async,
+    MAX_PAGE_SIZE,
+    DEFAULT_PAGE_SIZE,
+    PAGINATION_SKIP,
+    PAGINATION_KEYSET,
+)
 from schema_utils import (
     get_cached_schema,
+    get_cached_indexes,
     get_collection_indexes,
-    get_indexed_fields,
     clear_schema_cache,
     invalidate_schema,
+    needs_sanitise,
 )
-from response_formatter import format_response, _sanitise_value
+from response_formatter import format_response, _sanitise_leaf, _sanitise_value
 from activity_tracker import (
     log_activity,
     get_commit_timeline,
@@ -48,10 +61,41 @@ from activity_tracker import (
 from logger import logger
 
 
-app = FastAPI(title="NLP MongoDB Interface", version="2.0.0")
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded by orjson when installed (stdlib ``json``
+    otherwise); values neither can encode natively go through the same
+    conversion as ``clean_documents`` (bytes decoded, the rest ``str``)."""
 
-# Clear schema cache on startup/reload so type changes are picked up
-clear_schema_cache()
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            try:
+                return orjson.dumps(
+                    content,
+                    default=_sanitise_leaf,
+                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                )
+            except TypeError:    # e.g. ints beyond 64 bits
+                pass
+        return json.dumps(
+            content,
+            default=_sanitise_leaf,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+app = FastAPI(
+    title="NLP MongoDB Interface",
+    version="2.0.0",
+    default_response_class=FastJSONResponse,
+)
+
+# Drop this process's schema copies on startup/reload; the shared disk
+# cache is left alone so restarting one worker doesn't wipe it for the
+# others (its entries expire after SCHEMA_DISK_CACHE_TTL)
+clear_schema_cache(shared=False)
 
 app.add_middleware(
     CORSMiddleware,
@@ -85,6 +129,15 @@ class NLPRequest(BaseModel):
         le=MAX_PAGE_SIZE,
         description=f"Results per page (max {MAX_PAGE_SIZE})",
     )
+    pagination_mode: str = Field(
+        default=PAGINATION_SKIP,
+        pattern=f"^({PAGINATION_SKIP}|{PAGINATION_KEYSET})$",
+        description="'skip' (page numbers) or 'keyset' (pass next_cursor as after)",
+    )
+    after: Optional[Any] = Field(
+        default=None,
+        description="next_cursor from the previous page (implies keyset pagination)",
+    )
     history: Optional[List[Dict[str, str]]] = Field(
         default=None,
         description="Conversation history as [{role, content}, ...]",
@@ -131,6 +184,16 @@ class CommitRequest(BaseModel):
     )
 
 
+# ---------------------- HELPERS ----------------------
+
+
+def _ndjson_line(obj: Dict[str, Any]) -> bytes:
+    """Encode *obj* as one NDJSON line; BSON leftovers fall back to ``str``."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str) + b"\n"
+    return (json.dumps(obj, default=str) + "\n").encode("utf-8")
+
+
 # ---------------------- ENDPOINTS ----------------------
 
 
@@ -193,8 +256,9 @@ def get_indexes(request: SchemaRequest):
 
 @app.post("/clear-cache")
 def clear_cache():
-    """Clear the in-memory schema cache."""
+    """Clear the in-memory schema and LLM response caches."""
     clear_schema_cache()
+    clear_llm_cache()
     return {"status": "cache cleared"}
 
 
@@ -232,7 +296,7 @@ def run_nlp(request: NLPRequest):
                 history=request.history,
             )
             if ir:
-                parser_used = "llm"
+                parser_used = ir["meta"].get("parser", "llm")
         except Exception as e:
             logger.warning("[PIPELINE] LLM parser error: %s — falling back", e)
 
@@ -280,13 +344,13 @@ def run_nlp(request: NLPRequest):
 
     # 6. Index inspection (never blocks execution)
     try:
-        indexes = get_collection_indexes(
+        indexes, indexed_fields = get_cached_indexes(
             request.mongo_uri,
             request.database_name,
             request.collection_name,
         )
     except Exception:
-        indexes = []
+        indexes, indexed_fields = [], set()
 
     # 7. Execute with pagination, projection, timeout
     try:
@@ -298,12 +362,16 @@ def run_nlp(request: NLPRequest):
             page=request.page,
             page_size=request.page_size,
             projection_fields=projection_fields,
+            after=request.after,
+            pagination_mode=request.pagination_mode,
         )
     except TimeoutError:
         raise HTTPException(
             status_code=408,
             detail="Query timed out. Try a more specific query.",
         )
+    except ValueError as e:    # malformed keyset cursor
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error("[PIPELINE] Step 7 — Query execution failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Query execution error: {e}")
@@ -316,11 +384,13 @@ def run_nlp(request: NLPRequest):
     )
 
     # 8. Build response with optional index warning (NEVER blocks results)
-    indexed_fields = get_indexed_fields(indexes)
     queried_fields = {c["field"] for c in validated_ir.get("conditions", [])}
     unindexed = queried_fields - indexed_fields - {"_id"}
 
-    response = format_response(validated_ir, query_result, indexes)
+    response = format_response(
+        validated_ir, query_result, indexes,
+        sanitise=needs_sanitise(field_types),
+    )
 
     # Tag which parser produced the IR
     response["parser_used"] = parser_used
@@ -393,7 +463,9 @@ def run_nlp(request: NLPRequest):
     except Exception:
         pass
 
-    return response
+    # Already JSON-safe (format_response sanitises documents), so skip
+    # FastAPI's jsonable_encoder walk over every row
+    return FastJSONResponse(response)
 
 
 @app.post("/run-nlp-stream")
@@ -440,9 +512,11 @@ def run_nlp_stream(request: NLPRequest):
 
     limit_cap = min(request.page_size, MAX_PAGE_SIZE)
 
-    def _generate():
+    # Async generator: documents are pulled via Motor on the event loop,
+    # so the worker thread is released as soon as this handler returns.
+    async def _generate():
         try:
-            for doc in stream_query(
+            async for doc in stream_query_async(
                 request.mongo_uri,
                 request.database_name,
                 request.collection_name,
@@ -451,11 +525,11 @@ def run_nlp_stream(request: NLPRequest):
                 projection_fields=projection_fields,
             ):
                 doc.pop("_id", None)
-                yield json.dumps(doc) + "\n"
+                yield _ndjson_line(doc)
         except TimeoutError:
-            yield json.dumps({"error": "Stream timed out"}) + "\n"
+            yield _ndjson_line({"error": "Stream timed out"})
         except Exception as e:
-            yield json.dumps({"error": str(e)}) + "\n"
+            yield _ndjson_line({"error": str(e)})
 
     return StreamingResponse(_generate(), media_type="application/x-ndjson")
 
@@ -468,35 +542,29 @@ def diagnose_schema(request: NLPRequest):
     Useful when fields like ``options.type`` are missing from the schema.
     Clears the cache for this collection first to force a fresh sample.
     """
-    from schema_utils import get_collection_schema, flatten_document, schema_cache, _cache_key
-    from pymongo import MongoClient
+    from schema_utils import get_collection_schema
 
     # Force fresh sample
-    key = _cache_key(request.mongo_uri, request.database_name, request.collection_name)
-    schema_cache.pop(key, None)
+    invalidate_schema(request.mongo_uri, request.database_name, request.collection_name)
 
-    # Get one sample document for raw inspection
-    client = MongoClient(request.mongo_uri, serverSelectionTimeoutMS=5000)
-    try:
-        db = client[request.database_name]
-        coll = db[request.collection_name]
-        sample_doc = coll.find_one()
-    finally:
-        client.close()
-
-    raw_doc_preview = None
-    flat_preview = None
-    if sample_doc:
-        if "_id" in sample_doc:
-            sample_doc["_id"] = str(sample_doc["_id"])
-        raw_doc_preview = {k: str(type(v).__name__) + ": " + repr(v)[:200] for k, v in sample_doc.items()}
-        flat = flatten_document(sample_doc)
-        flat_preview = {k: str(type(v).__name__) for k, v in flat.items()}
+    # Top-level BSON types across a random sample, summarised server-side
+    sample_types = sample_field_types(
+        request.mongo_uri, request.database_name, request.collection_name,
+    )
+    raw_doc_preview = (
+        {k: ", ".join(types) for k, types in sample_types.items()}
+        if sample_types else None
+    )
 
     # Now do full schema sampling
     allowed_fields, numeric_fields, field_types = get_collection_schema(
         request.mongo_uri, request.database_name, request.collection_name,
     )
+    # allowed_fields is the flattened (dot-notation) view of the sample
+    flat_preview = (
+        {f: field_types.get(f, "unknown") for f in allowed_fields}
+        if allowed_fields else None
+    )
 
     return {
         "sample_doc_types": raw_doc_preview,
@@ -525,7 +593,7 @@ def diagnose(request: NLPRequest):
     """
     trace: Dict[str, Any] = {"query": request.query, "steps": {}}
 
-    # Step 0 — Raw sample document (shows actual data structure)
+    # Step 0 — Top-level BSON types across a random sample (data structure)
     try:
         from pymongo import MongoClient
         _client = MongoClient(request.mongo_uri, serverSelectionTimeoutMS=5000)
@@ -533,33 +601,18 @@ def diagnose(request: NLPRequest):
             _db = _client[request.database_name]
             _coll = _db[request.collection_name]
             _total_docs = _coll.count_documents({})
-            _sample = _coll.find_one()
-            if _sample:
-                if "_id" in _sample:
-                    _sample["_id"] = str(_sample["_id"])
-                # Show type + truncated value for each field
-                _raw_fields: Dict[str, Any] = {}
-                for k, v in _sample.items():
-                    vtype = type(v).__name__
-                    if isinstance(v, list):
-                        preview = f"[{len(v)} items] "
-                        if v:
-                            preview += repr(v[0])[:150]
-                            if isinstance(v[0], dict):
-                                preview = f"[{len(v)} objects] keys={list(v[0].keys())}"
-                        _raw_fields[k] = f"({vtype}) {preview}"
-                    elif isinstance(v, dict):
-                        _raw_fields[k] = f"({vtype}) keys={list(v.keys())}"
-                    else:
-                        _raw_fields[k] = f"({vtype}) {repr(v)[:200]}"
-            else:
-                _raw_fields = None
-            trace["steps"]["0_raw_sample"] = {
-                "total_documents": _total_docs,
-                "sample_fields": _raw_fields,
-            }
         finally:
             _client.close()
+        _types = sample_field_types(
+            request.mongo_uri, request.database_name, request.collection_name,
+        )
+        _raw_fields = (
+            {k: ", ".join(types) for k, types in _types.items()} if _types else None
+        )
+        trace["steps"]["0_raw_sample"] = {
+            "total_documents": _total_docs,
+            "sample_fields": _raw_fields,
+        }
     except Exception as e:
         trace["steps"]["0_raw_sample"] = {"error": str(e)}
 
@@ -590,7 +643,7 @@ def diagnose(request: NLPRequest):
                 history=request.history,
             )
             if ir:
-                parser_used = "llm"
+                parser_used = ir["meta"].get("parser", "llm")
         except Exception as e:
             logger.warning("[DIAGNOSE] LLM parser error: %s", e)
     if not ir and PARSER_MODE in ("auto", "rule"):
@@ -683,10 +736,9 @@ def diagnose(request: NLPRequest):
 
     # Step 7 — Index info
     try:
-        indexes = get_collection_indexes(
+        indexes, indexed_fields = get_cached_indexes(
             request.mongo_uri, request.database_name, request.collection_name,
         )
-        indexed_fields = get_indexed_fields(indexes)
         queried_fields = {c["field"] for c in validated_ir.get("conditions", [])}
         unindexed = queried_fields - indexed_fields - {"_id"}
         trace["steps"]["7_index_info"] = {
@@ -1622,7 +1674,7 @@ def llm_status():
     else:
         api_key = os.getenv("GEMINI_API_KEY", "").strip()
         has_key = bool(api_key)
-        model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+        model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
         sdk_available = False
         try:
             from google import genai  # noqa: F401
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+NLP MongoDB Interface — Parser Regression Check
+================================================
+
+Usage:
+    python check_parser.py
+
+Runs the rule-based parser over a fixed set of phrasings that have
+regressed before and compares the conditions / sort / limit it produces
+with the expected ones.  No database, server or LLM key is needed.
+
+Exits with status 1 if any case differs.
+"""
+
+import logging
+import sys
+
+from parser import parse_to_ir
+
+logging.disable(logging.CRITICAL)
+
+SEPARATOR = "=" * 70
+
+PEOPLE = (
+    ["name", "age", "price", "rating", "address.zip"],
+    ["age", "price", "rating", "address.zip"],
+)
+NO_AGE = (["name", "title", "year"], ["year"])
+ORDERS = (
+    ["name", "age", "user_id", "invoice_amount", "address.zip"],
+    ["age", "invoice_amount", "address.zip"],
+)
+
+# (schema, query, expected conditions, expected sort, expected limit)
+CASES = [
+    # Negated comparisons flip instead of turning into equality
+    (PEOPLE, "users not less than 18",
+     [{"field": "age", "operator": "gte", "value": 18}], None, None),
+    (PEOPLE, "users no more than 30",
+     [{"field": "age", "operator": "lte", "value": 30}], None, None),
+    (PEOPLE, "users less than 18",
+     [{"field": "age", "operator": "lt", "value": 18}], None, None),
+    (NO_AGE, "age not less than 18",
+     [{"field": "year", "operator": "gte", "value": 18}], None, None),
+    (PEOPLE, "price not over 100",
+     [{"field": "price", "operator": "lte", "value": 100}], None, None),
+    # "at least N" / "at most N" are bounds; other "at <superlative>" sort
+    (PEOPLE, "price at least 30",
+     [{"field": "price", "operator": "gte", "value": 30}], None, None),
+    (PEOPLE, "rating at most 4",
+     [{"field": "rating", "operator": "lte", "value": 4}], None, None),
+    (PEOPLE, "rating at highest",
+     [], {"field": "age", "direction": "desc"}, 1),
+    (PEOPLE, "at least",
+     [], {"field": "age", "direction": "asc"}, 1),
+    (PEOPLE, "at most",
+     [], {"field": "age", "direction": "desc"}, 1),
+    (PEOPLE, "highest rating",
+     [], {"field": "rating", "direction": "desc"}, 1),
+    (PEOPLE, "top 5 rating",
+     [], {"field": "rating", "direction": "desc"}, 5),
+    # A number consumed by a multi-word field is not reused by later passes
+    (ORDERS, "user id 42",
+     [{"field": "user_id", "operator": "eq", "value": 42}], None, None),
+    (ORDERS, "invoice amount over 500",
+     [{"field": "invoice_amount", "operator": "gt", "value": 500}], None, None),
+    (ORDERS, "amount invoice under 20",
+     [{"field": "invoice_amount", "operator": "lt", "value": 20}], None, None),
+    (ORDERS, "find orders where user id is 42",
+     [{"field": "user_id", "operator": "eq", "value": 42}], None, None),
+    (ORDERS, "address zip over 500",
+     [{"field": "address.zip", "operator": "gt", "value": 500}], None, None),
+]
+
+
+def _run_case(schema, query):
+    allowed, numeric = schema
+    ir = parse_to_ir(query, allowed, numeric)
+    if ir is None:
+        return None
+    return ir.get("conditions"), ir.get("sort"), ir.get("limit")
+
+
+def main() -> int:
+    failures = 0
+    for schema, query, conditions, sort, limit in CASES:
+        got = _run_case(schema, query)
+        expected = (conditions, sort, limit)
+        if got != expected:
+            failures += 1
+            print(f"FAIL  {query!r}")
+            print(f"      expected: {expected}")
+            print(f"      got:      {got}")
+    print(SEPARATOR)
+    print(f"{len(CASES) - failures}/{len(CASES)} cases passed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
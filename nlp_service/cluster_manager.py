@@ -1,13 +1,26 @@
+from typing import Dict, List
+
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 
+from db_executor import READ_ONLY_CLIENT_OPTIONS
+
 SERVER_TIMEOUT_MS = 5000
 
 
-def connect_to_cluster(mongo_uri: str):
-    """Create and test a MongoClient connection."""
+def connect_to_cluster(mongo_uri: str, writeable: bool = False):
+    """Create and test a MongoClient connection.
+
+    Listing databases / collections is read-only, so by default the client
+    prefers secondaries (see ``READ_ONLY_CLIENT_OPTIONS``).
+    """
+    options = {} if writeable else READ_ONLY_CLIENT_OPTIONS
     try:
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=SERVER_TIMEOUT_MS)
+        client = MongoClient(
+            mongo_uri,
+            serverSelectionTimeoutMS=SERVER_TIMEOUT_MS,
+            **options,
+        )
         client.server_info()  # force connection test
         return client
     except ServerSelectionTimeoutError:
@@ -47,4 +60,30 @@ def list_collections(mongo_uri: str, database_name: str):
 
         return collections_info
     finally:
-        client.close()
\ No newline at end of file
+        client.close()
+
+
+def sample_field_types(
+    mongo_uri: str,
+    database_name: str,
+    collection_name: str,
+    sample_size: int = 10,
+) -> Dict[str, List[str]]:
+    """Return ``{top_level_field: [bson_type, ...]}`` for a random sample.
+
+    The server unpacks each sampled document with ``$objectToArray`` and
+    only ships back field names and ``$type`` aliases, so large blobs or
+    embedded arrays never cross the wire.
+    """
+    client = connect_to_cluster(mongo_uri)
+    try:
+        pipeline = [
+            {"$sample": {"size": sample_size}},
+            {"$project": {"kv": {"$objectToArray": "$$ROOT"}}},
+            {"$unwind": "$kv"},
+            {"$group": {"_id": "$kv.k", "types": {"$addToSet": {"$type": "$kv.v"}}}},
+        ]
+        rows = client[database_name][collection_name].aggregate(pipeline)
+        return {row["_id"]: sorted(row["types"]) for row in rows}
+    finally:
+        client.close()
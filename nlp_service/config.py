@@ -9,7 +9,9 @@ COLLECTION_NAME = os.getenv("COLLECTION_NAME")
 
 # ---- LLM / AI Integration ----
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
+# Optional larger model retried when GEMINI_MODEL yields no valid IR
+GEMINI_MODEL_ESCALATE = os.getenv("GEMINI_MODEL_ESCALATE", "")
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
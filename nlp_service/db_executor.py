@@ -3,8 +3,16 @@ Database executor: query execution with pagination, projection,
 timeout protection, result caps, and streaming support.
 """
 
-from typing import Any, Dict, Generator, List, Optional, Tuple
-
+import base64
+import threading
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from bson.errors import InvalidBSON
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from pymongo.errors import ExecutionTimeout
 
@@ -16,16 +24,40 @@ MAX_PAGE_SIZE = 100
 DEFAULT_PAGE_SIZE = 20
 QUERY_TIMEOUT_MS = 5000
 SERVER_SELECTION_TIMEOUT_MS = 5000
+STREAM_BATCH_SIZE = 500  # upper bound on docs per getMore while streaming
+
+# Client options for read-only traffic (NL queries, listings, counts):
+# let secondaries serve reads and skip the read-concern consistency work.
+READ_ONLY_CLIENT_OPTIONS: Dict[str, Any] = {
+    "readPreference": "secondaryPreferred",
+    "readConcernLevel": "available",
+    "maxPoolSize": 50,
+}
+
+# Pagination modes for ``execute_query``
+PAGINATION_SKIP = "skip"        # .skip()/.limit() — server walks every skipped doc
+PAGINATION_KEYSET = "keyset"    # range on the sort key — O(page_size) per page
 
 
 # ---------------------- HELPERS ----------------------
 
-def _stringify_ids(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Convert ObjectId fields to strings so they are JSON-serialisable."""
-    for doc in docs:
-        if "_id" in doc:
-            doc["_id"] = str(doc["_id"])
-    return docs
+class _ObjectIdAsStr(TypeDecoder):
+    """Decode BSON ObjectIds straight to ``str`` so results are
+    JSON-serialisable without a per-document Python pass.
+
+    Decode-only: PyMongo refuses encoders for native BSON types, and
+    filters still need real ObjectIds on the way out.
+    """
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+
+# Codec options for every read cursor in this module
+_READ_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([_ObjectIdAsStr()]))
+# ...except keyset pages, whose next_cursor needs the sort key's real type
+_KEYSET_CODEC_OPTIONS = CodecOptions()
 
 
 def _build_projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
@@ -35,14 +67,124 @@ def _build_projection(fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
     return {f: 1 for f in fields}
 
 
-def _safe_client(mongo_uri: str) -> MongoClient:
-    """Create a MongoClient with timeout protection."""
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    """Read a dot-notation *path* from *doc* (``None`` when absent)."""
+    value: Any = doc
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _encode_cursor(sort_value: Any, last_id: Any, served: int) -> str:
+    """Pack a keyset position into an opaque, URL-safe ``next_cursor``.
+
+    BSON keeps the sort value's type (dates, Decimal128, ObjectId) across
+    the JSON round-trip, so the range filter compares like with like.
+    *served* counts rows handed out so far, for the IR limit.
+    """
+    raw = bson.encode({"v": sort_value, "id": last_id, "n": served})
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(token: Any) -> Tuple[Any, Any, int]:
+    """Inverse of ``_encode_cursor``: ``(sort_value, last_id, served)``."""
+    try:
+        doc = bson.decode(base64.urlsafe_b64decode(token))
+        return doc["v"], doc["id"], int(doc["n"])
+    except (TypeError, ValueError, KeyError, InvalidBSON):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _keyset_bound(field: str, direction: int, value: Any, last_id: Any) -> Dict[str, Any]:
+    """Filter for documents after ``(value, last_id)`` in ``(field, _id)`` order."""
+    op = "$gt" if direction == 1 else "$lt"
+    if field == "_id":
+        return {"_id": {op: last_id}}
+    tie = {field: value, "_id": {op: last_id}}
+    if value is None:
+        # null / missing sorts before every other value
+        return {"$or": [{field: {"$ne": None}}, tie]} if direction == 1 else tie
+    if direction == 1:
+        return {"$or": [{field: {op: value}}, tie]}
+    # descending: null / missing values come after all the others
+    return {"$or": [{field: {op: value}}, {field: None}, tie]}
+
+
+def _safe_client(mongo_uri: str, writeable: bool = False) -> MongoClient:
+    """Create a MongoClient with timeout protection.
+
+    Read-only clients (the default) use ``READ_ONLY_CLIENT_OPTIONS``;
+    pass ``writeable=True`` to keep the driver's primary read preference.
+    """
+    options = {} if writeable else READ_ONLY_CLIENT_OPTIONS
     return MongoClient(
         mongo_uri,
         serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        **options,
+    )
+
+
+class ClientLRU:
+    """Per-URI driver clients, at most *max_size* of them.
+
+    URIs come from requests, so the cache is bounded: the least recently
+    used client is evicted and closed (along with its pool and monitor
+    tasks) once a new URI would exceed *max_size*.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], max_size: int) -> None:
+        self._factory = factory
+        self._max_size = max_size
+        self._clients: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, mongo_uri: str) -> Any:
+        """Return the cached client for *mongo_uri*, creating it once."""
+        evicted = []
+        with self._lock:
+            client = self._clients.get(mongo_uri)
+            if client is not None:
+                self._clients.move_to_end(mongo_uri)
+                return client
+            client = self._factory(mongo_uri)
+            self._clients[mongo_uri] = client
+            while len(self._clients) > self._max_size:
+                evicted.append(self._clients.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+        return client
+
+    def close_all(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+MAX_CACHED_CLIENTS = 16
+
+
+def _new_async_client(mongo_uri: str) -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(
+        mongo_uri,
+        serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        **READ_ONLY_CLIENT_OPTIONS,
     )
 
 
+# Each Motor client owns a connection pool shared by every concurrent
+# stream on the loop for that URI
+_async_clients = ClientLRU(_new_async_client, MAX_CACHED_CLIENTS)
+
+
+def _get_async_client(mongo_uri: str) -> AsyncIOMotorClient:
+    """Return the cached AsyncIOMotorClient for *mongo_uri*, creating it once."""
+    return _async_clients.get(mongo_uri)
+
+
 # ---------------------- MAIN QUERY EXECUTOR ----------------------
 
 def execute_query(
@@ -53,14 +195,27 @@ def execute_query(
     page: int = 1,
     page_size: int = DEFAULT_PAGE_SIZE,
     projection_fields: Optional[List[str]] = None,
+    after: Optional[Any] = None,
+    pagination_mode: str = PAGINATION_SKIP,
 ) -> Dict[str, Any]:
     """Execute a find or aggregate query with pagination, projection, and timeout.
 
+    Find queries support two pagination modes:
+
+    - ``skip`` (default): ``.skip((page - 1) * page_size)``.  Simple, but
+      MongoDB walks every skipped document, so deep pages get slower.
+    - ``keyset``: the client sends the previous page's ``next_cursor`` as
+      *after* and the filter becomes a range on ``(sort key, _id)``.
+      Queries without a sort are ordered by ``_id``.  Passing *after*
+      implies keyset mode; a malformed cursor raises ``ValueError``.
+
     Returns a dict with:
     - ``data``: list of documents for the current page
     - ``total_count``: total matching documents (for find queries)
     - ``page``: current page number
     - ``page_size``: effective page size
+    - ``next_cursor``: (keyset only) opaque token for the next page, or
+      ``None`` once the range (or the IR limit) is exhausted
     """
 
     # enforce hard caps
@@ -76,14 +231,41 @@ def execute_query(
     else:
         effective_limit = None
 
-    skip = (page - 1) * page_size
+    keyset = pagination_mode == PAGINATION_KEYSET or after is not None
+    skip = 0 if keyset else (page - 1) * page_size
+    # Rows already handed out by earlier pages (keyset cursors carry it)
+    served = skip
+    if keyset and after is not None:
+        after_value, after_id, served = _decode_cursor(after)
+
+    # Page lies entirely beyond the IR limit — nothing to fetch, so answer
+    # without opening a connection (stale UI page counts hit this often).
+    if (mongo_query["type"] == "find" and effective_limit is not None
+            and served >= effective_limit):
+        result = {
+            "data": [],
+            "total_count": effective_limit,
+            "page": page,
+            "page_size": page_size,
+        }
+        if keyset:
+            result["next_cursor"] = None
+        return result
+
+    # The last page before the IR limit may be a partial one
+    page_limit = page_size
+    if effective_limit is not None:
+        page_limit = min(page_size, effective_limit - served)
 
     projection = _build_projection(projection_fields)
 
     client = _safe_client(mongo_uri)
     try:
         db = client[database_name]
-        collection = db[collection_name]
+        collection = db.get_collection(
+            collection_name,
+            codec_options=_KEYSET_CODEC_OPTIONS if keyset else _READ_CODEC_OPTIONS,
+        )
 
         if mongo_query["type"] == "find":
             mongo_filter = mongo_query.get("filter", {})
@@ -98,25 +280,57 @@ def execute_query(
             if effective_limit is not None:
                 total_count = min(total_count, effective_limit)
 
+            sort = mongo_query.get("sort")
+            sort_spec = [sort] if sort else None
+            if keyset:
+                sort = sort or ("_id", 1)
+                sort_field, direction = sort
+                # _id breaks ties, so rows sharing the last sort value
+                # are neither skipped nor repeated on the next page
+                sort_spec = [sort] if sort_field == "_id" else [sort, ("_id", direction)]
+                # next_cursor is read from the docs, so keep the sort key
+                # in the projection (unless a parent path already covers it)
+                if projection is not None and not any(
+                    sort_field == f or sort_field.startswith(f + ".")
+                    for f in projection
+                ):
+                    projection[sort_field] = 1
+                if after is not None:
+                    bound = _keyset_bound(sort_field, direction, after_value, after_id)
+                    mongo_filter = (
+                        {"$and": [mongo_filter, bound]} if mongo_filter else bound
+                    )
+
             cursor = collection.find(
                 mongo_filter,
                 projection,
                 max_time_ms=QUERY_TIMEOUT_MS,
             )
 
-            if mongo_query.get("sort"):
-                cursor = cursor.sort([mongo_query["sort"]])
+            if sort_spec:
+                cursor = cursor.sort(sort_spec)
 
-            cursor = cursor.skip(skip).limit(page_size)
+            # One batch holds the whole page — no trailing getMore round-trip
+            cursor = cursor.skip(skip).limit(page_limit).batch_size(page_limit)
 
-            results = _stringify_ids(list(cursor))
+            docs = list(cursor)
 
-            return {
-                "data": results,
+            result: Dict[str, Any] = {
                 "total_count": total_count,
                 "page": page,
                 "page_size": page_size,
             }
+            if keyset:
+                served += len(docs)
+                # A short page, or reaching the IR limit, ends the range
+                exhausted = len(docs) < page_limit or (
+                    effective_limit is not None and served >= effective_limit
+                )
+                result["next_cursor"] = None if exhausted else _encode_cursor(
+                    _get_path(docs[-1], sort_field), docs[-1].get("_id"), served,
+                )
+            result["data"] = docs
+            return result
 
         elif mongo_query["type"] == "aggregate":
             pipeline = list(mongo_query.get("pipeline", []))
@@ -125,7 +339,6 @@ def execute_query(
             results = list(
                 collection.aggregate(pipeline, maxTimeMS=QUERY_TIMEOUT_MS)
             )
-            results = _stringify_ids(results)
 
             return {
                 "data": results,
@@ -150,27 +363,31 @@ def execute_query(
 
 # ---------------------- STREAMING EXECUTOR ----------------------
 
-def stream_query(
+async def stream_query_async(
     mongo_uri: str,
     database_name: str,
     collection_name: str,
     mongo_query: Dict[str, Any],
     limit_cap: int = MAX_PAGE_SIZE,
     projection_fields: Optional[List[str]] = None,
-) -> Generator[Dict[str, Any], None, None]:
-    """Yield documents one by one without loading the entire cursor.
-
-    Uses a server-side cursor with ``max_time_ms`` and ``limit`` cap.
+) -> AsyncGenerator[Dict[str, Any], None]:
+    """Yield documents one by one from a Motor server-side cursor.
+
+    Uses ``max_time_ms`` and a ``limit`` cap like ``execute_query``.
+    Documents are yielded as soon as each batch arrives, so the event loop
+    is free to serve other streams while this one waits on the network.
+    Must be iterated on the running event loop (e.g. from a
+    ``StreamingResponse``).
     """
 
     limit_cap = min(max(1, limit_cap), MAX_PAGE_SIZE)
     projection = _build_projection(projection_fields)
 
-    client = _safe_client(mongo_uri)
-    try:
-        db = client[database_name]
-        collection = db[collection_name]
+    collection = _get_async_client(mongo_uri)[database_name].get_collection(
+        collection_name, codec_options=_READ_CODEC_OPTIONS,
+    )
 
+    try:
         if mongo_query["type"] == "find":
             mongo_filter = mongo_query.get("filter", {})
 
@@ -183,21 +400,15 @@ def stream_query(
             if mongo_query.get("sort"):
                 cursor = cursor.sort([mongo_query["sort"]])
 
-            cursor = cursor.limit(limit_cap)
+            cursor = cursor.limit(limit_cap).batch_size(min(limit_cap, STREAM_BATCH_SIZE))
 
-            for doc in cursor:
-                if "_id" in doc:
-                    doc["_id"] = str(doc["_id"])
+            async for doc in cursor:
                 yield doc
 
         elif mongo_query["type"] == "aggregate":
             pipeline = list(mongo_query.get("pipeline", []))
-            for doc in collection.aggregate(pipeline, maxTimeMS=QUERY_TIMEOUT_MS):
-                if "_id" in doc:
-                    doc["_id"] = str(doc["_id"])
+            async for doc in collection.aggregate(pipeline, maxTimeMS=QUERY_TIMEOUT_MS):
                 yield doc
 
     except ExecutionTimeout:
         raise TimeoutError("Streaming query timed out.")
-    finally:
-        client.close()
\ No newline at end of file
@@ -4,7 +4,7 @@ NLP MongoDB Interface — Diagnostic Script
 ==========================================
 
 Usage:
-    python diagnose.py <mongo_uri> <database> <collection> "<query>"
+    python diagnose.py [--no-cache] <mongo_uri> <database> <collection> "<query>"
 
 Example:
     python diagnose.py "mongodb://localhost:27017" mydb mycollection "show records where options is Order"
@@ -13,11 +13,19 @@ This script calls the /diagnose-schema and /diagnose endpoints and
 prints a step-by-step trace of the entire NLP pipeline so you can see
 exactly where a query fails or produces unexpected results.
 
+The /diagnose-schema response is cached in the system temp directory for
+SCHEMA_CACHE_TTL seconds per (uri, database, collection), so iterating on
+query phrasing skips the schema round-trip.  Pass --no-cache to refresh.
+
 Requires: requests  (pip install requests)
 """
 
-import sys
+import hashlib
 import json
+import pathlib
+import sys
+import tempfile
+import time
 
 try:
     import requests
@@ -30,6 +38,8 @@ BASE_URL = "http://localhost:8000"
 SEPARATOR = "=" * 70
 DASH = "-" * 40
 
+SCHEMA_CACHE_TTL = 300  # seconds
+
 
 def colour(text, code):
     """ANSI colour wrapper (no-op on Windows without colorama)."""
@@ -43,21 +53,49 @@ def cyan(t):   return colour(t, 36)
 def bold(t):   return colour(t, 1)
 
 
-def diagnose_schema(payload):
+def _schema_cache_path(payload):
+    """Temp-file location for the cached /diagnose-schema response."""
+    key = "|".join((payload["mongo_uri"], payload["database_name"], payload["collection_name"]))
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return pathlib.Path(tempfile.gettempdir()) / f"nlp-diagnose-{digest}.json"
+
+
+def _load_cached_schema(path):
+    """Return the cached response if it is younger than SCHEMA_CACHE_TTL."""
+    try:
+        if time.time() - path.stat().st_mtime < SCHEMA_CACHE_TTL:
+            return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def diagnose_schema(payload, use_cache=True):
     print(f"\n{SEPARATOR}")
     print(bold("STEP 0 — SCHEMA INSPECTION  (POST /diagnose-schema)"))
     print(SEPARATOR)
 
-    try:
-        resp = requests.post(f"{BASE_URL}/diagnose-schema", json=payload, timeout=10)
-        data = resp.json()
-    except Exception as e:
-        print(red(f"  ERROR: {e}"))
-        return
+    cache_path = _schema_cache_path(payload)
+    data = _load_cached_schema(cache_path) if use_cache else None
+
+    if data is not None:
+        print(yellow(f"  (cached response, < {SCHEMA_CACHE_TTL}s old — use --no-cache to refresh)"))
+    else:
+        try:
+            resp = requests.post(f"{BASE_URL}/diagnose-schema", json=payload, timeout=10)
+            data = resp.json()
+        except Exception as e:
+            print(red(f"  ERROR: {e}"))
+            return
+        if resp.status_code == 200:
+            try:
+                cache_path.write_text(json.dumps(data), encoding="utf-8")
+            except OSError:
+                pass  # cache is best-effort
 
     # Sample document field types
     if data.get("sample_doc_types"):
-        print(cyan("\n  Raw document field types (1 sample doc):"))
+        print(cyan("\n  Raw top-level BSON types (server-side $sample):"))
         for k, v in data["sample_doc_types"].items():
             print(f"    {k}: {v}")
 
@@ -207,11 +245,15 @@ def diagnose_query(payload):
 
 
 def main():
-    if len(sys.argv) < 5:
+    args = sys.argv[1:]
+    use_cache = "--no-cache" not in args
+    args = [a for a in args if a != "--no-cache"]
+
+    if len(args) < 4:
         print(bold("NLP MongoDB Diagnostic Tool"))
         print()
         print("Usage:")
-        print(f"  python {sys.argv[0]} <mongo_uri> <database> <collection> \"<query>\"")
+        print(f"  python {sys.argv[0]} [--no-cache] <mongo_uri> <database> <collection> \"<query>\"")
         print()
         print("Examples:")
         print(f'  python {sys.argv[0]} "mongodb://localhost:27017" testdb orders "show records where options is Order"')
@@ -227,10 +269,7 @@ def main():
         collection = input("  Collection name: ").strip()
         query = input("  NL query: ").strip()
     else:
-        mongo_uri = sys.argv[1]
-        database = sys.argv[2]
-        collection = sys.argv[3]
-        query = sys.argv[4]
+        mongo_uri, database, collection, query = args[:4]
 
     if not database or not collection or not query:
         print(red("Error: database, collection, and query are required"))
@@ -255,7 +294,7 @@ def main():
         sys.exit(1)
 
     # Run diagnostics
-    schema_fields = diagnose_schema(payload)
+    schema_fields = diagnose_schema(payload, use_cache=use_cache)
     diagnose_query(payload)
 
 
@@ -18,15 +18,22 @@ pass-through for numbers).
 
 import re
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 try:
     from bson import ObjectId as _ObjectId
 except ImportError:          # pymongo not installed in test env
     _ObjectId = None
 
-# Pattern for a 24-character hex string (MongoDB ObjectId)
-_OBJECTID_RE = re.compile(r'^[0-9a-fA-F]{24}$')
+# Characters of a 24-character hex string (MongoDB ObjectId)
+_HEX_CHARSET = frozenset("0123456789abcdefABCDEF")
+
+
+def _is_objectid_hex(value: str) -> bool:
+    """True if *value* is a 24-char hex string (cheaper than a regex match)."""
+    return len(value) == 24 and _HEX_CHARSET.issuperset(value)
+
 
 # Fields whose type is "date" need values converted to datetime
 _DATE_TYPES = frozenset({"date"})
@@ -63,14 +70,63 @@ def _parse_date_value(value: Any) -> Any:
         return value
     if not isinstance(value, str):
         return value
-    val = value.strip()
+    parsed = _parse_date_string(value.strip())
+    return parsed if parsed is not None else value
+
+
+@lru_cache(maxsize=2048)
+def _parse_date_string(val: str) -> Optional[datetime]:
+    """Memoised format loop for ``_parse_date_value``.
+
+    The same date literals recur across queries, so repeats skip the
+    ``strptime`` attempts entirely.  ``datetime`` is immutable, so cached
+    instances are safe to share between callers.
+    """
+    fast = _fast_parse_date(val)
+    if fast is not None:
+        return fast
     for fmt in _DATE_FORMATS:
         try:
             return datetime.strptime(val, fmt)
         except ValueError:
             continue
-    return value
+    return None
+
+
+def _fast_parse_date(val: str) -> Optional[datetime]:
+    """Shape-check the common layouts before falling back to ``strptime``.
+
+    Covers year-only, ``YYYY-MM-DD``, ``YYYY-MM-DD HH:MM:SS`` and
+    ``YYYY-MM-DDTHH:MM:SS[.f][Z]`` via the C-level ``fromisoformat``.
+    Returns ``None`` when the shape does not match so the caller can try
+    the full format list; results stay naive, exactly as the ``strptime``
+    formats produce them.
+    """
+    n = len(val)
+    try:
+        if n == 4 and val.isdigit():
+            return datetime(int(val), 1, 1)
+        if n < 10 or val[4] != "-" or val[7] != "-":
+            return None
+        if n == 10:
+            return datetime.fromisoformat(val)
+        # The only space-separated format is the plain "%Y-%m-%d %H:%M:%S"
+        if n == 19 and val[10] == " " and val[13] == ":" and val[16] == ":":
+            return datetime.fromisoformat(val)
+        body = val[:-1] if val.endswith("Z") else val
+        # Only 1-6 fraction digits after the ".", as %f takes: a trailing
+        # offset would make fromisoformat return an aware datetime
+        if (19 <= len(body) <= 26 and body[10] == "T" and body[13] == ":"
+                and body[16] == ":"
+                and (len(body) == 19 or (body[19] == "." and body[20:].isdigit()))):
+            return datetime.fromisoformat(body)
+    except ValueError:
+        pass
+    return None
+
 
+# Stand-in for ``field_types=None`` so lookups need no per-condition branch
+_EMPTY_FIELD_TYPES: Dict[str, str] = {}
 
 # Types that should use partial (un-anchored) regex for the "eq" operator
 _PARTIAL_MATCH_TYPES = frozenset({
@@ -79,12 +135,42 @@ _PARTIAL_MATCH_TYPES = frozenset({
 })
 
 
+# Characters with special meaning in a (non-extended) PCRE pattern
+_RE_META = frozenset(".^$*+?{}[]\\|()")
+
+
+def _escape_regex(value: str) -> str:
+    """``re.escape`` only when *value* contains a regex metacharacter.
+
+    ``re.escape`` also escapes spaces, ``-``, ``#`` and friends, which are
+    literal in MongoDB patterns without the ``x`` option, so most values
+    can be used verbatim.
+    """
+    if _RE_META.isdisjoint(value):
+        return value
+    return re.escape(value)
+
+
+@lru_cache(maxsize=4096)
+def _ci_eq_regex(value: str) -> Dict[str, str]:
+    return {"$regex": f"^{_escape_regex(value)}$", "$options": "i"}
+
+
+@lru_cache(maxsize=4096)
+def _ci_contains_regex(value: str) -> Dict[str, str]:
+    return {"$regex": _escape_regex(value), "$options": "i"}
+
+
 def _case_insensitive_eq(value: Any) -> Any:
     """For string values, return a case-insensitive regex match.
-    For non-strings, return the value as-is."""
+    For non-strings, and strings with no letter case, return the value as-is."""
     if isinstance(value, str):
-        escaped = re.escape(value)
-        return {"$regex": f"^{escaped}$", "$options": "i"}
+        # No cased characters (digits, codes, symbols) → plain equality,
+        # which skips the regex engine and can use an index
+        if value.lower() == value.upper():
+            return value
+        # copy so callers can't mutate the cached fragment
+        return _ci_eq_regex(value).copy()
     return value
 
 
@@ -92,8 +178,7 @@ def _case_insensitive_contains(value: Any) -> Any:
     """For string values, return a case-insensitive partial match.
     Works on both plain string fields and array-of-strings fields."""
     if isinstance(value, str):
-        escaped = re.escape(value)
-        return {"$regex": escaped, "$options": "i"}
+        return _ci_contains_regex(value).copy()
     return value
 
 
@@ -105,28 +190,25 @@ def _build_id_filter(value: Any) -> Dict[str, Any]:
     matches any of the candidate types so the query succeeds regardless of
     the actual storage type.
     """
-    candidates: list = []
-
     # Always try value as-is (string)
     str_val = str(value)
-    candidates.append({"_id": str_val})
-
-    # Try numeric conversion (e.g. "10009999" → 10009999)
-    try:
-        int_val = int(str_val)
-        candidates.append({"_id": int_val})
-    except (ValueError, TypeError):
-        pass
+    candidates: List[Dict[str, Any]] = [{"_id": str_val}]
 
+    # Try numeric conversion (e.g. "10009999" → 10009999, "12.5" → 12.5).
+    # Whole-number decimals like "7.0" are already covered by the int form.
     try:
-        float_val = float(str_val)
-        if float_val != int(float_val) if str_val.replace('.', '', 1).lstrip('-').isdigit() else False:
-            candidates.append({"_id": float_val})
-    except (ValueError, TypeError):
-        pass
+        candidates.append({"_id": int(str_val)})
+    except ValueError:
+        if "." in str_val and str_val.replace(".", "", 1).lstrip("-").isdigit():
+            try:
+                float_val = float(str_val)
+                if not float_val.is_integer():
+                    candidates.append({"_id": float_val})
+            except ValueError:
+                pass
 
     # Try ObjectId (requires 24-hex-char string)
-    if _ObjectId is not None and isinstance(str_val, str) and _OBJECTID_RE.match(str_val):
+    if _ObjectId is not None and _is_objectid_hex(str_val):
         candidates.append({"_id": _ObjectId(str_val)})
 
     if len(candidates) == 1:
@@ -137,16 +219,19 @@ def _build_id_filter(value: Any) -> Dict[str, Any]:
 def _build_eq_filter(
     field: str,
     value: Any,
-    field_types: Optional[Dict[str, str]],
+    ftype: Optional[str],
 ) -> Dict[str, Any]:
     """Dynamically decide how to filter on ``eq`` based on field type.
 
+    ``ftype`` is the field's detected type (``None`` when unknown), already
+    looked up by ``build_match_stage``.
+
     Priority:
     1. If the value is a **list** → exact array match (user provided a
        JSON array literal like ``["Pearl White","Crane Wilbur"]``).
     2. If field is ``_id`` → use multi-type ``$or`` to handle string /
        int / ObjectId storage transparently.
-    3. If ``field_types`` tells us the field is an array-of-strings →
+    3. If ``ftype`` tells us the field is an array-of-strings →
        partial match (user writes "options is Order" and means *contains*).
     4. Otherwise fall back to ``_case_insensitive_eq`` (anchored regex for
        strings, exact match for numbers).
@@ -159,21 +244,90 @@ def _build_eq_filter(
     if field == "_id":
         return _build_id_filter(value)
 
-    ftype = (field_types or {}).get(field)
-
     if ftype in _PARTIAL_MATCH_TYPES:
         # user said "eq" but the field is an array of strings —
         # translate to partial match automatically
         return {field: _case_insensitive_contains(value)}
 
     # If value looks like an ObjectId hex string, match as ObjectId
-    if (isinstance(value, str) and _OBJECTID_RE.match(value)
+    if (isinstance(value, str) and _is_objectid_hex(value)
             and _ObjectId is not None):
         return {field: _ObjectId(value)}
 
     return {field: _case_insensitive_eq(value)}
 
 
+@lru_cache(maxsize=512)
+def _day_range(value: datetime) -> Optional[Tuple[datetime, datetime]]:
+    """Whole-day ``(start, end)`` bounds for a date-only (midnight) value.
+
+    Returns ``None`` when *value* carries a time of day.
+    """
+    if value.hour or value.minute or value.second:
+        return None
+    return value, value.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+
+def _build_date_eq_filter(field: str, value: datetime) -> Dict[str, Any]:
+    """Equality on a date field: a date-only value matches the whole day."""
+    day = _day_range(value)
+    if day is None:
+        return {field: value}
+    day_start, day_end = day
+    return {field: {"$gte": day_start, "$lte": day_end}}
+
+
+# Operators that map straight onto a single MongoDB fragment.  ``eq`` and
+# ``contains`` are type-aware and stay inline in ``build_match_stage``.
+_OP_BUILDERS: Dict[str, Callable[[str, Any], Dict[str, Any]]] = {
+    "gt": lambda f, v: {f: {"$gt": v}},
+    "gte": lambda f, v: {f: {"$gte": v}},
+    "lt": lambda f, v: {f: {"$lt": v}},
+    "lte": lambda f, v: {f: {"$lte": v}},
+    "ne": lambda f, v: {f: {"$ne": v}},
+    "in": lambda f, v: {f: {"$in": v if isinstance(v, list) else [v]}},
+    "exists": lambda f, v: {f: {"$exists": bool(v)}},
+}
+
+
+def _build_condition(
+    condition: Dict[str, Any],
+    ft: Dict[str, str],
+) -> Optional[Dict[str, Any]]:
+    """Compile one IR condition to a filter fragment (``None`` for an
+    unknown operator)."""
+    field = condition["field"]
+    operator = condition["operator"]
+    value = condition["value"]
+
+    # Auto-convert string dates to datetime when the field type is "date"
+    ftype = ft.get(field)
+    if ftype in _DATE_TYPES and operator != "exists":
+        if isinstance(value, list):
+            value = [_parse_date_value(v) for v in value]
+        else:
+            value = _parse_date_value(value)
+
+    if operator == "eq":
+        # For date fields, eq means the whole day unless time is given
+        if ftype in _DATE_TYPES and isinstance(value, datetime):
+            return _build_date_eq_filter(field, value)
+        return _build_eq_filter(field, value, ftype)
+
+    if operator == "contains":
+        # If value looks like an ObjectId hex string, match as ObjectId
+        if (isinstance(value, str) and _is_objectid_hex(value)
+                and _ObjectId is not None):
+            return {field: _ObjectId(value)}
+        # Date fields: treat contains as eq (regex doesn't work on dates)
+        if ftype in _DATE_TYPES and isinstance(value, datetime):
+            return _build_date_eq_filter(field, value)
+        return {field: _case_insensitive_contains(value)}
+
+    builder = _OP_BUILDERS.get(operator)
+    return builder(field, value) if builder is not None else None
+
+
 def build_match_stage(
     conditions: List[Dict[str, Any]],
     field_types: Optional[Dict[str, str]] = None,
@@ -187,62 +341,11 @@ def build_match_stage(
     if not conditions:
         return {}
 
-    and_conditions: List[Dict[str, Any]] = []
-
-    for condition in conditions:
-        field = condition["field"]
-        operator = condition["operator"]
-        value = condition["value"]
-
-        # Auto-convert string dates to datetime when the field type is "date"
-        ftype = (field_types or {}).get(field)
-        if ftype in _DATE_TYPES and operator != "exists":
-            if isinstance(value, list):
-                value = [_parse_date_value(v) for v in value]
-            else:
-                value = _parse_date_value(value)
-
-        if operator == "eq":
-            # For date fields, eq means the whole day unless time is given
-            if ftype in _DATE_TYPES and isinstance(value, datetime):
-                # If it's midnight (date-only), match the whole day
-                if value.hour == 0 and value.minute == 0 and value.second == 0:
-                    day_start = value
-                    day_end = value.replace(hour=23, minute=59, second=59, microsecond=999999)
-                    and_conditions.append({field: {"$gte": day_start, "$lte": day_end}})
-                else:
-                    and_conditions.append({field: value})
-            else:
-                and_conditions.append(_build_eq_filter(field, value, field_types))
-        elif operator == "contains":
-            # If value looks like an ObjectId hex string, match as ObjectId
-            if (isinstance(value, str) and _OBJECTID_RE.match(value)
-                    and _ObjectId is not None):
-                and_conditions.append({field: _ObjectId(value)})
-            # Date fields: treat contains as eq (regex doesn't work on dates)
-            elif ftype in _DATE_TYPES and isinstance(value, datetime):
-                if value.hour == 0 and value.minute == 0 and value.second == 0:
-                    day_start = value
-                    day_end = value.replace(hour=23, minute=59, second=59, microsecond=999999)
-                    and_conditions.append({field: {"$gte": day_start, "$lte": day_end}})
-                else:
-                    and_conditions.append({field: value})
-            else:
-                and_conditions.append({field: _case_insensitive_contains(value)})
-        elif operator == "gt":
-            and_conditions.append({field: {"$gt": value}})
-        elif operator == "gte":
-            and_conditions.append({field: {"$gte": value}})
-        elif operator == "lt":
-            and_conditions.append({field: {"$lt": value}})
-        elif operator == "lte":
-            and_conditions.append({field: {"$lte": value}})
-        elif operator == "ne":
-            and_conditions.append({field: {"$ne": value}})
-        elif operator == "in":
-            and_conditions.append({field: {"$in": value if isinstance(value, list) else [value]}})
-        elif operator == "exists":
-            and_conditions.append({field: {"$exists": bool(value)}})
+    ft = field_types if field_types is not None else _EMPTY_FIELD_TYPES
+    and_conditions = [
+        fragment for fragment in (_build_condition(c, ft) for c in conditions)
+        if fragment is not None
+    ]
 
     if len(and_conditions) == 1:
         return and_conditions[0]
@@ -250,6 +353,20 @@ def build_match_stage(
     return {"$and": and_conditions}
 
 
+# Fixed-key query shells; ``compile_ir_to_mongo`` copies one and fills in
+# the per-query values.  Never mutate these directly.
+_FIND_SKELETON: Dict[str, Any] = {"type": "find", "filter": None, "sort": None, "limit": None}
+_AGG_SKELETON: Dict[str, Any] = {"type": "aggregate", "pipeline": None}
+
+# IR aggregation type → $group accumulator
+_AGG_OPERATORS = {
+    "avg": "$avg",
+    "sum": "$sum",
+    "max": "$max",
+    "min": "$min",
+}
+
+
 def compile_ir_to_mongo(
     ir: Dict[str, Any],
     field_types: Optional[Dict[str, str]] = None,
@@ -264,12 +381,9 @@ def compile_ir_to_mongo(
 
         mongo_filter = build_match_stage(ir["conditions"], field_types)
 
-        mongo_query: Dict[str, Any] = {
-            "type": "find",
-            "filter": mongo_filter,
-            "sort": None,
-            "limit": ir.get("limit"),
-        }
+        mongo_query = _FIND_SKELETON.copy()
+        mongo_query["filter"] = mongo_filter
+        mongo_query["limit"] = ir.get("limit")
 
         if ir.get("sort"):
             direction = 1 if ir["sort"]["direction"] == "asc" else -1
@@ -284,6 +398,9 @@ def compile_ir_to_mongo(
 
         pipeline: List[Dict[str, Any]] = []
 
+        # One leading $match, omitted when empty.  Splitting a top-level
+        # $and into several stages buys nothing: the server coalesces
+        # adjacent $match stages and already runs them ahead of $group.
         if match_stage:
             pipeline.append({"$match": match_stage})
 
@@ -293,25 +410,20 @@ def compile_ir_to_mongo(
         if agg_type == "count":
             pipeline.append({"$count": "result"})
         else:
-            operator_map = {
-                "avg": "$avg",
-                "sum": "$sum",
-                "max": "$max",
-                "min": "$min",
-            }
-
             pipeline.append({
                 "$group": {
                     "_id": None,
                     "result": {
-                        operator_map[agg_type]: f"${field}"
+                        _AGG_OPERATORS[agg_type]: f"${field}"
                     }
                 }
             })
 
-        return {
-            "type": "aggregate",
-            "pipeline": pipeline,
-        }
+        agg_query = _AGG_SKELETON.copy()
+        agg_query["pipeline"] = pipeline
+        return agg_query
 
-    return {"type": "find", "filter": {}, "sort": None, "limit": 20}
\ No newline at end of file
+    fallback = _FIND_SKELETON.copy()
+    fallback["filter"] = {}
+    fallback["limit"] = 20
+    return fallback
\ No newline at end of file
@@ -4,25 +4,121 @@ IR validator: validates parsed IR against the actual collection schema.
 Supports:
 - Dynamic allowed_fields (including dot-notation nested fields)
 - Schema-aware field resolution (e.g. ``city`` → ``address.city``)
-- Fuzzy matching for typos (difflib, threshold 0.8)
+- Fuzzy matching for typos (rapidfuzz when installed, else difflib;
+  threshold 0.8)
 - Operator allow-list
 - Hard limit cap
 - Projection field validation
 - Helpful "did you mean?" suggestions for typos
 """
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from difflib import get_close_matches, SequenceMatcher
 
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz.process import extractOne as _rf_extract_one
+except ImportError:          # optional C++ backend — fall back to difflib
+    _rf_fuzz = None
+    _rf_extract_one = None
+
 from logger import logger
 
-ALLOWED_OPERATORS = ["eq", "gt", "lt", "gte", "lte", "in", "ne", "exists", "contains"]
+ALLOWED_OPERATORS = frozenset({"eq", "gt", "lt", "gte", "lte", "in", "ne", "exists", "contains"})
 MAX_LIMIT = 100
 
 
 # ---------------------- FIELD RESOLUTION ----------------------
 
 
+class FieldResolver:
+    """Lookup tables for one collection's ``allowed_fields``.
+
+    Built once per distinct field list (see ``_get_resolver``) so that the
+    exact and suffix steps of ``resolve_field_name`` are dict lookups
+    instead of scans over the schema.
+    """
+
+    def __init__(self, allowed_fields: Tuple[str, ...]) -> None:
+        self.all_keys = allowed_fields
+        # field → (lowered path, lowered last segment, lowered segments);
+        # every lookup below reads from this instead of re-splitting
+        self.field_metadata: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        for af in allowed_fields:
+            af_lower = af.lower()
+            segments = tuple(af_lower.split("."))
+            self.field_metadata[af] = (af_lower, segments[-1], segments)
+        self.lower_keys = tuple(self.field_metadata[af][0] for af in allowed_fields)
+        # lowered full path → canonical field (first occurrence wins)
+        self.exact_map: Dict[str, str] = {}
+        # lowered last segment → dotted fields ending in it, schema order
+        self.suffix_map: Dict[str, List[str]] = {}
+        # lowered full path or last segment → field, for single-token fuzzy
+        self.candidate_map: Dict[str, str] = {}
+        # segment count → (field, lowered segments) for dotted fields
+        self.by_segcount: Dict[int, List[Tuple[str, Tuple[str, ...]]]] = {}
+        for af in allowed_fields:
+            af_lower, seg, segments = self.field_metadata[af]
+            self.exact_map.setdefault(af_lower, af)
+            self.candidate_map[af_lower] = af
+            if len(segments) > 1:
+                self.by_segcount.setdefault(len(segments), []).append((af, segments))
+                self.suffix_map.setdefault(seg, []).append(af)
+                # only set if not already present (prefer full path)
+                if seg not in self.candidate_map:
+                    self.candidate_map[seg] = af
+        self.candidate_keys: List[str] = list(self.candidate_map)
+        self.candidate_lens = tuple(len(k) for k in self.candidate_keys)
+        # bit n set ⇔ some candidate has length n (63 = "63 or longer")
+        self.length_mask = 0
+        for n in self.candidate_lens:
+            self.length_mask |= 1 << min(n, 63)
+
+    def fuzzy_candidates(self, query: str, cutoff: float) -> List[str]:
+        """Candidate keys whose length allows a ratio of at least *cutoff*.
+
+        ``ratio = 2·M / (len(a) + len(b))`` and ``M <= min(len(a), len(b))``,
+        so lengths outside ``[n·c/(2-c), n·(2-c)/c]`` can never reach the
+        cutoff and are dropped before any scoring.  The window is widened
+        by one on each side to stay clear of float rounding.
+        """
+        n = len(query)
+        lo = max(int(n * cutoff / (2 - cutoff)) - 1, 0)
+        hi = int(n * (2 - cutoff) / cutoff) + 1
+        window = ((1 << (min(hi, 63) + 1)) - 1) & ~((1 << min(lo, 63)) - 1)
+        if not self.length_mask & window:
+            return []
+        return [
+            k for k, klen in zip(self.candidate_keys, self.candidate_lens)
+            if lo <= klen <= hi
+        ]
+
+
+def _similarity(a: str, b: str) -> float:
+    """Similarity ratio in ``[0, 1]`` (rapidfuzz ``ratio`` or difflib)."""
+    if _rf_fuzz is not None:
+        return _rf_fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _best_match(query: str, choices: List[str], cutoff: float) -> Optional[str]:
+    """Closest entry of *choices* scoring at least *cutoff*, or ``None``."""
+    if _rf_extract_one is not None:
+        hit = _rf_extract_one(
+            query, choices, scorer=_rf_fuzz.ratio, score_cutoff=cutoff * 100,
+        )
+        return hit[0] if hit else None
+    close = get_close_matches(query, choices, n=1, cutoff=cutoff)
+    return close[0] if close else None
+
+
+@lru_cache(maxsize=64)
+def _get_resolver(allowed_fields: Tuple[str, ...]) -> FieldResolver:
+    """Return the (cached) ``FieldResolver`` for a collection's field list."""
+    return FieldResolver(allowed_fields)
+
+
 def resolve_field_name(user_field: str, allowed_fields: List[str]) -> Optional[str]:
     """Resolve a user-supplied field name against the collection schema.
 
@@ -38,40 +134,41 @@ def resolve_field_name(user_field: str, allowed_fields: List[str]) -> Optional[s
        names and their last segments (threshold 0.8).
     5. No match → return ``None``.
 
-    Debug logging is emitted for every resolution attempt.
+    Results are memoised per (lowered field, field list), so repeated
+    lookups — including repeated typos — skip the fuzzy passes.  Debug
+    logging is emitted the first time each field is resolved.
     """
-    uf = user_field.strip()
-    uf_lower = uf.lower()
+    return _resolve_cached(user_field.strip().lower(), tuple(allowed_fields))
+
 
-    logger.info("resolve_field_name — User field: '%s'", uf)
-    logger.info("resolve_field_name — Allowed fields: %s", allowed_fields)
+@lru_cache(maxsize=2048)
+def _resolve_cached(uf: str, allowed_fields: Tuple[str, ...]) -> Optional[str]:
+    """Body of ``resolve_field_name``; *uf* is already stripped and lowered."""
+    resolver = _get_resolver(allowed_fields)
+
+    logger.debug("resolve_field_name — User field: '%s'", uf)
 
     # 1. Exact match (case-insensitive)
-    for af in allowed_fields:
-        if af.lower() == uf_lower:
-            logger.info("resolve_field_name — Exact match: '%s' → '%s'", uf, af)
-            return af
+    af = resolver.exact_map.get(uf)
+    if af is not None:
+        logger.debug("resolve_field_name — Exact match: '%s' → '%s'", uf, af)
+        return af
 
     # 1b. Space-separated tokens → dot-notation (e.g. "options id" → "options.id")
     if " " in uf:
         dot_joined = uf.replace(" ", ".")
-        result = resolve_field_name(dot_joined, allowed_fields)
+        result = _resolve_cached(dot_joined, allowed_fields)
         if result is not None:
-            logger.info(
+            logger.debug(
                 "resolve_field_name — Space→dot: '%s' → '%s'", uf, result,
             )
             return result
 
     # 2. Dot-suffix / last-segment match
-    suffix_matches: List[str] = []
-    for af in allowed_fields:
-        if "." in af:
-            last_segment = af.rsplit(".", 1)[-1]
-            if last_segment.lower() == uf_lower:
-                suffix_matches.append(af)
+    suffix_matches = resolver.suffix_map.get(uf, [])
 
     if len(suffix_matches) == 1:
-        logger.info(
+        logger.debug(
             "resolve_field_name — Unique suffix match: '%s' → '%s'",
             uf, suffix_matches[0],
         )
@@ -86,19 +183,14 @@ def resolve_field_name(user_field: str, allowed_fields: List[str]) -> Optional[s
         return suffix_matches[0]
 
     # 3. Multi-segment fuzzy (user typed dot-notation with typos)
-    if "." in uf_lower:
-        user_segments = uf_lower.split(".")
+    if "." in uf:
+        user_segments = uf.split(".")
         best_field: Optional[str] = None
         best_avg_score = 0.0
 
-        for af in allowed_fields:
-            if "." not in af:
-                continue
-            af_segments = af.lower().split(".")
-            if len(user_segments) != len(af_segments):
-                continue
+        for af, af_segments in resolver.by_segcount.get(len(user_segments), ()):
             scores = [
-                SequenceMatcher(None, us, fs).ratio()
+                _similarity(us, fs)
                 for us, fs in zip(user_segments, af_segments)
             ]
             avg = sum(scores) / len(scores)
@@ -107,39 +199,23 @@ def resolve_field_name(user_field: str, allowed_fields: List[str]) -> Optional[s
                 best_field = af
 
         if best_field is not None:
-            logger.info(
+            logger.debug(
                 "resolve_field_name — Multi-segment fuzzy: '%s' → '%s' (score %.2f)",
                 uf, best_field, best_avg_score,
             )
             return best_field
 
     # 4. Single-token fuzzy against full names + last segments
-    candidates: List[str] = list(allowed_fields)
-    # map lowered candidate → original allowed field
-    candidate_map: Dict[str, str] = {}
-    for af in allowed_fields:
-        candidate_map[af.lower()] = af
-        if "." in af:
-            seg = af.rsplit(".", 1)[-1].lower()
-            # only overwrite if not already present (prefer full path)
-            if seg not in candidate_map:
-                candidate_map[seg] = af
-
-    close = get_close_matches(
-        uf_lower,
-        list(candidate_map.keys()),
-        n=1,
-        cutoff=0.80,
-    )
-    if close:
-        resolved = candidate_map[close[0]]
-        logger.info(
+    close = _best_match(uf, resolver.fuzzy_candidates(uf, 0.80), cutoff=0.80)
+    if close is not None:
+        resolved = resolver.candidate_map[close]
+        logger.debug(
             "resolve_field_name — Fuzzy match: '%s' → '%s' (matched '%s')",
-            uf, resolved, close[0],
+            uf, resolved, close,
         )
         return resolved
 
-    logger.info("resolve_field_name — No match for '%s'", uf)
+    logger.debug("resolve_field_name — No match for '%s'", uf)
     return None
 
 
@@ -148,20 +224,18 @@ def resolve_field_name(user_field: str, allowed_fields: List[str]) -> Optional[s
 
 def _suggest_field(field: str, allowed_fields: List[str]) -> str:
     """Return a 'did you mean?' hint for an invalid field."""
-    candidates = list(allowed_fields)
+    meta = _get_resolver(tuple(allowed_fields)).field_metadata
+    candidates = [meta[f][0] for f in allowed_fields]
     for f in allowed_fields:
-        if "." in f:
-            candidates.append(f.rsplit(".", 1)[-1])
-    matches = get_close_matches(
-        field.lower(), [c.lower() for c in candidates], n=3, cutoff=0.5,
-    )
+        if len(meta[f][2]) > 1:
+            candidates.append(meta[f][1])
+    matches = get_close_matches(field.lower(), candidates, n=3, cutoff=0.5)
     if matches:
         suggestions: List[str] = []
         for m in matches:
             for af in allowed_fields:
-                if af.lower() == m or (
-                    "." in af and af.rsplit(".", 1)[-1].lower() == m
-                ):
+                af_lower, seg, segments = meta[af]
+                if af_lower == m or (len(segments) > 1 and seg == m):
                     if af not in suggestions:
                         suggestions.append(af)
         if suggestions:
@@ -184,13 +258,19 @@ def validate_ir(ir: Dict[str, Any], allowed_fields: List[str]) -> Dict[str, Any]
     Raises ``ValueError`` on unresolvable fields or disallowed operators.
     Enforces ``MAX_LIMIT`` cap on results.
     """
+    logger.debug("validate_ir — Allowed fields: %s", allowed_fields)
+    # Fields already spelled canonically (the common LLM case) skip resolution
+    allowed_set = frozenset(allowed_fields)
 
     # --- Resolve & validate condition fields ---
     for condition in ir.get("conditions", []):
         raw_field = condition["field"]
         operator = condition["operator"]
 
-        resolved = resolve_field_name(raw_field, allowed_fields)
+        resolved = (
+            raw_field if raw_field in allowed_set
+            else resolve_field_name(raw_field, allowed_fields)
+        )
         if resolved is None:
             hint = _suggest_field(raw_field, allowed_fields)
             raise ValueError(
@@ -206,7 +286,10 @@ def validate_ir(ir: Dict[str, Any], allowed_fields: List[str]) -> Dict[str, Any]
     agg = ir.get("aggregation")
     if agg and agg.get("field"):
         raw_field = agg["field"]
-        resolved = resolve_field_name(raw_field, allowed_fields)
+        resolved = (
+            raw_field if raw_field in allowed_set
+            else resolve_field_name(raw_field, allowed_fields)
+        )
         if resolved is None:
             hint = _suggest_field(raw_field, allowed_fields)
             raise ValueError(
@@ -218,7 +301,10 @@ def validate_ir(ir: Dict[str, Any], allowed_fields: List[str]) -> Dict[str, Any]
     sort = ir.get("sort")
     if sort and sort.get("field"):
         raw_field = sort["field"]
-        resolved = resolve_field_name(raw_field, allowed_fields)
+        resolved = (
+            raw_field if raw_field in allowed_set
+            else resolve_field_name(raw_field, allowed_fields)
+        )
         if resolved is None:
             hint = _suggest_field(raw_field, allowed_fields)
             raise ValueError(
@@ -231,7 +317,10 @@ def validate_ir(ir: Dict[str, Any], allowed_fields: List[str]) -> Dict[str, Any]
     if projection:
         resolved_projection: List[str] = []
         for pf in projection:
-            resolved = resolve_field_name(pf, allowed_fields)
+            resolved = (
+                pf if pf in allowed_set
+                else resolve_field_name(pf, allowed_fields)
+            )
             if resolved is None:
                 hint = _suggest_field(pf, allowed_fields)
                 raise ValueError(
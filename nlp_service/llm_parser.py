@@ -24,13 +24,45 @@ compatibility with the downstream pipeline
 (``ir_validator`` → ``ir_compiler`` → ``db_executor``).
 """
 
+import asyncio
+import hashlib
 import json
 import os
 import re
+import sqlite3
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:          # orjson not installed — stdlib json fallback
+    orjson = None
 
 from logger import logger
+from parser import parse_to_ir
+
+def _json_loads(data: str) -> Any:
+    """``json.loads`` via orjson when available (raises ``JSONDecodeError``)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> str:
+    """Compact JSON text via orjson when available, else stdlib ``json``."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str).decode("utf-8")
+        except TypeError:    # e.g. ints beyond 64 bits
+            pass
+    return json.dumps(obj, default=str)
+
 
 # ---------------------------------------------------------------------------
 # Lazy-load LLM SDK clients so the rest of the app works even when the
@@ -89,156 +121,119 @@ ALLOWED_OPERATORS = frozenset({
 })
 
 
-def _validate_ir_structure(
-    ir: Dict[str, Any],
-    allowed_fields: List[str],
-) -> bool:
-    """Return ``True`` if the LLM-generated IR has a valid structure."""
-    if not isinstance(ir, dict):
-        return False
-
-    if ir.get("operation") not in ("find", "aggregate"):
-        return False
-
-    # --- conditions ---
-    conditions = ir.get("conditions")
-    if not isinstance(conditions, list):
-        return False
-    allowed_lower = {f.lower() for f in allowed_fields}
-    # Also allow last-segment matches (e.g. "city" → "address.city")
-    last_segments = set()
-    for f in allowed_fields:
-        if "." in f:
-            last_segments.add(f.rsplit(".", 1)[-1].lower())
-
-    for cond in conditions:
-        if not isinstance(cond, dict):
-            return False
-        if not {"field", "operator", "value"} <= cond.keys():
-            return False
-        if cond["operator"] not in ALLOWED_OPERATORS:
-            return False
-        fl = cond["field"].lower()
-        if fl not in allowed_lower and fl not in last_segments:
-            logger.warning("[LLM-validate] unknown field: %s", cond["field"])
-            return False
-
-    # --- aggregation ---
-    agg = ir.get("aggregation")
-    if agg is not None:
-        if not isinstance(agg, dict):
-            return False
-        if agg.get("type") not in ("count", "avg", "sum", "max", "min"):
-            return False
-
-    # --- sort ---
-    sort_val = ir.get("sort")
-    if sort_val is not None:
-        if not isinstance(sort_val, dict):
-            return False
-        if sort_val.get("direction") not in ("asc", "desc"):
-            return False
-
-    # --- limit ---
-    limit = ir.get("limit")
-    if limit is not None and not isinstance(limit, int):
-        return False
-
-    # --- projection ---
-    proj = ir.get("projection")
-    if proj is not None and not isinstance(proj, list):
-        return False
+@dataclass(frozen=True)
+class SchemaIndex:
+    """Field lookups for one schema, built once by ``_schema_index``.
 
-    return True
+    Shared between calls — treat the dicts as read-only.
+    """
+    # lower-cased field or last segment → schema field (full path wins)
+    field_map: Dict[str, str]
+    field_types: Dict[str, str]
 
 
-def _fix_field_names(
-    ir: Dict[str, Any],
-    allowed_fields: List[str],
-) -> Dict[str, Any]:
-    """Re-case LLM-produced field names to match the schema exactly."""
-    # Build lookup: lower-case → schema field name
+@lru_cache(maxsize=32)
+def _schema_index(
+    fields: Tuple[str, ...],
+    types: Tuple[Tuple[str, str], ...],
+) -> SchemaIndex:
+    """Build (and cache) the ``SchemaIndex`` for a field list / type map."""
     field_map: Dict[str, str] = {}
-    for f in allowed_fields:
+    for f in fields:
         field_map[f.lower()] = f
-    # Also map last segments (lower) → full dotted path
-    for f in allowed_fields:
+    for f in fields:
         if "." in f:
-            last = f.rsplit(".", 1)[-1].lower()
-            field_map.setdefault(last, f)
+            field_map.setdefault(f.rsplit(".", 1)[-1].lower(), f)
+    return SchemaIndex(
+        field_map=field_map,
+        field_types=dict(types),
+    )
 
-    def _fix(name: str) -> str:
-        return field_map.get(name.lower(), name)
 
-    for cond in ir.get("conditions", []):
-        cond["field"] = _fix(cond["field"])
+def _get_schema_index(
+    allowed_fields: List[str],
+    field_types: Optional[Dict[str, str]],
+) -> SchemaIndex:
+    return _schema_index(
+        tuple(allowed_fields), tuple(sorted((field_types or {}).items())),
+    )
 
-    agg = ir.get("aggregation")
-    if agg and agg.get("field") and agg["field"] != "*":
-        agg["field"] = _fix(agg["field"])
 
-    sort_val = ir.get("sort")
-    if sort_val and sort_val.get("field"):
-        sort_val["field"] = _fix(sort_val["field"])
+# ---------------------------------------------------------------------------
+# Post-LLM normalisation — prevent hallucinated / invalid values
+# ---------------------------------------------------------------------------
+_VALID_IR_KEYS = frozenset({
+    "operation", "conditions", "aggregation", "sort",
+    "limit", "projection", "meta",
+})
+_AGG_TYPES = frozenset({"count", "avg", "sum", "max", "min"})
+_NUMERIC_COERCE_OPS = frozenset({"eq", "gt", "lt", "gte", "lte", "ne"})
 
-    proj = ir.get("projection")
-    if proj:
-        ir["projection"] = [_fix(p) for p in proj]
 
-    return ir
+def _normalize_ir(
+    ir: Any,
+    index: SchemaIndex,
+) -> Optional[Dict[str, Any]]:
+    """Fix, sanitise and validate LLM-generated IR in a single pass.
 
+    In place, per section:
 
-# ---------------------------------------------------------------------------
-# Post-LLM sanitisation — prevent hallucinated / invalid values
-# ---------------------------------------------------------------------------
+    - **conditions** — re-case fields to the schema (last-segment names
+      map to their full path), drop conditions on unknown fields, turn
+      ``contains`` on date fields into ``eq`` and coerce numeric strings
+      on numeric fields.
+    - **aggregation / sort** — re-case the field.
+    - **projection** — re-case and drop unknown fields.
+    - Strip keys the LLM invented and clamp unreasonable limits.
 
-def _sanitize_ir_values(
-    ir: Dict[str, Any],
-    allowed_fields: List[str],
-    field_types: Optional[Dict[str, str]],
-) -> Dict[str, Any]:
-    """Clean up LLM output values to prevent hallucination issues.
-
-    1. Remove conditions that reference non-existent fields.
-    2. Ensure date fields don't use ``contains`` operator (unsupported).
-    3. Strip any extra keys the LLM may have invented.
-    4. Ensure projection only contains schema fields.
-    5. Clamp/remove unreasonable limits.
+    Returns the IR, or ``None`` when its structure is invalid (wrong
+    operation, malformed condition, disallowed operator, bad aggregation
+    type or sort direction).
     """
-    allowed_lower = {f.lower() for f in allowed_fields}
-    # Also allow last-segment matches
-    last_segments: Dict[str, str] = {}
-    for f in allowed_fields:
-        if "." in f:
-            last_segments[f.rsplit(".", 1)[-1].lower()] = f
+    if not isinstance(ir, dict):
+        return None
 
-    ft = field_types or {}
+    if ir.get("operation") not in ("find", "aggregate"):
+        return None
+
+    field_map = index.field_map
+    ft = index.field_types
 
-    # --- Filter out conditions with unknown fields ---
+    # --- conditions ---
+    conditions = ir.get("conditions", [])
+    if not isinstance(conditions, list):
+        return None
     clean_conditions = []
-    for cond in ir.get("conditions", []):
-        fl = cond.get("field", "").lower()
-        if fl not in allowed_lower and fl not in last_segments:
+    for cond in conditions:
+        if not isinstance(cond, dict) or not isinstance(cond.get("field"), str):
+            return None
+        field = field_map.get(cond["field"].lower())
+        if field is None:
             logger.warning(
                 "[LLM-sanitize] Dropping condition with unknown field: %s",
-                cond.get("field"),
+                cond["field"],
             )
             continue
+        cond["field"] = field
+
+        if not {"operator", "value"} <= cond.keys():
+            return None
+        operator = cond["operator"]
+        if operator not in ALLOWED_OPERATORS:
+            return None
 
         # Fix: date fields should not use "contains" (regex)
-        ftype = ft.get(cond.get("field", ""))
-        if ftype == "date" and cond.get("operator") == "contains":
+        ftype = ft.get(field)
+        if ftype == "date" and operator == "contains":
             logger.info(
                 "[LLM-sanitize] Converting contains→eq for date field: %s",
-                cond["field"],
+                field,
             )
             cond["operator"] = "eq"
 
         # Fix: numeric fields should have numeric values for comparison ops
-        if ftype in ("int", "float") and cond.get("operator") in (
-            "eq", "gt", "lt", "gte", "lte", "ne",
-        ):
-            val = cond.get("value")
+        if ftype in ("int", "float") and operator in _NUMERIC_COERCE_OPS:
+            val = cond["value"]
             if isinstance(val, str):
                 try:
                     cond["value"] = int(val)
@@ -249,17 +244,38 @@ def _sanitize_ir_values(
                         pass
 
         clean_conditions.append(cond)
-
     ir["conditions"] = clean_conditions
 
-    # --- Sanitise projection ---
+    # --- aggregation ---
+    agg = ir.get("aggregation")
+    if agg is not None:
+        if not isinstance(agg, dict) or agg.get("type") not in _AGG_TYPES:
+            return None
+        if agg.get("field") and agg["field"] != "*":
+            agg["field"] = field_map.get(agg["field"].lower(), agg["field"])
+
+    # --- sort ---
+    sort_val = ir.get("sort")
+    if sort_val is not None:
+        if not isinstance(sort_val, dict):
+            return None
+        if sort_val.get("direction") not in ("asc", "desc"):
+            return None
+        if sort_val.get("field"):
+            sort_val["field"] = field_map.get(
+                sort_val["field"].lower(), sort_val["field"],
+            )
+
+    # --- projection ---
     proj = ir.get("projection")
-    if proj and isinstance(proj, list):
+    if proj is not None and not isinstance(proj, list):
+        return None
+    if proj:
         clean_proj = []
         for p in proj:
-            pl = p.lower()
-            if pl in allowed_lower or pl in last_segments:
-                clean_proj.append(p)
+            field = field_map.get(p.lower()) if isinstance(p, str) else None
+            if field is not None:
+                clean_proj.append(field)
             else:
                 logger.warning(
                     "[LLM-sanitize] Dropping unknown projection field: %s", p,
@@ -267,12 +283,7 @@ def _sanitize_ir_values(
         ir["projection"] = clean_proj if clean_proj else None
 
     # --- Remove any extra keys the LLM invented ---
-    valid_keys = {
-        "operation", "conditions", "aggregation", "sort",
-        "limit", "projection", "meta",
-    }
-    extra = set(ir.keys()) - valid_keys
-    for k in extra:
+    for k in set(ir.keys()) - _VALID_IR_KEYS:
         logger.warning("[LLM-sanitize] Removing hallucinated key: %s", k)
         del ir[k]
 
@@ -290,6 +301,12 @@ def _sanitize_ir_values(
 # ---------------------------------------------------------------------------
 # JSON extraction from LLM text
 # ---------------------------------------------------------------------------
+_JSON_DECODER = json.JSONDecoder()
+
+# Markdown-fenced JSON: ```json … ``` first, then any ``` … ``` block
+_MD_JSON_RE = re.compile(r"```json\s*\n?(.*?)\n?\s*```", re.DOTALL)
+_MD_GENERIC_RE = re.compile(r"```\s*\n?(.*?)\n?\s*```", re.DOTALL)
+
 
 def _extract_json(text: str) -> Optional[Dict[str, Any]]:
     """Extract the first valid JSON object from *text*.
@@ -300,38 +317,28 @@ def _extract_json(text: str) -> Optional[Dict[str, Any]]:
 
     # 1. Direct parse
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except json.JSONDecodeError:
         pass
 
-    # 2. Markdown code block
-    for pattern in (
-        r"```json\s*\n?(.*?)\n?\s*```",
-        r"```\s*\n?(.*?)\n?\s*```",
-    ):
-        m = re.search(pattern, text, re.DOTALL)
+    # 2. First decodable object starting at a "{" — raw_decode scans in C
+    #    and stops at the end of the object, ignoring trailing prose
+    start = text.find("{")
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+
+    # 3. Markdown code block
+    for pattern in (_MD_JSON_RE, _MD_GENERIC_RE):
+        m = pattern.search(text)
         if m:
             try:
-                return json.loads(m.group(1))
+                return _json_loads(m.group(1))
             except json.JSONDecodeError:
                 continue
 
-    # 3. Find outermost { … } — greedy, balanced braces
-    depth = 0
-    start_idx = None
-    for i, ch in enumerate(text):
-        if ch == "{":
-            if depth == 0:
-                start_idx = i
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0 and start_idx is not None:
-                try:
-                    return json.loads(text[start_idx : i + 1])
-                except json.JSONDecodeError:
-                    start_idx = None
-
     return None
 
 
@@ -353,16 +360,98 @@ def _build_schema_block(
     return "\n".join(lines)
 
 
-def _build_prompt(
+@lru_cache(maxsize=16)
+def _schema_prompt_head(
+    fields: Tuple[str, ...],
+    numeric: FrozenSet[str],
+    types: Tuple[Tuple[str, str], ...],
+) -> str:
+    """Schema part of the dynamic prompt, formatted once per schema."""
+    schema_block = _build_schema_block(list(fields), numeric, dict(types))
+    return f"""DATABASE SCHEMA:
+{schema_block}
+
+Now parse this query:
+
+"""
+
+
+# Static part of the prompt: instructions, operators, rules and examples.
+# It never depends on the query or schema, which lets Gemini serve it from
+# a context cache (see ``_get_gemini_prompt_cache``).
+_STATIC_PROMPT = """You are a MongoDB natural language query parser.  Convert the
+user's natural language query into a structured JSON object that describes
+the query intent, based on the DATABASE SCHEMA given with the query.
+
+OUTPUT FORMAT — respond with ONLY a raw JSON object (no markdown fencing,
+no explanation, no extra text):
+{
+  "operation": "find" | "aggregate",
+  "conditions": [
+    {"field": "<exact field name from schema>", "operator": "<op>", "value": <value>}
+  ],
+  "aggregation": null | {"type": "count|avg|sum|max|min", "field": "<field>"},
+  "sort": null | {"field": "<field>", "direction": "asc|desc"},
+  "limit": null | <integer>,
+  "projection": null | ["<field1>", "<field2>"]
+}
+
+AVAILABLE OPERATORS:
+  eq       – exact match (numbers: strict; strings: case-insensitive)
+  gt / lt  – greater / less than (works on numbers AND dates)
+  gte / lte – greater-or-equal / less-or-equal (works on numbers AND dates)
+  ne       – not equal
+  in       – value MUST be an array; matches if field equals ANY element
+  contains – partial substring match (case-insensitive, strings only)
+  exists   – value is true (field present) or false (field absent)
+
+RULES:
+ 1. Field names: exact schema names only (case-sensitive, dot-notation).
+ 2. Numbers as JSON numbers (50000, not "50000").
+ 3. "in" takes an array: ["a","b"].
+ 4. "aggregate" only for count/avg/sum/max/min; "find" otherwise.
+ 5. Empty conditions [] = all documents.
+ 6. Explicit array literal in the query (["x","y"]) → "eq" with that array.
+ 7. limit 20 for open-ended "show all"; omit for specific look-ups.
+ 8. projection only when specific fields are asked for.
+ 9. count / "how many" → aggregation {"type":"count","field":"*"}.
+10. ID look-ups → "eq" with the exact value given.
+11. Dates (type "date"): ISO "YYYY-MM-DD" or "YYYY-MM-DDTHH:MM:SS".
+    after → gt; before → lt; since/from → gte.
+    "between A and B" / "in <year>" → two conditions, gte and lte.
+    Resolve relative times ("last 30 days", "this month") to ISO dates.
+    Never "contains" on dates.
+
+EXAMPLES:
+
+Query: "show all records"
+{"operation":"find","conditions":[],"aggregation":null,"sort":null,"limit":20,"projection":null}
+
+Query: "find employees with salary greater than 50000"
+{"operation":"find","conditions":[{"field":"salary","operator":"gt","value":50000}],"aggregation":null,"sort":null,"limit":null,"projection":null}
+
+Query: "find movies where genre contains action"
+{"operation":"find","conditions":[{"field":"genre","operator":"contains","value":"action"}],"aggregation":null,"sort":null,"limit":null,"projection":null}
+
+Query: "show records between January 2020 and March 2020"
+{"operation":"find","conditions":[{"field":"date","operator":"gte","value":"2020-01-01"},{"field":"date","operator":"lte","value":"2020-03-31"}],"aggregation":null,"sort":null,"limit":null,"projection":null}
+
+Query: "count orders where status is completed"
+{"operation":"aggregate","conditions":[{"field":"status","operator":"eq","value":"completed"}],"aggregation":{"type":"count","field":"*"},"sort":null,"limit":null,"projection":null}"""
+
+
+def _build_dynamic_prompt(
     query: str,
     allowed_fields: List[str],
     numeric_fields: List[str],
     field_types: Optional[Dict[str, str]],
     history: Optional[List[Dict[str, str]]] = None,
 ) -> str:
-    """Build the full prompt sent to the LLM."""
-    schema_block = _build_schema_block(
-        allowed_fields, numeric_fields, field_types,
+    """Per-request tail of the prompt: schema, user query and history."""
+    head = _schema_prompt_head(
+        tuple(allowed_fields),
+        frozenset(numeric_fields),
+        tuple(sorted((field_types or {}).items())),
     )
 
     # Build conversation history block if provided
@@ -384,117 +473,237 @@ def _build_prompt(
             + "\n".join(lines)
         )
 
-    # Use double-braces {{ }} to escape literal JSON braces inside f-string
-    return f"""You are a MongoDB natural language query parser.  Convert the
-user's natural language query into a structured JSON object that describes
-the query intent, based on the database schema provided below.
+    return head + f"""USER QUERY: "{query}"
+{history_block}
+Important: Respond ONLY with the JSON object, as minified single-line JSON with no
+whitespace. No explanation, no markdown."""
 
-DATABASE SCHEMA:
-{schema_block}
 
-OUTPUT FORMAT — respond with ONLY a raw JSON object (no markdown fencing,
-no explanation, no extra text):
-{{
-  "operation": "find" | "aggregate",
-  "conditions": [
-    {{"field": "<exact field name from schema>", "operator": "<op>", "value": <value>}}
-  ],
-  "aggregation": null | {{"type": "count|avg|sum|max|min", "field": "<field>"}},
-  "sort": null | {{"field": "<field>", "direction": "asc|desc"}},
-  "limit": null | <integer>,
-  "projection": null | ["<field1>", "<field2>"]
-}}
+def _build_prompt(
+    query: str,
+    allowed_fields: List[str],
+    numeric_fields: List[str],
+    field_types: Optional[Dict[str, str]],
+    history: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """Build the full prompt sent to the LLM."""
+    return _STATIC_PROMPT + "\n\n" + _build_dynamic_prompt(
+        query, allowed_fields, numeric_fields, field_types, history,
+    )
 
-AVAILABLE OPERATORS:
-  eq       – exact match (numbers: strict; strings: case-insensitive)
-  gt / lt  – greater / less than (works on numbers AND dates)
-  gte / lte – greater-or-equal / less-or-equal (works on numbers AND dates)
-  ne       – not equal
-  in       – value MUST be an array; matches if field equals ANY element
-  contains – partial substring match (case-insensitive, strings only)
-  exists   – value is true (field present) or false (field absent)
 
-CRITICAL RULES:
- 1. Field names MUST exactly match the schema (case-sensitive, dot-notation).
- 2. Numeric values must be JSON numbers, not strings (50000, not "50000").
- 3. For the "in" operator the value MUST be an array: ["a","b"].
- 4. Use "aggregate" ONLY when the user asks for count / avg / sum / max / min.
- 5. Use "find" for listing, filtering, showing, or searching.
- 6. Empty conditions [] = match all documents.
- 7. If the query contains an explicit array literal like ["x","y","z"], use
-    operator "eq" with that array as the value (exact array match in MongoDB).
- 8. Default limit to 20 for open-ended "show all" queries; omit limit for
-    specific look-ups.
- 9. Include projection ONLY when the user explicitly asks for specific fields.
-10. For "count" / "how many" requests use aggregate with type "count" and
-    field "*".
-11. DATE/TIME RULES:
-    - For date/time fields (type "date"), use ISO 8601 format: "YYYY-MM-DD"
-      or "YYYY-MM-DDTHH:MM:SS".
-    - "after <date>" → operator "gt", "before <date>" → operator "lt".
-    - "since <date>" or "from <date>" → operator "gte".
-    - "between <date1> and <date2>" → TWO conditions: gte and lte.
-    - "in <year>" → gte "YYYY-01-01" and lte "YYYY-12-31".
-    - NEVER use "contains" or "$regex" on date fields — use gt/lt/gte/lte/eq.
-    - For relative times like "last 30 days", "yesterday", "this month",
-      calculate the actual ISO date.
-12. ONLY use field names that exist in the DATABASE SCHEMA above. Do NOT
-    invent, guess, or hallucinate field names.
-13. When the user asks for a specific record by ID, use "eq" with the exact
-    value provided.
+# ---------------------------------------------------------------------------
+# Response cache — identical prompts skip the LLM round-trip
+# ---------------------------------------------------------------------------
+# The prompt embeds the query, schema and history, so hashing it (plus the
+# provider/model) is a complete key.  Entries expire so that relative dates
+# ("last 30 days") the model resolved are not served stale for long.
+LLM_CACHE_TTL = 600  # seconds
+LLM_CACHE_MAX_ENTRIES = 512
+
+# key → (stored_at, model_name, IR as JSON); ordered oldest → newest use
+_llm_cache: "OrderedDict[str, Tuple[float, str, str]]" = OrderedDict()
+# parse_with_llm runs on threadpool workers; guards every _llm_cache access
+_llm_cache_lock = threading.Lock()
+
+
+def _llm_cache_key(provider: str, primary_model: str, prompt: str) -> str:
+    raw = f"{provider}\x00{primary_model}\x00{prompt}".encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+# Second tier: a SQLite file shared by every worker process and surviving
+# restarts.  Keys are scoped to the calendar day so relative dates resolved
+# yesterday are never reused today.  The file lives in the user's cache
+# directory (not the shared temp dir) next to the schema cache.
+# Set LLM_DISK_CACHE_PATH=off to disable.
+LLM_DISK_CACHE_TTL = 24 * 3600  # seconds
+LLM_DISK_CACHE_PATH = (
+    os.getenv("LLM_DISK_CACHE_PATH", "").strip()
+    or os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "nlp-mongodb-interface",
+        "llm_cache.sqlite3",
+    )
+)
 
-EXAMPLES:
+_disk_cache: Optional[sqlite3.Connection] = None
+_disk_cache_failed = False
+_disk_cache_lock = threading.Lock()
 
-Query: "show all records"
-{{"operation":"find","conditions":[],"aggregation":null,"sort":null,"limit":20,"projection":null}}
 
-Query: "find employees with salary greater than 50000"
-{{"operation":"find","conditions":[{{"field":"salary","operator":"gt","value":50000}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
+def _get_disk_cache() -> Optional[sqlite3.Connection]:
+    """Open the disk cache once (purging expired rows); ``None`` if disabled."""
+    global _disk_cache, _disk_cache_failed
+    if _disk_cache is not None or _disk_cache_failed or LLM_DISK_CACHE_PATH == "off":
+        return _disk_cache
+    try:
+        os.makedirs(os.path.dirname(LLM_DISK_CACHE_PATH) or ".", mode=0o700, exist_ok=True)
+        conn = sqlite3.connect(LLM_DISK_CACHE_PATH, timeout=1.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, stored_at REAL, model TEXT, ir TEXT)"
+        )
+        conn.execute(
+            "DELETE FROM llm_cache WHERE stored_at < ?",
+            (time.time() - LLM_DISK_CACHE_TTL,),
+        )
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("[LLM] Disk cache %s unavailable: %s", LLM_DISK_CACHE_PATH, e)
+        _disk_cache_failed = True
+        return None
+    _disk_cache = conn
+    return conn
 
-Query: "show name and email of users in Sales department"
-{{"operation":"find","conditions":[{{"field":"department","operator":"eq","value":"Sales"}}],"aggregation":null,"sort":null,"limit":null,"projection":["name","email"]}}
 
-Query: "top 5 products sorted by price descending"
-{{"operation":"find","conditions":[],"aggregation":null,"sort":{{"field":"price","direction":"desc"}},"limit":5,"projection":null}}
+def _disk_key(key: str) -> str:
+    return f"{key}:{date.today().isoformat()}"
 
-Query: "count orders where status is completed"
-{{"operation":"aggregate","conditions":[{{"field":"status","operator":"eq","value":"completed"}}],"aggregation":{{"type":"count","field":"*"}},"sort":null,"limit":null,"projection":null}}
 
-Query: "show row with cast [\\"Pearl White\\",\\"Crane Wilbur\\"]"
-{{"operation":"find","conditions":[{{"field":"cast","operator":"eq","value":["Pearl White","Crane Wilbur"]}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
+def _disk_cache_get(key: str) -> Optional[Tuple[str, str]]:
+    conn = _get_disk_cache()
+    if conn is None:
+        return None
+    try:
+        with _disk_cache_lock:
+            row = conn.execute(
+                "SELECT stored_at, model, ir FROM llm_cache WHERE key = ?",
+                (_disk_key(key),),
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("[LLM] Disk cache read failed: %s", e)
+        return None
+    if row is None or time.time() - row[0] > LLM_DISK_CACHE_TTL:
+        return None
+    return row[1], row[2]
 
-Query: "find movies where genre contains action"
-{{"operation":"find","conditions":[{{"field":"genre","operator":"contains","value":"action"}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
 
-Query: "average salary of employees"
-{{"operation":"aggregate","conditions":[],"aggregation":{{"type":"avg","field":"salary"}},"sort":null,"limit":null,"projection":null}}
+def _disk_cache_put(key: str, model_name: str, ir_json: str) -> None:
+    conn = _get_disk_cache()
+    if conn is None:
+        return
+    try:
+        with _disk_cache_lock:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                (_disk_key(key), time.time(), model_name, ir_json),
+            )
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("[LLM] Disk cache write failed: %s", e)
 
-Query: "show records where date is after 2020-01-01"
-{{"operation":"find","conditions":[{{"field":"date","operator":"gt","value":"2020-01-01"}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
 
-Query: "find comments from 1975"
-{{"operation":"find","conditions":[{{"field":"date","operator":"gte","value":"1975-01-01"}},{{"field":"date","operator":"lte","value":"1975-12-31"}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
+def _llm_cache_get(key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Return ``(model_name, fresh IR copy)`` for *key*, or ``None``.
 
-Query: "show records between January 2020 and March 2020"
-{{"operation":"find","conditions":[{{"field":"date","operator":"gte","value":"2020-01-01"}},{{"field":"date","operator":"lte","value":"2020-03-31"}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
+    Checks memory first, then the disk cache (promoting hits to memory).
+    """
+    with _llm_cache_lock:
+        entry = _llm_cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] > LLM_CACHE_TTL:
+            _llm_cache.pop(key, None)
+            entry = None
+        if entry is not None:
+            _llm_cache.move_to_end(key)
+    if entry is None:
+        disk_entry = _disk_cache_get(key)
+        if disk_entry is None:
+            return None
+        model_name, ir_json = disk_entry
+        _llm_cache_store(key, model_name, ir_json)
+        return model_name, _json_loads(ir_json)
+    _, model_name, ir_json = entry
+    return model_name, _json_loads(ir_json)
+
+
+def _llm_cache_store(key: str, model_name: str, ir_json: str) -> None:
+    with _llm_cache_lock:
+        _llm_cache[key] = (time.monotonic(), model_name, ir_json)
+        _llm_cache.move_to_end(key)
+        while len(_llm_cache) > LLM_CACHE_MAX_ENTRIES:
+            _llm_cache.popitem(last=False)
+
+
+def _llm_cache_put(key: str, model_name: str, ir: Dict[str, Any]) -> None:
+    ir_json = _json_dumps(ir)
+    _llm_cache_store(key, model_name, ir_json)
+    _disk_cache_put(key, model_name, ir_json)
+
+
+def clear_llm_cache() -> None:
+    """Drop all cached LLM responses, in memory and on disk."""
+    with _llm_cache_lock:
+        _llm_cache.clear()
+    conn = _get_disk_cache()
+    if conn is None:
+        return
+    try:
+        with _disk_cache_lock:
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("[LLM] Disk cache clear failed: %s", e)
 
-Query: "find products with price between 100 and 500"
-{{"operation":"find","conditions":[{{"field":"price","operator":"gte","value":100}},{{"field":"price","operator":"lte","value":500}}],"aggregation":null,"sort":null,"limit":null,"projection":null}}
 
-Now parse this query:
+# ---------------------------------------------------------------------------
+# Provider-specific LLM call helpers
+# ---------------------------------------------------------------------------
 
-USER QUERY: "{query}"
-{history_block}
-Important: Respond ONLY with the JSON object. No explanation, no markdown."""
+# An IR is ~100 tokens; anything near this cap is runaway output.  Decode
+# time scales with output length, so keep the ceiling tight.
+MAX_OUTPUT_TOKENS = 256
 
+# Bumped on every 429 from either provider; ``parse_many_with_llm`` watches
+# it to back off, since the call helpers swallow the exception itself.
+_rate_limit_hits = 0
+_rate_limit_lock = threading.Lock()  # bumped from worker threads
 
-# ---------------------------------------------------------------------------
-# Main entry point
-# ---------------------------------------------------------------------------
 
-# ---------------------------------------------------------------------------
-# Provider-specific LLM call helpers
-# ---------------------------------------------------------------------------
+def _note_rate_limited() -> None:
+    global _rate_limit_hits
+    with _rate_limit_lock:
+        _rate_limit_hits += 1
+
+
+# Providers report remaining quota in response headers (Groq always,
+# Gemini when the SDK exposes ``sdk_http_response``).  When less than
+# LOW_QUOTA_FRACTION is left, new calls wait LOW_QUOTA_PAUSE seconds
+# instead of running into a 429 and its multi-second backoff.
+LOW_QUOTA_FRACTION = 0.1
+LOW_QUOTA_PAUSE = 1.0  # seconds
+_QUOTA_HEADERS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-limit-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-limit-tokens"),
+)
+_PAUSE_UNTIL = 0.0  # time.monotonic() before which no call is started
+
+
+def _note_quota_headers(headers) -> None:
+    global _PAUSE_UNTIL
+    if not headers:
+        return
+    for remaining_key, limit_key in _QUOTA_HEADERS:
+        try:
+            remaining = float(headers.get(remaining_key))
+            limit = float(headers.get(limit_key))
+        except (TypeError, ValueError):
+            continue
+        if limit > 0 and remaining < LOW_QUOTA_FRACTION * limit:
+            _PAUSE_UNTIL = max(_PAUSE_UNTIL, time.monotonic() + LOW_QUOTA_PAUSE)
+            logger.warning(
+                "[LLM] Quota low (%s=%d of %d) — pausing new calls for %.1fs",
+                remaining_key, remaining, limit, LOW_QUOTA_PAUSE,
+            )
+            return
+
+
+def _wait_for_quota() -> None:
+    wait = _PAUSE_UNTIL - time.monotonic()
+    if wait > 0:
+        time.sleep(wait)
+
 
 def _call_groq(prompt: str, models_to_try: List[str]):
     """Call the Groq API. Returns (raw_text, model_name, elapsed) or Nones."""
@@ -512,17 +721,26 @@ def _call_groq(prompt: str, models_to_try: List[str]):
         model_succeeded = False
 
         for attempt in range(max_retries + 1):
+            _wait_for_quota()
             start = time.time()
             try:
-                response = client.chat.completions.create(
+                raw_response = client.chat.completions.with_raw_response.create(
                     model=current_model,
                     messages=[
                         {"role": "user", "content": prompt},
                     ],
                     temperature=0.0,
-                    max_tokens=1024,
+                    max_tokens=MAX_OUTPUT_TOKENS,
                 )
                 elapsed = time.time() - start
+                _note_quota_headers(raw_response.headers)
+                response = raw_response.parse()
+                if response.choices[0].finish_reason == "length":
+                    logger.warning(
+                        "[LLM-Groq] %s hit the %d-token output cap — discarding "
+                        "truncated response", current_model, MAX_OUTPUT_TOKENS,
+                    )
+                    return None, None, 0.0
                 raw_text = response.choices[0].message.content
                 model_name = current_model
                 logger.info(
@@ -538,6 +756,8 @@ def _call_groq(prompt: str, models_to_try: List[str]):
                 is_retriable = "429" in err_str or "404" in err_str
 
                 if is_retriable:
+                    if "429" in err_str:
+                        _note_rate_limited()
                     if "429" in err_str and attempt < max_retries:
                         wait = min(5, 4 * (attempt + 1))
                         logger.warning(
@@ -561,8 +781,175 @@ def _call_groq(prompt: str, models_to_try: List[str]):
     return raw_text, model_name, elapsed
 
 
-def _call_gemini(prompt: str, models_to_try: List[str]):
-    """Call the Google Gemini API. Returns (raw_text, model_name, elapsed) or Nones."""
+# Gemini context caches holding ``_STATIC_PROMPT``, per model:
+# model → (cache name or None if unavailable, monotonic re-check time)
+PROMPT_CACHE_TTL = 3600  # seconds
+_gemini_prompt_caches: Dict[str, Tuple[Optional[str], float]] = {}
+
+
+def _get_gemini_prompt_cache(client, model: str) -> Optional[str]:
+    """Return a cached-content name holding ``_STATIC_PROMPT`` for *model*.
+
+    Created lazily and refreshed shortly before its TTL runs out.  Models
+    or accounts that reject explicit caching (e.g. prompt below the
+    minimum cacheable size) are remembered as ``None`` for one TTL so the
+    create call is not retried on every request.
+    """
+    now = time.monotonic()
+    entry = _gemini_prompt_caches.get(model)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+    try:
+        from google.genai import types
+        cache = client.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                system_instruction=_STATIC_PROMPT,
+                ttl=f"{PROMPT_CACHE_TTL}s",
+            ),
+        )
+        name = cache.name
+        logger.info("[LLM-Gemini] Created prompt cache %s for %s", name, model)
+    except Exception as e:
+        logger.info("[LLM-Gemini] Prompt caching unavailable for %s: %s", model, e)
+        name = None
+    _gemini_prompt_caches[model] = (name, now + PROMPT_CACHE_TTL - 60)
+    return name
+
+
+# ---------------------------------------------------------------------------
+# Gemini rate limiting — block locally instead of learning limits from 429s
+# ---------------------------------------------------------------------------
+class _RateLimiter:
+    """Two token buckets, requests/min and tokens/min, refilled continuously.
+
+    ``acquire`` blocks the calling thread until both buckets can cover the
+    request; ``reconcile`` hands back (or charges) the difference once the
+    real token count is known.  A capacity of 0 disables that bucket.
+    """
+
+    def __init__(self, rpm_capacity: int, tpm_capacity: int) -> None:
+        self.rpm_capacity = rpm_capacity
+        self.tpm_capacity = tpm_capacity
+        self._requests = float(rpm_capacity)
+        self._tokens = float(tpm_capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        dt = now - self._updated
+        self._updated = now
+        self._requests = min(self.rpm_capacity, self._requests + self.rpm_capacity * dt / 60)
+        self._tokens = min(self.tpm_capacity, self._tokens + self.tpm_capacity * dt / 60)
+
+    def acquire(self, est_tokens: int) -> None:
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                # A request larger than the whole bucket waits for a full one
+                need_tokens = min(est_tokens, self.tpm_capacity)
+                wait = 0.0
+                if self.rpm_capacity and self._requests < 1:
+                    wait = (1 - self._requests) * 60 / self.rpm_capacity
+                if self.tpm_capacity and self._tokens < need_tokens:
+                    wait = max(wait, (need_tokens - self._tokens) * 60 / self.tpm_capacity)
+                if wait == 0.0:
+                    if self.rpm_capacity:
+                        self._requests -= 1
+                    if self.tpm_capacity:
+                        self._tokens -= need_tokens
+                    return
+            logger.debug("[LLM-Gemini] Rate limiter: waiting %.2fs", wait)
+            time.sleep(wait)
+
+    def reconcile(self, est_tokens: int, actual_tokens: int) -> None:
+        if not self.tpm_capacity:
+            return
+        with self._lock:
+            self._tokens = min(
+                self.tpm_capacity,
+                self._tokens + min(est_tokens, self.tpm_capacity) - actual_tokens,
+            )
+
+
+_RATE_LIMITER = _RateLimiter(
+    int(os.getenv("GEMINI_RPM", "30")),
+    int(os.getenv("GEMINI_TPM", "1000000")),
+)
+
+
+def _finish_reason(response) -> Optional[str]:
+    candidates = getattr(response, "candidates", None)
+    finish = candidates[0].finish_reason if candidates else None
+    return getattr(finish, "name", finish)
+
+
+def _total_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", None)
+
+
+def _note_gemini_headers(response) -> None:
+    http_response = getattr(response, "sdk_http_response", None)
+    _note_quota_headers(getattr(http_response, "headers", None))
+
+
+def _gemini_generate(client, model: str, contents: str, config):
+    """Run one Gemini request.  Returns ``(text, finish_reason, total_tokens)``.
+
+    Streams when the SDK supports it and stops reading as soon as the
+    buffer holds a complete JSON object — the IR is all that is needed,
+    so trailing tokens are never waited for.  An early exit reports no
+    finish reason (the answer is complete) and usually no token count.
+    """
+    stream_fn = getattr(client.models, "generate_content_stream", None)
+    if stream_fn is None:
+        response = client.models.generate_content(
+            model=model, contents=contents, config=config,
+        )
+        _note_gemini_headers(response)
+        return response.text, _finish_reason(response), _total_tokens(response)
+
+    parts: List[str] = []
+    finish = total = None
+    stream = stream_fn(model=model, contents=contents, config=config)
+    try:
+        for chunk in stream:
+            if not parts:
+                _note_gemini_headers(chunk)
+            text = chunk.text or ""
+            parts.append(text)
+            finish = _finish_reason(chunk) or finish
+            total = _total_tokens(chunk) or total
+            if "}" not in text:
+                continue
+            buf = "".join(parts)
+            start = buf.find("{")
+            if start == -1:
+                continue
+            try:
+                _JSON_DECODER.raw_decode(buf, start)
+            except ValueError:
+                continue
+            return buf, None, total
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts), finish, total
+
+
+def _call_gemini(
+    prompt: str,
+    models_to_try: List[str],
+    dynamic_prompt: Optional[str] = None,
+):
+    """Call the Google Gemini API. Returns (raw_text, model_name, elapsed) or Nones.
+
+    When *dynamic_prompt* (the per-request tail of *prompt*) is given and
+    the model has a context cache for ``_STATIC_PROMPT``, only the tail is
+    sent; otherwise the full *prompt* is.
+    """
     client = _get_genai_client()
     if client is None:
         return None, None, 0.0
@@ -577,19 +964,38 @@ def _call_gemini(prompt: str, models_to_try: List[str]):
         model_succeeded = False
 
         for attempt in range(max_retries + 1):
+            cache_name = (
+                _get_gemini_prompt_cache(client, current_model)
+                if dynamic_prompt is not None else None
+            )
+            contents = dynamic_prompt if cache_name else prompt
+            # ~4 chars per token for the input, plus the output ceiling
+            est_tokens = len(contents) // 4 + MAX_OUTPUT_TOKENS
+            _RATE_LIMITER.acquire(est_tokens)
+            _wait_for_quota()
             start = time.time()
             try:
                 from google.genai import types
-                response = client.models.generate_content(
-                    model=current_model,
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
+                text, finish, total_tokens = _gemini_generate(
+                    client,
+                    current_model,
+                    contents,
+                    types.GenerateContentConfig(
                         temperature=0.0,
-                        max_output_tokens=1024,
+                        max_output_tokens=MAX_OUTPUT_TOKENS,
+                        cached_content=cache_name,
                     ),
                 )
                 elapsed = time.time() - start
-                raw_text = response.text
+                if total_tokens:
+                    _RATE_LIMITER.reconcile(est_tokens, total_tokens)
+                if finish == "MAX_TOKENS":
+                    logger.warning(
+                        "[LLM-Gemini] %s hit the %d-token output cap — discarding "
+                        "truncated response", current_model, MAX_OUTPUT_TOKENS,
+                    )
+                    return None, None, 0.0
+                raw_text = text
                 model_name = current_model
                 logger.info(
                     "[LLM-Gemini] %s responded in %.2fs (%d chars)",
@@ -601,9 +1007,21 @@ def _call_gemini(prompt: str, models_to_try: List[str]):
             except Exception as e:
                 elapsed = time.time() - start
                 err_str = str(e)
+                if cache_name is not None and "429" not in err_str:
+                    # Expired/rejected cache — disable it and resend in full
+                    logger.warning(
+                        "[LLM-Gemini] %s failed with prompt cache %s (%s); "
+                        "retrying without it", current_model, cache_name, e,
+                    )
+                    _gemini_prompt_caches[current_model] = (
+                        None, time.monotonic() + PROMPT_CACHE_TTL,
+                    )
+                    continue
                 is_retriable = "429" in err_str or "404" in err_str or "NOT_FOUND" in err_str
 
                 if is_retriable:
+                    if "429" in err_str:
+                        _note_rate_limited()
                     if "429" in err_str and attempt < max_retries:
                         wait = min(5, 4 * (attempt + 1))
                         logger.warning(
@@ -627,10 +1045,99 @@ def _call_gemini(prompt: str, models_to_try: List[str]):
     return raw_text, model_name, elapsed
 
 
+# ---------------------------------------------------------------------------
+# Response post-processing
+# ---------------------------------------------------------------------------
+
+# Fixed part of ``meta`` on every LLM-produced IR
+_META_TEMPLATE = {"confidence": 0.95, "needs_clarification": False, "parser": "llm"}
+
+
+def _ir_from_llm_text(
+    raw_text: str,
+    index: SchemaIndex,
+    model_name: str,
+    elapsed: float,
+) -> Optional[Dict[str, Any]]:
+    """Turn raw LLM output into a sanitised, validated IR (or ``None``).
+
+    *index* comes from ``_get_schema_index`` — callers look it up once and
+    reuse it for every response against the same schema.
+    """
+    # ---- Extract & validate JSON ----
+    ir = _extract_json(raw_text)
+    if ir is None:
+        logger.warning(
+            "[LLM] Could not extract JSON from response: %s",
+            raw_text[:300],
+        )
+        return None
+
+    # Re-case fields, drop hallucinated ones, fix date operators, validate
+    normalized = _normalize_ir(ir, index)
+    if normalized is None:
+        logger.warning(
+            "[LLM] IR structure validation failed: %s",
+            _json_dumps(ir)[:300],
+        )
+        return None
+    ir = normalized
+
+    # ---- Normalise & enrich ----
+    ir.setdefault("operation", "find")
+    ir.setdefault("conditions", [])
+    ir.setdefault("aggregation", None)
+    ir.setdefault("sort", None)
+    ir.setdefault("limit", None)
+    ir.setdefault("projection", None)
+
+    ir["meta"] = {
+        **_META_TEMPLATE,
+        "model": model_name,
+        "latency_ms": int(elapsed * 1000),
+    }
+
+    logger.info(
+        "[LLM] Parsed OK: operation=%s, conditions=%d, agg=%s, sort=%s, "
+        "limit=%s, projection=%s",
+        ir["operation"],
+        len(ir["conditions"]),
+        ir.get("aggregation", {}).get("type") if ir.get("aggregation") else None,
+        ir.get("sort"),
+        ir.get("limit"),
+        ir.get("projection"),
+    )
+
+    return ir
+
+
 # ---------------------------------------------------------------------------
 # Main entry point
 # ---------------------------------------------------------------------------
 
+# Whole-query patterns the rule parser always gets right ("show all",
+# "count records", ...).  Only unambiguous shapes belong here — anything
+# with a field, value or ID still goes to the LLM.
+_TRIVIAL_PATTERNS = (
+    re.compile(
+        r"^(?:show|list|get|display|fetch|find)\s+(?:me\s+)?(?:all|everything)"
+        r"(?:\s+(?:the\s+)?(?:records|documents|docs|rows|entries|items|data))?$",
+        re.I,
+    ),
+    re.compile(
+        r"^(?:count|how\s+many)(?:\s+(?:all|the))?"
+        r"(?:\s+(?:records|documents|docs|rows|entries|items))?"
+        r"(?:\s+are\s+there)?$",
+        re.I,
+    ),
+)
+
+
+def _is_trivial_query(query: str) -> bool:
+    text = query.strip().rstrip("?.!").strip()
+    return any(p.match(text) for p in _TRIVIAL_PATTERNS)
+
+
 def parse_with_llm(
     query: str,
     allowed_fields: List[str],
@@ -649,12 +1156,26 @@ def parse_with_llm(
       - The LLM call fails
       - The response cannot be parsed into valid IR
 
+    Trivial queries ("show all", "count records") skip the LLM and are
+    answered by ``parser.parse_to_ir()`` directly; their ``meta.parser``
+    is ``"rule-based"``.
+
     Callers should fall back to ``parser.parse_to_ir()`` when this returns
     ``None``.
     """
+    if _is_trivial_query(query):
+        ir = parse_to_ir(query, allowed_fields, numeric_fields)
+        if ir is not None:
+            ir["meta"]["parser"] = "rule-based"
+            logger.info("[LLM] Trivial query — answered by rule parser")
+            return ir
+
     provider = _get_llm_provider()
 
-    prompt = _build_prompt(query, allowed_fields, numeric_fields, field_types, history)
+    dynamic_prompt = _build_dynamic_prompt(
+        query, allowed_fields, numeric_fields, field_types, history,
+    )
+    prompt = _STATIC_PROMPT + "\n\n" + dynamic_prompt
 
     if provider == "groq":
         api_key = os.getenv("GROQ_API_KEY", "").strip()
@@ -669,7 +1190,6 @@ def parse_with_llm(
             "mixtral-8x7b-32768",
         ]
         models_to_try = list(dict.fromkeys(_FALLBACK_MODELS))
-        raw_text, model_name, elapsed = _call_groq(prompt, models_to_try)
     else:
         # Gemini
         api_key = os.getenv("GEMINI_API_KEY", "").strip()
@@ -683,58 +1203,230 @@ def parse_with_llm(
             "gemini-2.0-flash",
         ]
         models_to_try = list(dict.fromkeys(_FALLBACK_MODELS))
-        raw_text, model_name, elapsed = _call_gemini(prompt, models_to_try)
 
-    if raw_text is None:
-        return None
+    cache_key = _llm_cache_key(provider, primary_model, prompt)
+    cached = _llm_cache_get(cache_key)
+    if cached is not None:
+        model_name, ir = cached
+        ir["meta"]["latency_ms"] = 0
+        logger.info("[LLM] Cache hit (%s) — skipping %s call", model_name, provider)
+        return ir
 
-    # ---- Extract & validate JSON ----
-    ir = _extract_json(raw_text)
-    if ir is None:
-        logger.warning(
-            "[LLM] Could not extract JSON from response: %s",
-            raw_text[:300],
+    if provider == "groq":
+        raw_text, model_name, elapsed = _call_groq(prompt, models_to_try)
+    else:
+        raw_text, model_name, elapsed = _call_gemini(prompt, models_to_try, dynamic_prompt)
+
+    index = _get_schema_index(allowed_fields, field_types)
+    ir = None
+    if raw_text is not None:
+        ir = _ir_from_llm_text(raw_text, index, model_name, elapsed)
+
+    # Optional second opinion from a larger model when the light default
+    # produced nothing usable (invalid, truncated or failed)
+    escalate_model = (
+        os.getenv("GEMINI_MODEL_ESCALATE", "").strip() if provider == "gemini" else ""
+    )
+    if ir is None and escalate_model and escalate_model != model_name:
+        logger.info("[LLM] No usable IR from %s — escalating to %s",
+                    model_name, escalate_model)
+        raw_text, model_name, elapsed = _call_gemini(
+            prompt, [escalate_model], dynamic_prompt,
         )
-        return None
+        if raw_text is not None:
+            ir = _ir_from_llm_text(raw_text, index, model_name, elapsed)
 
-    # Fix field-name casing so downstream validation passes
-    ir = _fix_field_names(ir, allowed_fields)
+    if ir is not None:
+        _llm_cache_put(cache_key, model_name, ir)
+    return ir
 
-    # Sanitise values — drop hallucinated fields, fix date operators, etc.
-    ir = _sanitize_ir_values(ir, allowed_fields, field_types)
 
-    if not _validate_ir_structure(ir, allowed_fields):
-        logger.warning(
-            "[LLM] IR structure validation failed: %s",
-            json.dumps(ir)[:300],
-        )
-        return None
+# ---------------------------------------------------------------------------
+# Concurrent entry point — AIMD admission control
+# ---------------------------------------------------------------------------
+CONCURRENCY_MAX = 8  # in-flight LLM calls at full speed
+CONCURRENCY_INCREASE_EVERY = 20  # successes per +1 step back towards the max
 
-    # ---- Normalise & enrich ----
-    ir.setdefault("operation", "find")
-    ir.setdefault("conditions", [])
-    ir.setdefault("aggregation", None)
-    ir.setdefault("sort", None)
-    ir.setdefault("limit", None)
-    ir.setdefault("projection", None)
 
-    ir["meta"] = {
-        "confidence": 0.95,
-        "needs_clarification": False,
-        "parser": "llm",
-        "model": model_name,
-        "latency_ms": int(elapsed * 1000),
-    }
+class _AIMDLimiter:
+    """Concurrency cap that halves on a rate limit and creeps back up by
+    one every *increase_every* successes (additive-increase /
+    multiplicative-decrease).  ``asyncio.Semaphore`` cannot be resized,
+    hence the condition variable.
+    """
 
-    logger.info(
-        "[LLM] Parsed OK: operation=%s, conditions=%d, agg=%s, sort=%s, "
-        "limit=%s, projection=%s",
-        ir["operation"],
-        len(ir["conditions"]),
-        ir.get("aggregation", {}).get("type") if ir.get("aggregation") else None,
-        ir.get("sort"),
-        ir.get("limit"),
-        ir.get("projection"),
+    def __init__(self, max_limit: int, increase_every: int) -> None:
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.increase_every = increase_every
+        self._in_flight = 0
+        self._successes = 0
+        # ``_rate_limit_hits`` value behind the last decrease: every call in
+        # flight during one 429 sees it, but the limit only halves once
+        self._last_decrease_hits = _rate_limit_hits
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, hits_before: int, hits_now: int) -> None:
+        """Release a slot; *hits_before* / *hits_now* are ``_rate_limit_hits``
+        when the call started and ended."""
+        async with self._cond:
+            self._in_flight -= 1
+            if hits_now != hits_before:
+                # Halve once per new 429, not once per call that saw it
+                if hits_now > self._last_decrease_hits:
+                    self._last_decrease_hits = hits_now
+                    self.limit = max(1, int(self.limit * 0.5))
+                    logger.warning("[LLM] Rate-limited — concurrency now %d", self.limit)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.increase_every:
+                    self._successes = 0
+                    self.limit = min(self.max_limit, self.limit + 1)
+            self._cond.notify_all()
+
+
+async def parse_many_with_llm(
+    queries: List[str],
+    allowed_fields: List[str],
+    numeric_fields: List[str],
+    field_types: Optional[Dict[str, str]] = None,
+    max_concurrency: int = CONCURRENCY_MAX,
+) -> List[Optional[Dict[str, Any]]]:
+    """Parse several queries concurrently against the same schema.
+
+    Each query runs ``parse_with_llm`` in a worker thread, so the response
+    cache, model fallback and post-processing are shared with the
+    single-query path.  At most *max_concurrency* calls are in flight; a
+    429 from the provider halves that and successes slowly restore it.
+
+    Returns one entry per query, in order, with ``None`` where the LLM
+    produced no valid IR (callers fall back to the rule parser as usual).
+    """
+    limiter = _AIMDLimiter(max(1, max_concurrency), CONCURRENCY_INCREASE_EVERY)
+
+    async def bounded(query: str) -> Optional[Dict[str, Any]]:
+        await limiter.acquire()
+        hits_before = _rate_limit_hits
+        try:
+            return await asyncio.to_thread(
+                parse_with_llm, query, allowed_fields, numeric_fields, field_types,
+            )
+        finally:
+            await limiter.release(hits_before, _rate_limit_hits)
+
+    return list(await asyncio.gather(*(bounded(q) for q in queries)))
+
+
+# ---------------------------------------------------------------------------
+# Bulk entry point — Gemini Batch API
+# ---------------------------------------------------------------------------
+BATCH_POLL_INTERVAL = 30  # seconds between job status checks
+_BATCH_DONE_STATES = frozenset({
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+})
+
+
+def parse_batch_with_llm(
+    queries: List[str],
+    allowed_fields: List[str],
+    numeric_fields: List[str],
+    field_types: Optional[Dict[str, str]] = None,
+    poll_interval: float = BATCH_POLL_INTERVAL,
+    timeout: float = 24 * 3600,
+) -> List[Optional[Dict[str, Any]]]:
+    """Parse many queries in one Gemini Batch API job.
+
+    Batch jobs cost half the interactive rate and have separate rate
+    limits, but finish in minutes to hours — meant for offline work
+    (evaluations, labelling historical query logs), not request handling.
+    Blocks, polling every *poll_interval* seconds, until the job ends or
+    *timeout* elapses.
+
+    Returns one entry per query, in order: the IR, or ``None`` where no
+    valid IR could be produced (including when the job fails or no Gemini
+    client is available).  Each response goes through the same
+    post-processing as ``parse_with_llm``.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+    if not queries:
+        return results
+
+    client = _get_genai_client()
+    if client is None:
+        logger.debug("No Gemini client — skipping batch LLM parser")
+        return results
+
+    from google.genai import types
+    model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-lite")
+
+    # One JSONL request per query; the key maps results back to positions
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            for i, query in enumerate(queries):
+                prompt = _build_prompt(query, allowed_fields, numeric_fields, field_types)
+                fh.write(_json_dumps({
+                    "key": f"q_{i}",
+                    "request": {
+                        "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                        "generation_config": {
+                            "temperature": 0.0,
+                            "max_output_tokens": MAX_OUTPUT_TOKENS,
+                        },
+                    },
+                }) + "\n")
+        uploaded = client.files.upload(
+            file=path,
+            config=types.UploadFileConfig(display_name="nlq-batch", mime_type="jsonl"),
+        )
+    finally:
+        os.remove(path)
+
+    start = time.time()
+    job = client.batches.create(
+        model=model_name,
+        src=uploaded.name,
+        config={"display_name": "nlq-batch"},
     )
+    logger.info("[LLM-Batch] Submitted %s (%d queries)", job.name, len(queries))
 
-    return ir
+    while job.state.name not in _BATCH_DONE_STATES:
+        if time.time() - start > timeout:
+            logger.warning(
+                "[LLM-Batch] %s still %s after %ds — giving up",
+                job.name, job.state.name, int(timeout),
+            )
+            return results
+        time.sleep(poll_interval)
+        job = client.batches.get(name=job.name)
+
+    elapsed = time.time() - start
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        logger.error("[LLM-Batch] %s ended in %s", job.name, job.state.name)
+        return results
+    logger.info("[LLM-Batch] %s finished in %.0fs", job.name, elapsed)
+
+    index = _get_schema_index(allowed_fields, field_types)
+    content = client.files.download(file=job.dest.file_name).decode("utf-8")
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        key = item.get("key", "")
+        if not key.startswith("q_"):
+            continue
+        try:
+            raw_text = item["response"]["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError):
+            logger.warning("[LLM-Batch] No response for %s: %s", key, item.get("error"))
+            continue
+        results[int(key[2:])] = _ir_from_llm_text(raw_text, index, model_name, elapsed)
+
+    return results
@@ -1,8 +1,28 @@
 from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from difflib import SequenceMatcher
 from datetime import datetime, timedelta
+from functools import lru_cache
+import ast
+import json
+import os
 import re
 
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz.process import extractOne as _rf_extract_one
+except ImportError:          # optional C++ backend — fall back to difflib
+    _rf_fuzz = None
+    _rf_extract_one = None
+
+try:
+    from rapidfuzz.process import cdist as _rf_cdist   # returns a NumPy matrix
+    import numpy  # noqa: F401
+except ImportError:
+    _rf_cdist = None
+
 
 AGGREGATION_KEYWORDS = {
     # Count
@@ -26,25 +46,33 @@ AGGREGATION_KEYWORDS = {
     "lowest": "min",
 }
 
-COMPARISON_GT = {"older", "greater", "more", "above", "over", "higher", "bigger"}
-COMPARISON_LT = {"younger", "less", "fewer", "below", "under", "lower", "smaller"}
-SHOW_KEYWORDS = {"show", "list", "find", "get", "display", "fetch", "all", "select",
-                 "what", "which", "give", "tell", "return", "retrieve", "pull",
-                 "please", "can", "could", "want", "need", "see",
-                 "who", "when", "where", "how"}
-PROJECTION_KEYWORDS = {"show", "display", "select", "return", "get", "only",
-                       "what", "which", "give", "tell", "retrieve",
-                       "find", "list"}
+COMPARISON_GT = frozenset({"older", "greater", "more", "above", "over", "higher", "bigger"})
+COMPARISON_LT = frozenset({"younger", "less", "fewer", "below", "under", "lower", "smaller"})
+SHOW_KEYWORDS = frozenset({"show", "list", "find", "get", "display", "fetch", "all", "select",
+                           "what", "which", "give", "tell", "return", "retrieve", "pull",
+                           "please", "can", "could", "want", "need", "see",
+                           "who", "when", "where", "how"})
+PROJECTION_KEYWORDS = frozenset({"show", "display", "select", "return", "get", "only",
+                                 "what", "which", "give", "tell", "retrieve",
+                                 "find", "list"})
 
 # Words that introduce a condition clause — equivalent to "where"
-_CONDITION_TRIGGERS = {
+_CONDITION_TRIGGERS = frozenset({
     "where", "with", "having", "whose", "when", "if",
     "that", "which",
-}
+})
+
+# Scan order for trigger-based condition parsing: "where" first, then the
+# other triggers, then "for" / "of" as lightweight triggers
+_SCAN_TRIGGERS = (
+    ("where",)
+    + tuple(t for t in _CONDITION_TRIGGERS if t != "where")
+    + ("for", "of")
+)
 
 # Words that are structural in question/projection context and should be
 # skipped over when scanning for projected field names.
-_PROJECTION_FILLER = {
+_PROJECTION_FILLER = frozenset({
     "me", "the", "a", "an", "my", "all", "its",
     "entire", "complete", "full", "whole",
     "row", "rows", "record", "records", "document", "documents",
@@ -60,10 +88,10 @@ _PROJECTION_FILLER = {
     "information", "info", "details", "detail",
     "everything", "anything", "something",
     "contact", "current", "new", "old", "open", "closed",
-}
+})
 
 # Noise words that should never match against field names
-_NOISE = {
+_NOISE = frozenset({
     "show", "list", "find", "get", "display", "fetch", "all", "select",
     "records", "documents", "docs", "entries", "rows", "results",
     "where", "and", "or", "the", "a", "an", "of", "for", "with",
@@ -92,50 +120,136 @@ _NOISE = {
     "made", "did", "got", "went", "came",
     "money", "figures", "details", "information", "info",
     "everything", "anything", "something",
-}
+})
 
 # Clause-break words that stop condition scanning
-_CLAUSE_BREAKS = {
+_CLAUSE_BREAKS = frozenset({
     "sorted", "sort", "ordered", "limit", "top", "first",
     "ascending", "descending", "asc", "desc",
-}
+})
+
+_CONJUNCTIONS = frozenset({"and", ",", "&"})
+
+# Noise and clause-break words merged so hot loops probe a single set
+_STOP_TOKENS = _NOISE | _CLAUSE_BREAKS
+
+# Words that may end a captured multi-word value
+_VALUE_STOP_WORDS = _CLAUSE_BREAKS | _CONDITION_TRIGGERS | _CONJUNCTIONS
+# Words after a field that rule out an implicit "field value" equality
+_IMPLICIT_EQ_STOP = _STOP_TOKENS | _VALUE_STOP_WORDS
 
 # Operator keywords grouped by operator type
-_OP_EQ = {"is", "=", "equals", "equal", "==", "being"}
-_OP_NEQ = {"not", "isnt", "isn't", "!=", "ne", "except", "excluding"}
-_OP_CONTAINS = {
+_OP_EQ = frozenset({"is", "=", "equals", "equal", "==", "being"})
+_OP_NEQ = frozenset({"not", "isnt", "isn't", "!=", "ne", "except", "excluding"})
+_OP_CONTAINS = frozenset({
     "contains", "containing", "includes", "including",
     "like", "matches", "matching",
-}
-_OP_GT = {"greater", "more", "above", "over", "higher", ">", "after", "bigger"}
-_OP_GTE = {">=", "gte", "atleast", "minimum"}
-_OP_LT = {"less", "fewer", "below", "under", "lower", "<", "before", "smaller"}
-_OP_LTE = {"<=", "lte", "atmost", "maximum"}
+})
+_OP_GT = frozenset({"greater", "more", "above", "over", "higher", ">", "after", "bigger"})
+_OP_GTE = frozenset({">=", "gte", "atleast", "minimum"})
+_OP_LT = frozenset({"less", "fewer", "below", "under", "lower", "<", "before", "smaller"})
+_OP_LTE = frozenset({"<=", "lte", "atmost", "maximum"})
+_THAN_TO = frozenset({"than", "to"})             # "greater than", "up to"
+_OR_EQUAL = frozenset({"or", "equal", "equals"})  # "... or equal to"
+_EQUAL_TO = frozenset({"equal", "to", "equals"})
+_OP_COMPARE = _OP_GT | _OP_GTE | _OP_LT | _OP_LTE
+# Words that can't continue a dot-joined field candidate ("award tech is")
+_DOT_JOIN_BREAKS = _OP_EQ | _CONJUNCTIONS | _OP_GT | _OP_LT | {"than"}
+
+# --- Small keyword groups for the scanning passes ---
+_SCAN_SKIP = _CONJUNCTIONS | {"the", "a", "an", "has", "have", "had"}
+_ARRAY_FIELD_SKIP = frozenset({"as", "is", "=", "equals", "equal", "being", ":"})
+_OVER_WORDS = frozenset({"over", "above"})
+_UNDER_WORDS = frozenset({"under", "below"})
+_SORT_WORDS = frozenset({"sorted", "sort", "order", "ordered"})
+_DESC_WORDS = frozenset({"descending", "desc", "down"})
+_TOP_WORDS = frozenset({"top", "first"})
+_LIMIT_WORDS = _TOP_WORDS | {"limit"}
+_COMPARISON_WORDS = COMPARISON_GT | COMPARISON_LT | _OVER_WORDS | _UNDER_WORDS
+_CMP_NEGATIONS = frozenset({"not", "no"})
+# "at least" / "at most" + a number is a bound, not a superlative
+_AT_BOUND_WORDS = frozenset({"least", "most"})
+_RESULT_NOUNS = frozenset({"results", "records", "documents", "docs", "rows"})
+
+_NO_OPS: frozenset = frozenset()  # operators of a field with no conditions yet
+
+# --- Word classes as bit flags ---
+# Each query word is tagged once per parse, so the scanning loops test one
+# int instead of probing several keyword sets for the same word.
+_T_NOISE = 1
+_T_BREAK = 2        # _CLAUSE_BREAKS
+_T_TRIGGER = 4      # _CONDITION_TRIGGERS
+_T_CONJ = 8         # _CONJUNCTIONS
+_T_SCAN_SKIP = 16
+_T_DOT_JOIN_BREAK = 32
+_T_VALUE_STOP = _T_BREAK | _T_TRIGGER | _T_CONJ
+
+
+def _build_word_tags() -> Dict[str, int]:
+    tags: Dict[str, int] = {}
+    for words, bit in (
+        (_NOISE, _T_NOISE),
+        (_CLAUSE_BREAKS, _T_BREAK),
+        (_CONDITION_TRIGGERS, _T_TRIGGER),
+        (_CONJUNCTIONS, _T_CONJ),
+        (_SCAN_SKIP, _T_SCAN_SKIP),
+        (_DOT_JOIN_BREAKS, _T_DOT_JOIN_BREAK),
+    ):
+        for w in words:
+            tags[w] = tags.get(w, 0) | bit
+    return tags
+
+
+_WORD_TAGS = _build_word_tags()
 
 # --- Temporal expressions ---
-_TEMPORAL_SINGLE = {"today", "yesterday", "tomorrow", "now"}
-_TEMPORAL_MODIFIERS = {"last", "this", "next", "past", "previous", "current"}
-_TEMPORAL_UNITS = {
+_TEMPORAL_SINGLE = frozenset({"today", "yesterday", "tomorrow", "now"})
+_TEMPORAL_MODIFIERS = frozenset({"last", "this", "next", "past", "previous", "current"})
+_TEMPORAL_UNITS = frozenset({
     "day", "days", "week", "weeks", "month", "months",
     "quarter", "quarters", "year", "years",
     "hour", "hours", "minute", "minutes",
-}
+})
 _TEMPORAL_ALL = _TEMPORAL_SINGLE | _TEMPORAL_MODIFIERS | _TEMPORAL_UNITS
+# words that can start a temporal expression
+_TEMPORAL_STARTS = _TEMPORAL_SINGLE | _TEMPORAL_MODIFIERS
+_TEMPORAL_PAST = frozenset({"last", "past", "previous"})
+_TEMPORAL_CURRENT = frozenset({"this", "current"})
+_DAY_OFFSETS = {"today": 0, "yesterday": -1, "tomorrow": 1}
 
 # --- Currency / number helpers ---
 _CURRENCY_RE = re.compile(r'^[\$\u20ac\u00a3\u00a5\u20b9#]+')
+# Common shapes in one match: currency/# prefix, digits with commas,
+# optional fraction, optional k/M/B suffix
+_NUMBER_RE = re.compile(
+    r'[\$\u20ac\u00a3\u00a5\u20b9#]*([\d,]*\d[\d,]*)(\.\d+)?([kKmMbB]?)'
+)
+_NUMBER_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
 
 # --- Superlative keywords \u2192 sort direction ---
-_SUPERLATIVE_DESC = {
+_SUPERLATIVE_DESC = frozenset({
     "best", "top", "highest", "most", "biggest", "largest",
     "greatest", "fastest", "newest", "latest", "busiest",
     "maximum", "richest",
-}
-_SUPERLATIVE_ASC = {
+})
+_SUPERLATIVE_ASC = frozenset({
     "worst", "bottom", "lowest", "least", "smallest",
     "fewest", "slowest", "oldest", "earliest", "cheapest",
     "poorest", "minimum",
-}
+})
+
+# --- Field-name hints for sums, date ranges and "in <place>" values ---
+# Substrings marking a money-like numeric field
+_REVENUE_HINTS_RE = re.compile(
+    "revenue|sales|amount|price|total|cost|money|income|salary|payment"
+    "|profit|spend|earning|fee"
+)
+# Substrings marking a date/time field
+_DATE_HINTS_RE = re.compile(
+    "date|time|created|updated|timestamp|hired|joined|started|ended|at|ordered"
+)
+# Leaf names of location fields, in order of preference
+_LOCATION_HINTS = ("city", "location", "state", "country", "region", "address", "town")
 
 # --- Question word \u2192 field-name hints for auto-projection ---
 _QUESTION_FIELD_HINTS = {
@@ -148,12 +262,12 @@ _QUESTION_FIELD_HINTS = {
 }
 
 # --- Category / context nouns for \"in the X \u2026\" patterns ---
-_IN_CONTEXT_NOUNS = {
+_IN_CONTEXT_NOUNS = frozenset({
     "department", "category", "office", "branch", "region",
     "division", "team", "group", "section", "unit",
     "store", "warehouse", "location", "city", "state",
     "country", "area", "zone", "district", "class",
-}
+})
 
 # --- Contraction \u2192 expanded negation ---
 _CONTRACTIONS_NEG = {
@@ -171,19 +285,50 @@ _CONTRACTIONS_NEG = {
 # ---------------------- PREPROCESSING ----------------------
 
 # Polite / conversational prefixes to strip
-_POLITE_PREFIXES = [
-    r"^(?:please\s+)?(?:can|could|would|will)\s+you\s+(?:please\s+)?",
-    r"^(?:please\s+)",
-    r"^(?:let\s+me\s+(?:see|know|have)\s+)",
-    r"^(?:i\s+(?:am|was)\s+(?:looking\s+for|interested\s+in)\s+)",
-    r"^(?:do|does)\s+(?:the\s+)?(?:collection|database|table|data)\s+(?:have|contain)\s+",
-]
-
-
-def _preprocess_query(raw: str) -> str:
+_POLITE_PREFIXES = (
+    r"(?:please\s+)?(?:can|could|would|will)\s+you\s+(?:please\s+)?",
+    r"(?:please\s+)",
+    r"(?:let\s+me\s+(?:see|know|have)\s+)",
+    r"(?:i\s+(?:am|was)\s+(?:looking\s+for|interested\s+in)\s+)",
+    r"(?:do|does)\s+(?:the\s+)?(?:collection|database|table|data)\s+(?:have|contain)\s+",
+)
+# One anchored pass strips any run of them ("please let me see ...")
+_POLITE_RE = re.compile(
+    "^(?:" + "|".join(_POLITE_PREFIXES) + ")+", re.IGNORECASE,
+)
+
+# Common filler phrases, removed in a single pass
+_FILLER_RE = re.compile(
+    "|".join((
+        r"\ba\s+list\s+of\b",
+        r"\bthe\s+details?\s+of\b",
+        r"\bthe\s+specific\b",
+        r"\bthe\s+exact\b",
+        r"\bright\s+now\b",
+        r"\bat\s+the\s+moment\b",
+        r"\bat\s+this\s+point\b",
+    )),
+    re.IGNORECASE,
+)
+
+_POSSESSIVE_RE = re.compile(
+    r"\b(our|my|their|your|his|her|its|the\s+company'?s?)\b", re.IGNORECASE,
+)
+_WS_RE = re.compile(r"\s+")
+# JSON-style array literals in the query, e.g. ["Pearl White","Crane Wilbur"]
+_ARRAY_RE = re.compile(r'\[\s*["\'][^\]]*["\']\s*\]')
+_CONTRACTION_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, _CONTRACTIONS_NEG)) + r")\b",
+    re.IGNORECASE,
+)
+
+
+def _preprocess_query(raw: str) -> Tuple[str, List[str]]:
     """Strip polite/conversational prefixes, expand contractions, and
     remove filler phrases so the core query is exposed.
 
+    Returns the cleaned text and its lower-cased words.
+
     Examples:
         'can you please show me records where order is 1'
             \u2192 'show me records where order is 1'
@@ -193,40 +338,21 @@ def _preprocess_query(raw: str) -> str:
     """
     text = raw.strip()
     # Expand contractions (haven't \u2192 have not, etc.)
-    lowered = text.lower()
-    for contraction, expansion in _CONTRACTIONS_NEG.items():
-        if contraction in lowered:
-            idx = lowered.index(contraction)
-            text = text[:idx] + expansion + text[idx + len(contraction):]
-            lowered = text.lower()
-    # Strip possessive pronouns (our, my, their, etc.)
-    text = re.sub(
-        r"\b(our|my|their|your|his|her|its|the\s+company'?s?)\b",
-        "", text, flags=re.IGNORECASE,
+    text = _CONTRACTION_RE.sub(
+        lambda m: _CONTRACTIONS_NEG[m.group(0).lower()], text,
     )
-    text = re.sub(r"\s+", " ", text).strip()
-    lowered = text.lower()
-    for pat in _POLITE_PREFIXES:
-        m = re.match(pat, lowered)
-        if m:
-            text = text[m.end():].strip()
-            lowered = text.lower()
+    # Strip possessive pronouns (our, my, their, etc.)
+    text = _POSSESSIVE_RE.sub("", text)
+    text = _WS_RE.sub(" ", text).strip()
+    m = _POLITE_RE.match(text)
+    if m:
+        text = text[m.end():].strip()
     # Strip common filler phrases
-    _filler_phrases = [
-        r"\ba\s+list\s+of\b",
-        r"\bthe\s+details?\s+of\b",
-        r"\bthe\s+specific\b",
-        r"\bthe\s+exact\b",
-        r"\bright\s+now\b",
-        r"\bat\s+the\s+moment\b",
-        r"\bat\s+this\s+point\b",
-    ]
-    for fp in _filler_phrases:
-        text = re.sub(fp, "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _FILLER_RE.sub("", text)
+    text = _WS_RE.sub(" ", text).strip()
     # Strip trailing sentence punctuation
     text = text.rstrip("?!.;:")
-    return text
+    return text, text.lower().split()
 
 
 def _normalize_number(raw: str):
@@ -237,13 +363,21 @@ def _normalize_number(raw: str):
                '10k' \u2192 10000,  '1.5M' \u2192 1500000
     """
     s = raw.strip()
+    m = _NUMBER_RE.fullmatch(s)
+    if m:
+        digits, frac, suffix = m.groups()
+        digits = digits.replace(",", "")
+        if suffix:
+            return int(float(digits + (frac or "")) * _NUMBER_SUFFIXES[suffix.lower()])
+        return float(digits + frac) if frac else int(digits)
+
+    # Rarer forms (signs, exponents, "5.", ".5") take the slow path
     s = _CURRENCY_RE.sub("", s)
     s = s.replace(",", "")
     if not s:
         return raw
-    _suffixes = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
-    if s and s[-1].lower() in _suffixes:
-        mult = _suffixes[s[-1].lower()]
+    if s[-1].lower() in _NUMBER_SUFFIXES:
+        mult = _NUMBER_SUFFIXES[s[-1].lower()]
         s = s[:-1]
         try:
             return int(float(s) * mult)
@@ -258,27 +392,67 @@ def _normalize_number(raw: str):
             return raw
 
 
-def _build_temporal_range(words: List[str], start: int):
+@dataclass(frozen=True)
+class _TimeAnchors:
+    """Calendar boundaries around one instant, shared by every temporal
+    expression in a query so they all agree on what "now" is."""
+    now: datetime
+    today_start: datetime
+    week_start: datetime     # Monday 00:00 of the current week
+    month_start: datetime
+    quarter_start: datetime
+    year_start: datetime
+
+
+def _time_anchors(now: Optional[datetime] = None) -> _TimeAnchors:
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _TimeAnchors(
+        now=now,
+        today_start=today,
+        week_start=today - timedelta(days=now.weekday()),
+        month_start=today.replace(day=1),
+        quarter_start=datetime(now.year, (now.month - 1) // 3 * 3 + 1, 1),
+        year_start=datetime(now.year, 1, 1),
+    )
+
+
+@lru_cache(maxsize=32)
+def _day_range(day: int) -> Tuple[str, str]:
+    """ISO bounds of the calendar day with proleptic ordinal *day*.
+
+    Cached: "today" / "yesterday" / "tomorrow" resolve to the same few
+    days for every query parsed on a given date.
+    """
+    start = datetime.fromordinal(day)
+    return start.isoformat(), (start + timedelta(days=1)).isoformat()
+
+
+def _iso_range(start: datetime, end: datetime) -> Dict[str, str]:
+    return {"gte": start.isoformat(), "lte": end.isoformat()}
+
+
+def _build_temporal_range(
+    words: List[str],
+    start: int,
+    anchors: Optional[_TimeAnchors] = None,
+):
     """Detect a temporal expression starting at *start*.
 
     Returns ``(date_range_dict, words_consumed)`` or ``(None, 0)``.
     *date_range_dict* has keys ``gte`` and/or ``lte`` with ISO date strings.
+    Pass *anchors* to evaluate several expressions against the same instant.
     """
     if start >= len(words):
         return None, 0
-    now = datetime.now()
+    a = anchors or _time_anchors()
+    now = a.now
     w = words[start]
 
     # --- Single-word temporals ---
-    if w == "today":
-        d = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        return {"gte": d.isoformat(), "lte": (d + timedelta(days=1)).isoformat()}, 1
-    if w == "yesterday":
-        d = (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        return {"gte": d.isoformat(), "lte": (d + timedelta(days=1)).isoformat()}, 1
-    if w == "tomorrow":
-        d = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        return {"gte": d.isoformat(), "lte": (d + timedelta(days=1)).isoformat()}, 1
+    if w in _DAY_OFFSETS:
+        gte, lte = _day_range(a.today_start.toordinal() + _DAY_OFFSETS[w])
+        return {"gte": gte, "lte": lte}, 1
 
     # --- "last/this/next N <unit>" e.g. "last 6 months", "last 24 hours" ---
     if w in _TEMPORAL_MODIFIERS and start + 2 < len(words):
@@ -299,13 +473,13 @@ def _build_temporal_range(words: List[str], start: int):
             elif unit == "minute":
                 delta = timedelta(minutes=n)
             if delta:
-                if w in ("last", "past", "previous"):
+                if w in _TEMPORAL_PAST:
                     s_dt, e_dt = now - delta, now
                 elif w == "next":
                     s_dt, e_dt = now, now + delta
                 else:
                     s_dt, e_dt = now - delta, now
-                return {"gte": s_dt.isoformat(), "lte": e_dt.isoformat()}, 3
+                return _iso_range(s_dt, e_dt), 3
         except ValueError:
             pass
 
@@ -313,23 +487,19 @@ def _build_temporal_range(words: List[str], start: int):
     if w in _TEMPORAL_MODIFIERS and start + 1 < len(words):
         unit = words[start + 1].rstrip("s")
         if unit == "week":
-            if w in ("last", "past", "previous"):
-                s = (now - timedelta(weeks=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-                return {"gte": s.isoformat(), "lte": now.isoformat()}, 2
-            elif w in ("this", "current"):
-                s = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
-                return {"gte": s.isoformat(), "lte": now.isoformat()}, 2
+            if w in _TEMPORAL_PAST:
+                s = a.today_start - timedelta(weeks=1)
+                return _iso_range(s, now), 2
+            elif w in _TEMPORAL_CURRENT:
+                return _iso_range(a.week_start, now), 2
             elif w == "next":
-                return {"gte": now.isoformat(), "lte": (now + timedelta(weeks=1)).isoformat()}, 2
+                return _iso_range(now, now + timedelta(weeks=1)), 2
         if unit == "month":
-            if w in ("last", "past", "previous"):
-                first_this = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                last_end = first_this - timedelta(days=1)
-                s = last_end.replace(day=1)
-                return {"gte": s.isoformat(), "lte": first_this.isoformat()}, 2
-            elif w in ("this", "current"):
-                s = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                return {"gte": s.isoformat(), "lte": now.isoformat()}, 2
+            if w in _TEMPORAL_PAST:
+                s = (a.month_start - timedelta(days=1)).replace(day=1)
+                return _iso_range(s, a.month_start), 2
+            elif w in _TEMPORAL_CURRENT:
+                return _iso_range(a.month_start, now), 2
             elif w == "next":
                 nm = now.month % 12 + 1
                 ny = now.year + (1 if now.month == 12 else 0)
@@ -337,48 +507,240 @@ def _build_temporal_range(words: List[str], start: int):
                 nm2 = nm % 12 + 1
                 ny2 = ny + (1 if nm == 12 else 0)
                 e = datetime(ny2, nm2, 1)
-                return {"gte": s.isoformat(), "lte": e.isoformat()}, 2
+                return _iso_range(s, e), 2
         if unit == "quarter":
-            if w in ("last", "past", "previous"):
+            if w in _TEMPORAL_PAST:
                 s = now - timedelta(days=90)
-                return {"gte": s.isoformat(), "lte": now.isoformat()}, 2
-            elif w in ("this", "current"):
-                cq = (now.month - 1) // 3
-                s = datetime(now.year, cq * 3 + 1, 1)
-                return {"gte": s.isoformat(), "lte": now.isoformat()}, 2
+                return _iso_range(s, now), 2
+            elif w in _TEMPORAL_CURRENT:
+                return _iso_range(a.quarter_start, now), 2
         if unit == "year":
-            if w in ("last", "past", "previous"):
-                return {"gte": datetime(now.year - 1, 1, 1).isoformat(),
-                        "lte": datetime(now.year, 1, 1).isoformat()}, 2
-            elif w in ("this", "current"):
-                return {"gte": datetime(now.year, 1, 1).isoformat(),
-                        "lte": now.isoformat()}, 2
+            if w in _TEMPORAL_PAST:
+                return _iso_range(datetime(now.year - 1, 1, 1), datetime(now.year, 1, 1)), 2
+            elif w in _TEMPORAL_CURRENT:
+                return _iso_range(a.year_start, now), 2
             elif w == "next":
-                return {"gte": datetime(now.year + 1, 1, 1).isoformat(),
-                        "lte": datetime(now.year + 2, 1, 1).isoformat()}, 2
+                return _iso_range(datetime(now.year + 1, 1, 1), datetime(now.year + 2, 1, 1)), 2
 
     return None, 0
 
 
 # ---------------------- FUZZY / PLURAL FIELD MATCHING ----------------------
 
+@lru_cache(maxsize=4096)
 def _normalize_singular(word: str) -> str:
-    """Naive singular form: strips trailing 's' / 'es'."""
+    """Naive singular form: strips trailing 's' / 'es'.
+
+    Memoised — query words and field segments repeat constantly.
+    """
     w = word.lower()
     if w.endswith("ies") and len(w) > 3:
         return w[:-3] + "y"
-    if w.endswith("ses") or w.endswith("xes") or w.endswith("zes"):
+    if w.endswith(("ses", "xes", "zes")):
         return w[:-2]
     if w.endswith("s") and not w.endswith("ss") and len(w) > 2:
         return w[:-1]
     return w
 
 
+# Name tokens of a field path: split on ".", "_" and camelCase humps
+_NAME_TOKEN_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+def _name_tokens(field: str) -> Tuple[str, ...]:
+    """``customer_email`` / ``customerEmail`` → ``("customer", "email")``."""
+    return tuple(t.lower() for t in _NAME_TOKEN_RE.findall(field))
+
+
 def _similarity(a: str, b: str) -> float:
+    """Case-insensitive similarity in ``[0, 1]`` (rapidfuzz or difflib)."""
+    if _rf_fuzz is not None:
+        return _rf_fuzz.ratio(a.lower(), b.lower()) / 100.0
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
-def _find_field_match(word: str, fields: List[str]) -> Optional[str]:
+@dataclass(frozen=True)
+class FieldIndex:
+    """Lower-cased / singularised lookups over one field list.
+
+    Built once per distinct list by ``_field_index``; every dict maps to
+    the *first* field (in list order) with that key, matching the order
+    the linear scans used to return.
+    """
+    fields: Tuple[str, ...]
+    # per field: field.lower()
+    lowered: Tuple[str, ...]
+    # field.lower() → field
+    by_lower: Dict[str, str]
+    # leaf segment (lower) of dotted fields → field
+    by_leaf: Dict[str, str]
+    # singular-normalised segments of dotted fields → field
+    by_singular_segments: Dict[Tuple[str, ...], str]
+    # singular form of flat field / dotted leaf → field
+    by_singular: Dict[str, str]
+    # trie over the by_singular_segments keys: segment → child node, with
+    # the field stored under _TRIE_FIELD where a path ends
+    segment_trie: Dict[Any, Any]
+    # per field: leaf (dotted) or whole name, lower-cased — fuzzy targets
+    fuzzy_targets: Tuple[str, ...]
+    # leaf (dotted) or whole name, lower-cased → field
+    by_last_segment: Dict[str, str]
+    # sorted singular name tokens of snake/camel-case fields → field
+    by_token_set: Dict[Tuple[str, ...], str]
+    # token counts of by_token_set keys, longest first
+    token_counts: Tuple[int, ...]
+    # _QUESTION_FIELD_HINTS hint → fields whose lower-cased name contains it
+    by_question_hint: Dict[str, Tuple[str, ...]]
+    # first field whose lower-cased name matches _DATE_HINTS_RE
+    date_field: Optional[str]
+    # first field whose lower-cased name matches _REVENUE_HINTS_RE
+    money_field: Optional[str]
+    # by_last_segment entry for the most preferred _LOCATION_HINTS leaf
+    location_field: Optional[str]
+    # memoised step-5 results: lower-cased word → field (or None)
+    fuzzy_hits: Dict[str, Optional[str]]
+    # memoised ``_find_field_match`` results: word → field (or None)
+    matches: Dict[str, Optional[str]]
+
+
+_TRIE_FIELD = None  # trie key marking "a field path ends here"
+
+
+def _build_segment_trie(paths: Dict[Tuple[str, ...], str]) -> Dict[Any, Any]:
+    trie: Dict[Any, Any] = {}
+    for segments, field in paths.items():
+        node = trie
+        for seg in segments:
+            node = node.setdefault(seg, {})
+        node[_TRIE_FIELD] = field
+    return trie
+
+
+# Operator a preceding "not" / "no" turns a comparison into
+_NEGATED_CMP = {"gt": "lte", "gte": "lt", "lt": "gte", "lte": "gt"}
+
+
+def _op_phrases() -> Dict[Tuple[str, ...], str]:
+    """Comparison phrases → operator: "over", "greater than",
+    "less than or equal to", "at least", "no more than", ...
+
+    "not <phrase>" isn't listed: ``_extract_condition`` consumes the "not"
+    itself and inverts whatever phrase follows via ``_NEGATED_CMP``.
+    """
+    phrases: Dict[Tuple[str, ...], str] = {("at", "least"): "gte", ("at", "most"): "lte"}
+    for words, op in ((_OP_GTE, "gte"), (_OP_LTE, "lte")):
+        for w in words:
+            phrases[(w,)] = op
+    for words, op, or_equal_op in ((_OP_GT, "gt", "gte"), (_OP_LT, "lt", "lte")):
+        for w in words:
+            for head in ((w,),) + tuple((w, t) for t in _THAN_TO):
+                phrases[head] = op
+                for o in _OR_EQUAL:
+                    for e in _EQUAL_TO:
+                        phrases[head + (o, e)] = or_equal_op
+                        phrases[head + (o, e, "to")] = or_equal_op
+            # "no more than X" = at most X, "no fewer than X" = at least X
+            for t in _THAN_TO:
+                phrases[("no", w, t)] = _NEGATED_CMP[op]
+    return phrases
+
+
+# Token trie over _op_phrases(), operator stored under _TRIE_FIELD
+_OP_PHRASE_TRIE = _build_segment_trie(_op_phrases())
+
+
+def _match_op_phrase(words: List[str], start: int) -> Tuple[Optional[str], int]:
+    """Longest comparison phrase at ``words[start]``, provided a value word
+    follows it.  Returns ``(operator, words_in_phrase)`` or ``(None, 0)``."""
+    node = _OP_PHRASE_TRIE
+    match: Tuple[Optional[str], int] = (None, 0)
+    for i in range(start, len(words)):
+        node = node.get(words[i])
+        if node is None:
+            break
+        if _TRIE_FIELD in node:
+            match = (node[_TRIE_FIELD], i + 1 - start)
+    if start + match[1] >= len(words):
+        return None, 0
+    return match
+
+
+@lru_cache(maxsize=64)
+def _field_index(fields: Tuple[str, ...]) -> FieldIndex:
+    by_lower: Dict[str, str] = {}
+    by_leaf: Dict[str, str] = {}
+    by_singular_segments: Dict[Tuple[str, ...], str] = {}
+    by_singular: Dict[str, str] = {}
+    fuzzy_targets: List[str] = []
+    by_last_segment: Dict[str, str] = {}
+    by_token_set: Dict[Tuple[str, ...], str] = {}
+    lowered = tuple(f.lower() for f in fields)
+    for field, fl in zip(fields, lowered):
+        by_lower.setdefault(fl, field)
+        if "." in field:
+            segments = fl.split(".")
+            leaf = segments[-1]
+            by_leaf.setdefault(leaf, field)
+            by_singular_segments.setdefault(
+                tuple(_normalize_singular(seg) for seg in segments), field,
+            )
+            by_singular.setdefault(_normalize_singular(leaf), field)
+            fuzzy_targets.append(leaf)
+        else:
+            by_singular.setdefault(_normalize_singular(fl), field)
+            fuzzy_targets.append(fl)
+        by_last_segment.setdefault(fuzzy_targets[-1], field)
+        tokens = _name_tokens(field)
+        # plain dotted paths are already covered by by_singular_segments
+        if len(tokens) > 1 and tokens != tuple(fl.split(".")):
+            by_token_set.setdefault(
+                tuple(sorted(_normalize_singular(t) for t in tokens)), field,
+            )
+    return FieldIndex(
+        fields=fields,
+        lowered=lowered,
+        by_lower=by_lower,
+        by_leaf=by_leaf,
+        by_singular_segments=by_singular_segments,
+        by_singular=by_singular,
+        segment_trie=_build_segment_trie(by_singular_segments),
+        fuzzy_targets=tuple(fuzzy_targets),
+        by_last_segment=by_last_segment,
+        by_token_set=by_token_set,
+        token_counts=tuple(sorted({len(k) for k in by_token_set}, reverse=True)),
+        by_question_hint=_question_hint_fields(fields),
+        date_field=next((f for f, fl in zip(fields, lowered) if _DATE_HINTS_RE.search(fl)), None),
+        money_field=next((f for f, fl in zip(fields, lowered) if _REVENUE_HINTS_RE.search(fl)), None),
+        location_field=next(
+            (by_last_segment[h] for h in _LOCATION_HINTS if h in by_last_segment), None,
+        ),
+        fuzzy_hits={},
+        matches={},
+    )
+
+
+def _question_hint_fields(fields: Tuple[str, ...]) -> Dict[str, Tuple[str, ...]]:
+    hinted: Dict[str, Tuple[str, ...]] = {}
+    for hints in _QUESTION_FIELD_HINTS.values():
+        for hint in hints:
+            if hint not in hinted:
+                hinted[hint] = tuple(f for f in fields if hint in f.lower())
+    return hinted
+
+
+def _as_field_index(fields: "FieldIndex | List[str]") -> FieldIndex:
+    return fields if isinstance(fields, FieldIndex) else _field_index(tuple(fields))
+
+
+def _first_mentioned_field(index: FieldIndex, tokens) -> Optional[str]:
+    """First field whose name, or leaf segment if dotted, is in *tokens*."""
+    for field, fl, leaf in zip(index.fields, index.lowered, index.fuzzy_targets):
+        if fl in tokens or leaf in tokens:
+            return field
+    return None
+
+
+def _find_field_match(word: str, fields: "FieldIndex | List[str]") -> Optional[str]:
     """Match *word* against schema field names.
 
     Strategy (in priority order):
@@ -387,65 +749,73 @@ def _find_field_match(word: str, fields: List[str]) -> Optional[str]:
     3. Dot-notation input: user typed ``award.tech`` → match ``awards.tech``.
     4. Singular/plural normalization (``award`` ↔ ``awards``).
     5. Fuzzy similarity ≥ 0.80 as last resort.
+
+    Results are memoised per field list — a parse asks about the same
+    handful of words many times.
     """
+    index = _as_field_index(fields)
+    field = index.matches.get(word, _NOT_MEMOISED)
+    if field is not _NOT_MEMOISED:
+        return field
     wl = word.lower()
+    field = _exact_field_match(wl, index)
+    if field is None:
+        field = _fuzzy_field_match(wl, index)
+    _remember(index.matches, word, field)
+    return field
+
 
+def _exact_field_match(wl: str, index: FieldIndex) -> Optional[str]:
+    """Steps 1-4 of ``_find_field_match`` for an already lower-cased word."""
     # 1. exact match
-    for field in fields:
-        if field.lower() == wl:
-            return field
+    field = index.by_lower.get(wl)
+    if field is not None:
+        return field
 
     # 2. last-segment match for nested fields
-    for field in fields:
-        if "." in field:
-            last_segment = field.rsplit(".", 1)[-1]
-            if last_segment.lower() == wl:
-                return field
+    field = index.by_leaf.get(wl)
+    if field is not None:
+        return field
 
-    # 3. dot-notation input from user (e.g. "award.tech" → "awards.tech")
+    # 3. dot-notation input from user (e.g. "award.tech" → "awards.tech"),
+    #    each segment with singular/plural tolerance
     if "." in wl:
-        user_segments = wl.split(".")
-        for field in fields:
-            if "." not in field:
-                continue
-            field_segments = field.lower().split(".")
-            if len(user_segments) != len(field_segments):
-                continue
-            # check each segment with singular/plural tolerance
-            if all(
-                _normalize_singular(us) == _normalize_singular(fs)
-                for us, fs in zip(user_segments, field_segments)
-            ):
-                return field
+        field = index.by_singular_segments.get(
+            tuple(_normalize_singular(us) for us in wl.split("."))
+        )
+        if field is not None:
+            return field
 
     # 4. singular/plural normalization (only match against LAST segment
     #    to avoid parent-prefix false positives like "options" matching
     #    "options.type" — the user should say "type", not "options")
-    w_norm = _normalize_singular(wl)
-    for field in fields:
-        # For flat fields, compare directly
-        if "." not in field:
-            if _normalize_singular(field.lower()) == w_norm:
-                return field
-        else:
-            # For dot-notation, only match the leaf (last) segment
-            last_seg = field.rsplit(".", 1)[-1].lower()
-            if _normalize_singular(last_seg) == w_norm:
-                return field
-
-    # 5. fuzzy similarity (threshold 0.80)
-    #    For dot-notation fields, only compare against the LAST segment
-    #    to prevent parent prefixes like "options" from fuzzy-matching
-    #    against "options.id" (full path).
+    return index.by_singular.get(_normalize_singular(wl))
+
+
+_NOT_MEMOISED = object()
+
+
+def _fuzzy_field_match(wl: str, index: FieldIndex) -> Optional[str]:
+    """Step 5 of ``_find_field_match``: fuzzy similarity (threshold 0.80).
+
+    For dot-notation fields, only compare against the LAST segment to
+    prevent parent prefixes like "options" from fuzzy-matching against
+    "options.id" (full path).
+    """
+    field = index.fuzzy_hits.get(wl, _NOT_MEMOISED)
+    if field is not _NOT_MEMOISED:
+        return field
+    targets = index.fuzzy_targets
+    if _rf_extract_one is not None:
+        hit = _rf_extract_one(wl, targets, scorer=_rf_fuzz.ratio, score_cutoff=80)
+        field = index.fields[hit[2]] if hit else None
+        _remember(index.fuzzy_hits, wl, field)
+        return field
+
     best_score = 0.0
     best_field = None
-    for field in fields:
-        if "." in field:
-            # Only fuzzy-match against the leaf segment
-            leaf = field.rsplit(".", 1)[-1].lower()
-            score = _similarity(wl, leaf)
-        else:
-            score = _similarity(wl, field.lower())
+    for field, target in zip(index.fields, targets):
+        score = _similarity(wl, target)
         if score > best_score:
             best_score = score
             best_field = field
@@ -455,7 +825,40 @@ def _find_field_match(word: str, fields: List[str]) -> Optional[str]:
     return None
 
 
-def _find_multi_word_field(words: List[str], start_idx: int, fields: List[str]) -> Optional[str]:
+FIELD_MEMO_MAX = 4096  # per FieldIndex memo; it is reset once it fills up
+
+
+def _remember(memo: Dict[str, Optional[str]], key: str, field: Optional[str]) -> None:
+    if len(memo) >= FIELD_MEMO_MAX:
+        memo.clear()
+    memo[key] = field
+
+
+def _prime_fuzzy_matches(tokens, index: FieldIndex) -> None:
+    """Fuzzy-match a query's distinct *tokens* in one ``cdist`` call.
+
+    Candidates are tokens that are neither stop words nor already
+    memoised; results land in ``index.fuzzy_hits`` so a later step 5 is
+    a dict lookup.  Tokens that steps 1-4 resolve get memoised too, which
+    is harmless and keeps warm queries from re-checking them.  Without
+    RapidFuzz/NumPy, tokens are matched one at a time as they come up.
+    """
+    if _rf_cdist is None or not index.fuzzy_targets:
+        return
+    hits = index.fuzzy_hits
+    pending = [w for w in tokens if w not in _STOP_TOKENS and w not in hits]
+    if len(pending) < 2:
+        return
+    scores = _rf_cdist(pending, index.fuzzy_targets,
+                       scorer=_rf_fuzz.ratio, score_cutoff=80)
+    for w, row in zip(pending, scores):
+        best = int(row.argmax())  # first maximum, as extractOne picks
+        _remember(hits, w, index.fields[best] if row[best] >= 80 else None)
+
+
+def _find_multi_word_field(
+    words: List[str], start_idx: int, fields: "FieldIndex | List[str]",
+) -> Optional[str]:
     """Try to match dot-notation fields using consecutive words.
 
     Example: ``address city`` → ``address.city``
@@ -463,42 +866,52 @@ def _find_multi_word_field(words: List[str], start_idx: int, fields: List[str])
     Also handles singular/plural variations:
     ``award tech`` → ``awards.tech``
 
-    Prefers the longest (most specific) match.
+    Prefers the longest (most specific) match.  See
+    ``_match_multi_word_field`` for how many words the match spans.
     """
-    best_match: Optional[str] = None
-    best_length = 0
+    return _match_multi_word_field(words, start_idx, fields)[0]
 
-    for field in fields:
-        if "." not in field:
-            continue
-        segments = field.lower().split(".")
-        num_segments = len(segments)
-        if start_idx + num_segments > len(words):
-            continue
-        if num_segments <= best_length:
-            continue  # already have a longer/equal match
-        candidate = words[start_idx:start_idx + num_segments]
-
-        # Exact segment match
-        if candidate == segments:
-            best_match = field
-            best_length = num_segments
-            continue
 
-        # Singular/plural normalized match
-        if all(
-            _normalize_singular(c) == _normalize_singular(s)
-            for c, s in zip(candidate, segments)
-        ):
-            best_match = field
-            best_length = num_segments
+def _match_multi_word_field(
+    words: List[str], start_idx: int, fields: "FieldIndex | List[str]",
+) -> Tuple[Optional[str], int]:
+    """``_find_multi_word_field`` plus the number of words consumed.
+
+    Besides dot-notation paths, consecutive words match snake_case and
+    camelCase names by their token set, in any order:
+    ``customer email`` / ``email customer`` → ``customer_email``.
+    """
+    index = _as_field_index(fields)
+    match: Tuple[Optional[str], int] = (None, 0)
+    # Walk the segment trie one word at a time, keeping the deepest field;
+    # exact segments are a special case of the singular/plural match
+    node = index.segment_trie
+    for depth, w in enumerate(words[start_idx:], 1):
+        node = node.get(_normalize_singular(w))
+        if node is None:
+            break
+        if _TRIE_FIELD in node:
+            match = (node[_TRIE_FIELD], depth)
+
+    for num_tokens in index.token_counts:
+        if num_tokens <= match[1]:
+            break
+        if start_idx + num_tokens > len(words):
+            continue
+        candidate = tuple(sorted(
+            _normalize_singular(w) for w in words[start_idx:start_idx + num_tokens]
+        ))
+        field = index.by_token_set.get(candidate)
+        if field is not None:
+            return field, num_tokens
 
-    return best_match
+    return match
 
 
 def _detect_projection(
     words: List[str],
-    allowed_fields: List[str],
+    allowed_fields: "FieldIndex | List[str]",
+    token_pos: Optional[Dict[str, int]] = None,
 ) -> Optional[List[str]]:
     """Detect projection intent from the query.
 
@@ -513,18 +926,22 @@ def _detect_projection(
     Field names take priority over break words — e.g. if the collection
     has a field called ``order``, "show order" correctly projects it
     rather than breaking at the keyword.
+
+    *token_pos* is the first-position map of *words* when the caller has
+    already built one.
     """
     projection: List[str] = []
+    index = _as_field_index(allowed_fields)
+    if token_pos is None:
+        token_pos = _index_words(words)[1]
 
-    for trigger in PROJECTION_KEYWORDS:
-        if trigger not in words:
-            continue
-        idx = words.index(trigger)
+    for trigger in PROJECTION_KEYWORDS.intersection(token_pos):
+        idx = token_pos[trigger]
         i = idx + 1
         while i < len(words):
             w = words[i]
             # conjunction — skip
-            if w in ("and", ",", "&"):
+            if w in _CONJUNCTIONS:
                 i += 1
                 continue
             # question / filler words — skip
@@ -534,29 +951,81 @@ def _detect_projection(
             # Try matching against a field FIRST so that field names
             # that collide with clause keywords (e.g. "order") still
             # get projected.
-            match = _find_field_match(w, allowed_fields)
+            match = _find_field_match(w, index)
             if match:
                 if match not in projection:
                     projection.append(match)
                 i += 1
                 continue
             # Try multi-word dot-notation field
-            mw = _find_multi_word_field(words, i, allowed_fields)
+            mw, consumed = _match_multi_word_field(words, i, index)
             if mw:
                 if mw not in projection:
                     projection.append(mw)
-                i += len(mw.split("."))
+                i += consumed
                 continue
             # Word is neither filler nor a field — stop scanning
             break
 
     # Only return projection if we found fields that aren't the full set
-    if projection and len(projection) < len(allowed_fields):
+    if projection and len(projection) < len(index.fields):
         return projection
 
     return None
 
 
+def _parse_array_literal(raw: str) -> Optional[list]:
+    """Parse a ``["a", "b"]`` literal (single quotes allowed), else ``None``."""
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        try:
+            parsed = ast.literal_eval(raw)  # e.g. ['a', 'b']
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            return None
+    return parsed if isinstance(parsed, list) else None
+
+
+def _int_word(w: str) -> Optional[int]:
+    """``int(w)`` for a plain (optionally signed) integer word, else None.
+
+    Checked up front rather than via ``ValueError``, since most words
+    tested are not numbers.
+    """
+    digits = w[1:] if w[:1] in ("+", "-") else w
+    return int(w) if digits.isdecimal() else None
+
+
+def _index_words(words: List[str]) -> Tuple[set, Dict[str, int]]:
+    """Return ``(set of words, word → first position)`` for *words*."""
+    token_pos: Dict[str, int] = {}
+    for i, w in enumerate(words):
+        token_pos.setdefault(w, i)
+    return set(token_pos), token_pos
+
+
+# ---------------------- RESULT CACHE ----------------------
+
+PARSE_CACHE_SIZE = 2048
+
+# Queries mentioning any of these may resolve to a range relative to
+# "now", so their IR is only valid at the instant it was built.
+_TEMPORAL_WORD_RE = re.compile(
+    r"\b(?:" + "|".join(sorted(_TEMPORAL_STARTS)) + r")\b",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(user_input: str, fields_key: Tuple[str, ...], numeric_key: Tuple[str, ...]) -> str:
+    """JSON-encoded IR for one (query, schema) pair.
+
+    Stored as a string so every hit hands the caller a fresh dict that it
+    is free to mutate.
+    """
+    return json.dumps(_parse_to_ir(user_input, list(fields_key), list(numeric_key)))
+
+
 def parse_to_ir(
     user_input: str,
     allowed_fields: List[str] = None,
@@ -564,6 +1033,9 @@ def parse_to_ir(
 ) -> Optional[Dict[str, Any]]:
     """Parse a natural-language query into an intermediate representation.
 
+    Parsing is deterministic for a given query and schema, so results are
+    memoised; queries with time-relative wording bypass the cache.
+
     Parameters
     ----------
     user_input : str
@@ -573,40 +1045,60 @@ def parse_to_ir(
     numeric_fields : list[str] | None
         Subset of *allowed_fields* whose sample value is numeric.
     """
+    allowed_fields = list(allowed_fields or [])
+    numeric_fields = list(numeric_fields or [])
 
-    if allowed_fields is None:
-        allowed_fields = []
-    if numeric_fields is None:
-        numeric_fields = []
+    if _TEMPORAL_WORD_RE.search(user_input):
+        return _parse_to_ir(user_input, allowed_fields, numeric_fields)
+    return json.loads(_parse_cached(user_input, tuple(allowed_fields), tuple(numeric_fields)))
+
+
+def _parse_to_ir(
+    user_input: str,
+    allowed_fields: List[str],
+    numeric_fields: List[str],
+) -> Optional[Dict[str, Any]]:
+    """Uncached body of ``parse_to_ir``."""
 
     string_fields = [f for f in allowed_fields if f not in numeric_fields]
+    # Field lookups for the many per-token matches below
+    allowed_index = _field_index(tuple(allowed_fields))
+    string_index = _field_index(tuple(string_fields))
+    numeric_index = _field_index(tuple(numeric_fields))
 
     # Preprocess: strip polite / conversational prefixes
-    cleaned = _preprocess_query(user_input)
+    cleaned, words = _preprocess_query(user_input)
 
     # -------- EXTRACT ARRAY LITERALS --------
     # Detect JSON-style array literals like ["a","b","c"] BEFORE
     # lower-casing / splitting so we preserve the original values.
     _array_literals: Dict[str, list] = {}  # placeholder → parsed list
-    _array_re = re.compile(r'\[\s*["\'][^\]]*["\']\s*\]')
-    _arr_idx = 0
-    for _arr_m in _array_re.finditer(cleaned):
-        raw_arr = _arr_m.group()
-        try:
-            import json as _json
-            parsed = _json.loads(raw_arr)
-            if isinstance(parsed, list):
-                placeholder = f"__ARRAY_{_arr_idx}__"
-                _array_literals[placeholder] = parsed
-                cleaned = cleaned[:_arr_m.start()] + placeholder + cleaned[_arr_m.end():]
-                _arr_idx += 1
-        except Exception:
-            pass
 
-    user_lower = cleaned.lower()
-    words = user_lower.split()
+    def _stash_array(m: "re.Match") -> str:
+        parsed = _parse_array_literal(m.group())
+        if parsed is None:
+            return m.group()
+        placeholder = f"__ARRAY_{len(_array_literals)}__"
+        _array_literals[placeholder] = parsed
+        return placeholder
+
+    if "[" in cleaned:
+        cleaned = _ARRAY_RE.sub(_stash_array, cleaned)
+        if _array_literals:
+            words = cleaned.lower().split()
+
+    # Membership / first-position lookups, rebuilt whenever *words* changes
+    token_set, token_pos = _index_words(words)
+    _prime_fuzzy_matches(token_set, allowed_index)
 
     conditions: List[Dict[str, Any]] = []
+    # field → operators used so far, kept in step with *conditions* so the
+    # duplicate checks below are set probes instead of list scans
+    _cond_ops: Dict[str, set] = {}
+
+    def _add_condition(cond: Dict[str, Any]) -> None:
+        conditions.append(cond)
+        _cond_ops.setdefault(cond["field"], set()).add(cond["operator"])
     sort = None
     limit = None
     aggregation = None
@@ -615,21 +1107,13 @@ def parse_to_ir(
 
     # -------- DETECT AGGREGATION --------
 
-    if "how" in words and "many" in words:
+    if "how" in token_set and "many" in token_set:
         operation = "aggregate"
         aggregation = {"type": "count", "field": None}
-    elif "how" in words and "much" in words:
+    elif "how" in token_set and "much" in token_set:
         operation = "aggregate"
         # "how much" \u2192 sum aggregation on best numeric field
-        agg_field = None
-        _revenue_hints = ("revenue", "sales", "amount", "price", "total",
-                          "cost", "money", "income", "salary", "payment",
-                          "profit", "spend", "earning", "fee")
-        for field in numeric_fields:
-            fl = field.lower()
-            if any(h in fl for h in _revenue_hints):
-                agg_field = field
-                break
+        agg_field = numeric_index.money_field
         if agg_field is None and numeric_fields:
             agg_field = numeric_fields[0]
         aggregation = {"type": "sum", "field": agg_field}
@@ -642,36 +1126,25 @@ def parse_to_ir(
                     aggregation = {"type": "count", "field": None}
                 else:
                     # find which numeric field the user referenced
-                    for field in numeric_fields:
-                        if field.lower() in words:
-                            aggregation = {"type": agg_type, "field": field}
-                            break
-                        # match on last segment for nested numeric fields
-                        if "." in field:
-                            last = field.rsplit(".", 1)[-1]
-                            if last.lower() in words:
-                                aggregation = {"type": agg_type, "field": field}
-                                break
+                    # (nested numeric fields also match on their last segment)
+                    field = _first_mentioned_field(numeric_index, token_set)
+                    if field is not None:
+                        aggregation = {"type": agg_type, "field": field}
                     # fallback: first numeric field
-                    if aggregation is None and numeric_fields:
+                    elif numeric_fields:
                         aggregation = {"type": agg_type, "field": numeric_fields[0]}
                 break
 
     # -------- DETECT PROJECTION (only for find) --------
 
     if operation == "find":
-        projection = _detect_projection(words, allowed_fields)
+        projection = _detect_projection(words, allowed_index, token_pos)
 
     # -------- "in <value>" → string / location field --------
 
-    if "in" in words:
-        idx = words.index("in")
+    if "in" in token_pos:
+        idx = token_pos["in"]
         if idx + 1 < len(words):
-            location_hints = [
-                "city", "location", "state", "country",
-                "region", "address", "town",
-            ]
-
             # Skip "the" after "in"
             _in_start = idx + 1
             if words[_in_start] == "the" and _in_start + 1 < len(words):
@@ -682,13 +1155,13 @@ def parse_to_ir(
             _in_handled = False
             for _in_scan in range(_in_start, min(_in_start + 6, len(words))):
                 _in_w = words[_in_scan]
-                _in_ctx_field = _find_field_match(_in_w, string_fields)
+                _in_ctx_field = _find_field_match(_in_w, string_index)
                 if _in_ctx_field or _in_w in _IN_CONTEXT_NOUNS:
                     if _in_scan > _in_start:  # there are value words before the context noun
                         _in_val = " ".join(words[_in_start:_in_scan])
-                        _in_target = _in_ctx_field or _find_field_match(_in_w, allowed_fields)
-                        if _in_target and not any(c["field"] == _in_target for c in conditions):
-                            conditions.append({"field": _in_target, "operator": "eq", "value": _in_val})
+                        _in_target = _in_ctx_field or _find_field_match(_in_w, allowed_index)
+                        if _in_target and _in_target not in _cond_ops:
+                            _add_condition({"field": _in_target, "operator": "eq", "value": _in_val})
                         _in_handled = True
                     break
                 if _in_w in _CLAUSE_BREAKS or (_in_w in _CONDITION_TRIGGERS and _in_w != "with"):
@@ -697,18 +1170,13 @@ def parse_to_ir(
             # --- Existing location-based handling (fallback) ---
             if not _in_handled:
                 next_word = words[_in_start]
-                field_match = _find_field_match(next_word, string_fields)
+                field_match = _find_field_match(next_word, string_index)
 
                 if field_match and _in_start + 1 < len(words):
                     target = field_match
                     raw_val = words[_in_start + 1]
-                elif next_word in location_hints and _in_start + 1 < len(words):
-                    target = None
-                    for f in string_fields:
-                        fl = f.lower()
-                        if fl == next_word or fl.endswith("." + next_word):
-                            target = f
-                            break
+                elif next_word in _LOCATION_HINTS and _in_start + 1 < len(words):
+                    target = string_index.by_last_segment.get(next_word)
                     raw_val = words[_in_start + 1]
                 else:
                     raw_val = next_word
@@ -718,47 +1186,61 @@ def parse_to_ir(
                     value = raw_val.capitalize()
 
                     if target is None:
-                        for hint in location_hints:
-                            for f in string_fields:
-                                fl = f.lower()
-                                if fl == hint or fl.endswith("." + hint):
-                                    target = f
-                                    break
-                            if target:
-                                break
+                        target = string_index.location_field
                         if target is None and string_fields:
                             target = string_fields[0]
 
                     if target:
-                        conditions.append(
+                        _add_condition(
                             {"field": target, "operator": "eq", "value": value}
                         )
 
     # -------- ARRAY LITERAL CONDITIONS --------
     # If we extracted array literals, find the field before the placeholder
     # and create an eq condition with the actual list.
+    # Placeholders are dropped from *words* in one pass up front; each one
+    # keeps the position it would take in the placeholder-free list.
+    if _array_literals:
+        _ph_tokens = {_ph.lower() for _ph in _array_literals}
+        _ph_at: Dict[str, int] = {}
+        _kept: List[str] = []
+        for w in words:
+            if w in _ph_tokens:
+                _ph_at.setdefault(w, len(_kept))
+            else:
+                _kept.append(w)
+        if _ph_at:
+            words = _kept
+            token_set, token_pos = _index_words(words)
     for _ph, _arr_val in _array_literals.items():
-        _ph_lower = _ph.lower()
-        if _ph_lower in words:
-            _ph_idx = words.index(_ph_lower)
+        _ph_idx = _ph_at.get(_ph.lower())
+        if _ph_idx is not None:
             # Look backward for a field name (skip "as", "is", "=", etc.)
             _arr_field = None
             for _bi in range(_ph_idx - 1, max(_ph_idx - 5, -1), -1):
-                if _bi < 0:
-                    break
                 _bw = words[_bi]
-                if _bw in ("as", "is", "=", "equals", "equal", "being", ":"):
+                if _bw in _ARRAY_FIELD_SKIP:
                     continue
-                _arr_field = _find_field_match(_bw, allowed_fields)
+                _arr_field = _find_field_match(_bw, allowed_index)
                 if _arr_field:
                     break
-            if _arr_field and not any(c["field"] == _arr_field for c in conditions):
-                conditions.append({"field": _arr_field, "operator": "eq", "value": _arr_val})
-            # Remove placeholder from words so it doesn't interfere
-            words = [w for w in words if w != _ph_lower]
+            if _arr_field and _arr_field not in _cond_ops:
+                _add_condition({"field": _arr_field, "operator": "eq", "value": _arr_val})
 
     # -------- "where <field> is/= <value>" + implicit "<field> is <value>" --------
 
+    # *words* is final from here on.  Each word's _T_* classes are tagged
+    # once; multi-word field matches are looked up by start position, each
+    # computed at most once per query.
+    tags = [_WORD_TAGS.get(w, 0) for w in words]
+    _mw_at: Dict[int, Tuple[Optional[str], int]] = {}
+
+    def _multi_word_at(pos: int) -> Tuple[Optional[str], int]:
+        hit = _mw_at.get(pos)
+        if hit is None:
+            hit = _mw_at[pos] = _match_multi_word_field(words, pos, allowed_index)
+        return hit
+
     def _parse_value(raw: str, field: str) -> Any:
         """Coerce *raw* to a numeric value.  Handles currency ($, \u20ac),
         commas (10,000), # prefix, and k/M/B suffixes ($10k \u2192 10000)."""
@@ -768,11 +1250,10 @@ def parse_to_ir(
         return raw
 
     def _capture_multi_word_value(
-        rest: List[str],
         start: int,
         field: str,
     ) -> Tuple[Any, int]:
-        """Capture a multi-word value starting at *start* in *rest*.
+        """Capture a multi-word value starting at ``words[start]``.
 
         Stops at clause-break keywords, conjunctions introducing new
         conditions ("and <field>"), or field names that start a new condition.
@@ -780,37 +1261,38 @@ def parse_to_ir(
         """
         parts: List[str] = []
         i = start
-        while i < len(rest):
-            w = rest[i]
-            # Stop at clause breaks
-            if w in _CLAUSE_BREAKS:
-                break
-            # Stop at condition triggers ONLY if followed by a field name
-            # (to avoid breaking on trigger words inside natural values,
-            #  e.g. "text is When faced with a challenge" — "with" is NOT
-            #  followed by a field, so it's part of the value)
-            if w in _CONDITION_TRIGGERS:
-                if i + 1 < len(rest):
-                    nxt = rest[i + 1]
-                    if (_find_field_match(nxt, allowed_fields)
-                            or _find_multi_word_field(rest, i + 1, allowed_fields)):
-                        break
+        while i < len(words):
+            w = words[i]
+            t = tags[i]
+            # Ordinary value words carry none of these bits; only stop
+            # candidates go through the per-class checks below
+            if t & _T_VALUE_STOP:
+                # Stop at clause breaks
+                if t & _T_BREAK:
+                    break
+                # Stop at condition triggers ONLY if followed by a field name
+                # (to avoid breaking on trigger words inside natural values,
+                #  e.g. "text is When faced with a challenge" — "with" is NOT
+                #  followed by a field, so it's part of the value)
+                if t & _T_TRIGGER:
+                    if i + 1 < len(words):
+                        nxt = words[i + 1]
+                        if (_find_field_match(nxt, allowed_index)
+                                or _multi_word_at(i + 1)[0]):
+                            break
+                    else:
+                        break  # trigger at end of input → stop
+                # Stop at "and" if followed by a field name (new condition)
                 else:
-                    break  # trigger at end of input → stop
-            # Stop at "and" if followed by a field name (new condition)
-            if w in ("and", ",", "&"):
-                if i + 1 < len(rest):
-                    nxt = rest[i + 1]
-                    if (_find_field_match(nxt, allowed_fields)
-                            or _find_multi_word_field(rest, i + 1, allowed_fields)):
+                    if i + 1 < len(words):
+                        nxt = words[i + 1]
+                        if (_find_field_match(nxt, allowed_index)
+                                or _multi_word_at(i + 1)[0]):
+                            break
+                    # If "and" is in the middle of a value, keep going
+                    # but only if we already have some parts
+                    if not parts:
                         break
-                # If "and" is in the middle of a value, keep going
-                # but only if we already have some parts
-                if parts:
-                    parts.append(w)
-                    i += 1
-                    continue
-                break
             parts.append(w)
             i += 1
 
@@ -833,9 +1315,15 @@ def parse_to_ir(
 
     def _extract_condition(
         field_word: str,
-        rest_words: List[str],
-    ) -> Optional[Dict[str, Any]]:
-        """Given a candidate field word and remaining words, extract condition.
+        start: int,
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Given a candidate field word and the position of the words after
+        it in *words*, extract condition.
+
+        Returns ``(condition, words_consumed)``, counting the operator and
+        value words from *start* (``(None, 0)`` when nothing matched).
+        Works on offsets into *words* rather than slices of it, so no
+        per-call list copies are made.
 
         Dynamically supports:
         - is / = / equals / being                  → eq (multi-word value)
@@ -849,56 +1337,49 @@ def parse_to_ir(
         - <numeric_value> (no operator, numeric)    → eq (implicit)
         - <string_value>  (no operator, string)     → eq (implicit, multi-word)
         """
-        matched_field = _find_field_match(field_word, allowed_fields)
+        matched_field = _find_field_match(field_word, allowed_index)
         if not matched_field:
-            return None
-        if not rest_words:
-            return None
+            return None, 0
+        n = len(words)
+        if start >= n:
+            return None, 0
 
-        op_word = rest_words[0]
+        op_word = words[start]
 
         # --- "not" / negation before an operator: "is not X", "not X" ---
+        # *off* is the operator's position; *rem* counts words from there on
         negated = False
-        effective_rest = rest_words
+        off = start
 
-        if op_word in _OP_EQ and len(rest_words) >= 2 and rest_words[1] == "not":
+        if op_word in _OP_EQ and n - start >= 2 and words[start + 1] == "not":
             # "field is not X"
             negated = True
-            effective_rest = rest_words[2:]  # skip "is" + "not"
-            op_word = effective_rest[0] if effective_rest else ""
+            off = start + 2  # skip "is" + "not"
+            op_word = words[off] if off < n else ""
         elif op_word == "not" or op_word in _OP_NEQ:
             negated = True
-            effective_rest = rest_words[1:]
-            op_word = effective_rest[0] if effective_rest else ""
+            off = start + 1
+            op_word = words[off] if off < n else ""
+        rem = n - off
 
         # --- between X and Y ---
-        if op_word == "between" and len(effective_rest) >= 4:
+        if op_word == "between" and rem >= 4:
             try:
-                lo = _parse_value(effective_rest[1], matched_field)
-                # "between X and Y"
-                and_idx = 2
-                if effective_rest[2] == "and" and len(effective_rest) >= 4:
-                    and_idx = 2
-                    hi = _parse_value(effective_rest[3], matched_field)
-                elif effective_rest[2] == "to" and len(effective_rest) >= 4:
-                    and_idx = 2
-                    hi = _parse_value(effective_rest[3], matched_field)
-                else:
-                    lo = _parse_value(effective_rest[1], matched_field)
-                    hi = _parse_value(effective_rest[2], matched_field)
+                # "between X and Y" / "between X to Y", else "between X Y"
+                hi_at = 3 if words[off + 2] in ("and", "to") else 2
+                lo = _parse_value(words[off + 1], matched_field)
+                hi = _parse_value(words[off + hi_at], matched_field)
                 return {
                     "field": matched_field, "operator": "between",
                     "value": [lo, hi],
-                }
+                }, off + hi_at + 1 - start
             except (ValueError, IndexError):
                 pass
 
         # --- contains / includes / like / matches ---
         if op_word in _OP_CONTAINS:
-            if len(effective_rest) >= 2:
-                val, consumed = _capture_multi_word_value(
-                    effective_rest, 1, matched_field,
-                )
+            if rem >= 2:
+                val, consumed = _capture_multi_word_value(off + 1, matched_field)
                 if val is not None:
                     operator = "ne_contains" if negated else "contains"
                     # ne_contains not supported in MongoDB easily; use contains
@@ -906,123 +1387,62 @@ def parse_to_ir(
                         "field": matched_field,
                         "operator": "contains",
                         "value": val,
-                    }
+                    }, off + 1 + consumed - start
 
         # --- explicit eq: is / = / equals ---
         # But first check if "is" is followed by a comparison word
         # e.g. "date is after 2020" should become gt, not eq "after 2020"
-        if op_word in _OP_EQ and len(effective_rest) >= 2:
-            next_word = effective_rest[1]
-            # If the next word is a comparison operator, redirect
-            if next_word in _OP_GT:
-                effective_rest = effective_rest[1:]
-                op_word = next_word
-                # Fall through to gt handler below
-            elif next_word in _OP_GTE:
-                effective_rest = effective_rest[1:]
-                op_word = next_word
-            elif next_word in _OP_LT:
-                effective_rest = effective_rest[1:]
-                op_word = next_word
-            elif next_word in _OP_LTE:
-                effective_rest = effective_rest[1:]
+        if op_word in _OP_EQ and rem >= 2:
+            next_word = words[off + 1]
+            # If the next word starts a comparison, redirect
+            # (falls through to the comparison handler below)
+            if next_word in _OP_COMPARE or _match_op_phrase(words, off + 1)[0]:
+                off += 1
+                rem -= 1
                 op_word = next_word
             else:
-                val, consumed = _capture_multi_word_value(
-                    effective_rest, 1, matched_field,
-                )
+                val, consumed = _capture_multi_word_value(off + 1, matched_field)
                 if val is not None:
                     return {
                         "field": matched_field,
                         "operator": "ne" if negated else "eq",
                         "value": val,
-                    }
-
-        # --- gt / gte ---
-        if op_word in _OP_GT:
-            skip = 1
-            if len(effective_rest) > 1 and effective_rest[1] in ("than", "to"):
-                skip = 2
-            # "greater than or equal to X" → gte
-            if (len(effective_rest) > skip + 2
-                    and effective_rest[skip] in ("or", "equal", "equals")
-                    and effective_rest[skip + 1] in ("equal", "to", "equals")):
-                skip += 2
-                if len(effective_rest) > skip:
-                    val = _parse_value(effective_rest[skip], matched_field)
-                    return {"field": matched_field, "operator": "gte", "value": val}
-            if len(effective_rest) > skip:
-                val = _parse_value(effective_rest[skip], matched_field)
-                return {"field": matched_field, "operator": "gt", "value": val}
-
-        if op_word in _OP_GTE:
-            skip = 1
-            if len(effective_rest) > skip:
-                val = _parse_value(effective_rest[skip], matched_field)
-                return {"field": matched_field, "operator": "gte", "value": val}
-
-        # --- lt / lte ---
-        if op_word in _OP_LT:
-            skip = 1
-            if len(effective_rest) > 1 and effective_rest[1] in ("than", "to"):
-                skip = 2
-            # "less than or equal to X" → lte
-            if (len(effective_rest) > skip + 2
-                    and effective_rest[skip] in ("or", "equal", "equals")
-                    and effective_rest[skip + 1] in ("equal", "to", "equals")):
-                skip += 2
-                if len(effective_rest) > skip:
-                    val = _parse_value(effective_rest[skip], matched_field)
-                    return {"field": matched_field, "operator": "lte", "value": val}
-            if len(effective_rest) > skip:
-                val = _parse_value(effective_rest[skip], matched_field)
-                return {"field": matched_field, "operator": "lt", "value": val}
-
-        if op_word in _OP_LTE:
-            skip = 1
-            if len(effective_rest) > skip:
-                val = _parse_value(effective_rest[skip], matched_field)
-                return {"field": matched_field, "operator": "lte", "value": val}
+                    }, off + 1 + consumed - start
+
+        # --- gt / gte / lt / lte: "over X", "less than or equal to X", ... ---
+        cmp_op, cmp_len = _match_op_phrase(words, off)
+        if cmp_op:
+            if negated:  # "not less than X" = at least X
+                cmp_op = _NEGATED_CMP[cmp_op]
+            val = _parse_value(words[off + cmp_len], matched_field)
+            return (
+                {"field": matched_field, "operator": cmp_op, "value": val},
+                off + cmp_len + 1 - start,
+            )
 
         # --- Implicit eq: numeric field followed by a number ---
         if matched_field in numeric_fields:
-            # The rest_words[0] might be the value directly (no operator)
-            val = _normalize_number(rest_words[0])
+            # The first word after the field might be the value directly
+            val = _normalize_number(words[start])
             if isinstance(val, (int, float)):
                 return {
                     "field": matched_field,
                     "operator": "ne" if negated else "eq",
                     "value": val,
-                }
+                }, 1
 
         # --- Implicit eq for string fields: field followed by value(s) ---
         # Only if op_word is NOT a known keyword
-        if (op_word not in _NOISE
-                and op_word not in _CLAUSE_BREAKS
-                and op_word not in _CONDITION_TRIGGERS
-                and op_word not in ("and", ",", "&")):
-            val, consumed = _capture_multi_word_value(
-                rest_words, 0, matched_field,
-            )
+        if op_word not in _IMPLICIT_EQ_STOP:
+            val, consumed = _capture_multi_word_value(start, matched_field)
             if val is not None and consumed > 0:
                 return {
                     "field": matched_field,
                     "operator": "ne" if negated else "eq",
                     "value": val,
-                }
+                }, consumed
 
-        return None
-
-    def _count_condition_words(cond: Optional[Dict]) -> int:
-        """Estimate how many words a condition consumed."""
-        if not cond:
-            return 0
-        val = cond["value"]
-        if isinstance(val, list):
-            return 5  # between X and Y
-        if isinstance(val, str):
-            return 2 + len(val.split())  # field + op + value words
-        return 3  # field + op + number
+        return None, 0
 
     # ================================================================
     # UNIFIED CONDITION SCANNING
@@ -1033,274 +1453,227 @@ def parse_to_ir(
     # triplets.  Multiple triggers are tried (first "where", then others).
     # ================================================================
 
+    # Clause-break positions, shared by every trigger's scan below
+    _break_pos = [j for j, t in enumerate(tags) if t & _T_BREAK]
+
+    # Prefix counts of dot-join breaks: words[a:b] holds one iff
+    # _dj_bad[b] - _dj_bad[a] > 0.  Joined candidates are built on demand.
+    _dj_bad = [0]
+    for t in tags:
+        _dj_bad.append(_dj_bad[-1] + (t & _T_DOT_JOIN_BREAK != 0))
+    _dj_joined: Dict[Tuple[int, int], str] = {}
+
+    # Word spans [start, end) taken by multi-word field conditions
+    # ("address zip over 500", "invoice amount over 500"); the standalone
+    # comparison and orphan-number passes leave these words alone.
+    _consumed_spans: List[Tuple[int, int]] = []
+
+    def _in_consumed_span(idx: int) -> bool:
+        return any(lo <= idx < hi for lo, hi in _consumed_spans)
+
     def _scan_conditions_from(start_idx: int) -> None:
-        """Scan words starting at *start_idx* and extract conditions."""
+        """Scan words starting at *start_idx* and extract conditions.
+
+        The scan is bounded by the first clause break ("sort", "limit", ...)
+        at or after *start_idx*; the break word itself is still tried as a
+        field name (e.g. "first name"), but nothing past it is scanned.
+        """
+        b = bisect_left(_break_pos, start_idx)
+        end = _break_pos[b] if b < len(_break_pos) else len(words) - 1
         i = start_idx
-        while i < len(words):
+        while i <= end:
             w = words[i]
             # conjunction / filler — skip
-            if w in ("and", ",", "&", "the", "a", "an", "has", "have", "had"):
+            if tags[i] & _T_SCAN_SKIP:
                 i += 1
                 continue
             # Try multi-word dot-notation first (e.g. "award tech")
-            mw = _find_multi_word_field(words, i, allowed_fields)
+            mw, seg_count = _multi_word_at(i)
             if mw:
-                seg_count = len(mw.split("."))
-                cond = _extract_condition(mw, words[i + seg_count:])
-                if cond and not any(c["field"] == cond["field"] for c in conditions):
+                cond, used = _extract_condition(mw, i + seg_count)
+                if cond and cond["field"] not in _cond_ops:
                     if cond["operator"] == "between":
                         # expand to gte + lte
-                        conditions.append({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
-                        conditions.append({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
+                        _add_condition({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
+                        _add_condition({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
                     else:
-                        conditions.append(cond)
-                i += seg_count + _count_condition_words(cond)
+                        _add_condition(cond)
+                    _consumed_spans.append((i, i + seg_count + used))
+                i += seg_count + used
                 continue
             # Try single word
-            cond = _extract_condition(w, words[i + 1:])
-            if cond and not any(c["field"] == cond["field"] for c in conditions):
+            cond, used = _extract_condition(w, i + 1)
+            if cond and cond["field"] not in _cond_ops:
                 if cond["operator"] == "between":
-                    conditions.append({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
-                    conditions.append({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
+                    _add_condition({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
+                    _add_condition({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
                 else:
-                    conditions.append(cond)
-                i += 1 + _count_condition_words(cond)
+                    _add_condition(cond)
+                i += 1 + used
                 continue
 
             # Fallback: try dot-joining consecutive words for fuzzy field matching
             _dj_found = False
             for _dj_k in range(min(4, len(words) - i), 1, -1):
-                _dj_parts = words[i:i + _dj_k]
-                if any(p in _OP_EQ | {"and", ",", "&"} | _OP_GT | _OP_LT
-                       | {"than"} for p in _dj_parts[1:]):
+                if _dj_bad[i + _dj_k] - _dj_bad[i + 1]:
                     continue
-                _dj_candidate = ".".join(_dj_parts)
-                _dj_cond = _extract_condition(_dj_candidate, words[i + _dj_k:])
-                if _dj_cond and not any(c["field"] == _dj_cond["field"] for c in conditions):
+                _dj_candidate = _dj_joined.get((i, _dj_k))
+                if _dj_candidate is None:
+                    _dj_candidate = ".".join(words[i:i + _dj_k])
+                    _dj_joined[(i, _dj_k)] = _dj_candidate
+                _dj_cond, used = _extract_condition(_dj_candidate, i + _dj_k)
+                if _dj_cond and _dj_cond["field"] not in _cond_ops:
                     if _dj_cond["operator"] == "between":
-                        conditions.append({"field": _dj_cond["field"], "operator": "gte", "value": _dj_cond["value"][0]})
-                        conditions.append({"field": _dj_cond["field"], "operator": "lte", "value": _dj_cond["value"][1]})
+                        _add_condition({"field": _dj_cond["field"], "operator": "gte", "value": _dj_cond["value"][0]})
+                        _add_condition({"field": _dj_cond["field"], "operator": "lte", "value": _dj_cond["value"][1]})
                     else:
-                        conditions.append(_dj_cond)
-                    i += _dj_k + _count_condition_words(_dj_cond)
+                        _add_condition(_dj_cond)
+                    i += _dj_k + used
                     _dj_found = True
                     break
             if _dj_found:
                 continue
-
-            # if this word is a clause break, stop
-            if w in _CLAUSE_BREAKS:
-                break
             i += 1
 
     # --- 1. Trigger-based condition scanning ---
     # Try each condition trigger keyword ("where", "with", "having", etc.)
-    _all_triggers = ["where"] + [t for t in _CONDITION_TRIGGERS if t != "where"]
-    # Also include "for" and "of" as lightweight triggers
-    _all_triggers.extend(["for", "of"])
-    _triggers_used = set()
-
-    for trigger in _all_triggers:
-        if trigger in _triggers_used:
-            continue
-        if trigger not in words:
-            continue
-        t_idx = words.index(trigger)
-        _triggers_used.add(trigger)
-        _scan_conditions_from(t_idx + 1)
+    for trigger in _SCAN_TRIGGERS:
+        t_idx = token_pos.get(trigger)
+        if t_idx is not None:
+            _scan_conditions_from(t_idx + 1)
 
     # --- 2. Multi-word implicit field matching (e.g. "options id is 123") ---
-    _consumed_positions: set = set()
-    for _mi in range(len(words)):
-        if _mi in _consumed_positions:
-            continue
-        if words[_mi] in _NOISE:
-            continue
-        _mw_impl = _find_multi_word_field(words, _mi, allowed_fields)
-        if _mw_impl:
-            _seg_n = len(_mw_impl.split("."))
-            _op_pos = _mi + _seg_n
-            cond = _extract_condition(_mw_impl, words[_op_pos:])
-            if cond and not any(c["field"] == _mw_impl for c in conditions):
-                if cond["operator"] == "between":
-                    conditions.append({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
-                    conditions.append({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
-                else:
-                    conditions.append(cond)
-                _consumed_positions.update(range(_mi, _op_pos + _count_condition_words(cond)))
+    _mi = 0
+    while _mi < len(words):
+        if not tags[_mi] & _T_NOISE:
+            _mw_impl, _seg_n = _multi_word_at(_mi)
+            if _mw_impl:
+                _op_pos = _mi + _seg_n
+                cond, used = _extract_condition(_mw_impl, _op_pos)
+                if cond and _mw_impl not in _cond_ops:
+                    if cond["operator"] == "between":
+                        _add_condition({"field": cond["field"], "operator": "gte", "value": cond["value"][0]})
+                        _add_condition({"field": cond["field"], "operator": "lte", "value": cond["value"][1]})
+                    else:
+                        _add_condition(cond)
+                    # resume scanning after the condition's words
+                    _end = _op_pos + used
+                    _consumed_spans.append((_mi, _end))
+                    _mi = _end
+                    continue
+        _mi += 1
 
     # --- 3. Implicit "<field> is/= <value>" (no trigger keyword) ---
-    for field in allowed_fields:
-        fl = field.lower()
+    for field, fl, leaf in zip(allowed_fields, allowed_index.lowered, allowed_index.fuzzy_targets):
         match_words = [fl]
-        if "." in fl:
-            match_words.append(fl.rsplit(".", 1)[-1])
+        if leaf != fl:
+            match_words.append(leaf)
 
         for mw in match_words:
-            if mw in words:
-                idx = words.index(mw)
-                if idx in _consumed_positions:
+            if mw in token_pos:
+                idx = token_pos[mw]
+                if _in_consumed_span(idx):
                     break
-                rest = words[idx + 1:]
-                cond = _extract_condition(mw, rest)
-                if cond and not any(c["field"] == field for c in conditions):
+                cond, _ = _extract_condition(mw, idx + 1)
+                if cond and field not in _cond_ops:
                     if cond["operator"] == "between":
-                        conditions.append({"field": field, "operator": "gte", "value": cond["value"][0]})
-                        conditions.append({"field": field, "operator": "lte", "value": cond["value"][1]})
+                        _add_condition({"field": field, "operator": "gte", "value": cond["value"][0]})
+                        _add_condition({"field": field, "operator": "lte", "value": cond["value"][1]})
                     else:
                         cond["field"] = field  # ensure full path
-                        conditions.append(cond)
+                        _add_condition(cond)
                 break
 
     # --- 4. Standalone greater-than / less-than (field inferred) ---
-
-    for i, w in enumerate(words):
-        if w in COMPARISON_GT and i + 2 < len(words) and words[i + 1] == "than":
-            val = _normalize_number(words[i + 2])
-            if not isinstance(val, (int, float)):
-                continue
-            target = None
-            for field in numeric_fields:
-                if field.lower() in words:
-                    target = field
-                    break
-                if "." in field:
-                    last = field.rsplit(".", 1)[-1]
-                    if last.lower() in words:
-                        target = field
-                        break
-            if target is None and numeric_fields:
-                age_like = [f for f in numeric_fields if f.lower() == "age"
-                            or f.lower().endswith(".age")]
-                target = age_like[0] if age_like else numeric_fields[0]
-            if target and not any(
-                c["field"] == target and c["operator"] in ("gt", "gte") for c in conditions
-            ):
-                conditions.append(
-                    {"field": target, "operator": "gt", "value": val}
-                )
-
-        if w in COMPARISON_LT and i + 2 < len(words) and words[i + 1] == "than":
-            val = _normalize_number(words[i + 2])
-            if not isinstance(val, (int, float)):
-                continue
-            target = None
-            for field in numeric_fields:
-                if field.lower() in words:
-                    target = field
-                    break
-                if "." in field:
-                    last = field.rsplit(".", 1)[-1]
-                    if last.lower() in words:
-                        target = field
-                        break
-            if target is None and numeric_fields:
-                age_like = [f for f in numeric_fields if f.lower() == "age"
-                            or f.lower().endswith(".age")]
-                target = age_like[0] if age_like else numeric_fields[0]
-            if target and not any(
-                c["field"] == target and c["operator"] in ("lt", "lte") for c in conditions
-            ):
-                conditions.append(
-                    {"field": target, "operator": "lt", "value": val}
-                )
-
     # --- 5. "over $500" / "under 100" without "than" ---
+    # One pass collects both; section 4's comparisons are applied before
+    # section 5's so the first-wins dedup behaves as with separate passes.
+    _than_cmps: List[Tuple[str, Any]] = []
+    _bare_cmps: List[Tuple[str, Any]] = []
     for i, w in enumerate(words):
-        if w in ("over", "above") and i + 1 < len(words) and words[i + 1] != "than":
-            val = _normalize_number(words[i + 1])
-            if isinstance(val, (int, float)):
-                target = None
-                for field in numeric_fields:
-                    if field.lower() in words:
-                        target = field
-                        break
-                    if "." in field and field.rsplit(".", 1)[-1].lower() in words:
-                        target = field
-                        break
-                if target is None and numeric_fields:
-                    target = numeric_fields[0]
-                if target and not any(
-                    c["field"] == target and c["operator"] in ("gt", "gte") for c in conditions
-                ):
-                    conditions.append({"field": target, "operator": "gt", "value": val})
-        if w in ("under", "below") and i + 1 < len(words) and words[i + 1] != "than":
+        if w not in _COMPARISON_WORDS or i + 1 >= len(words) or _in_consumed_span(i):
+            continue
+        # "not less than 18" / "no more than 30" flip to gte / lte
+        negated = i > 0 and words[i - 1] in _CMP_NEGATIONS
+        if words[i + 1] == "than":
+            if i + 2 < len(words) and (w in COMPARISON_GT or w in COMPARISON_LT):
+                val = _normalize_number(words[i + 2])
+                if isinstance(val, (int, float)):
+                    op = "gt" if w in COMPARISON_GT else "lt"
+                    _than_cmps.append((_NEGATED_CMP[op] if negated else op, val))
+        elif w in _OVER_WORDS or w in _UNDER_WORDS:
             val = _normalize_number(words[i + 1])
             if isinstance(val, (int, float)):
-                target = None
-                for field in numeric_fields:
-                    if field.lower() in words:
-                        target = field
-                        break
-                    if "." in field and field.rsplit(".", 1)[-1].lower() in words:
-                        target = field
-                        break
-                if target is None and numeric_fields:
-                    target = numeric_fields[0]
-                if target and not any(
-                    c["field"] == target and c["operator"] in ("lt", "lte") for c in conditions
-                ):
-                    conditions.append({"field": target, "operator": "lt", "value": val})
+                op = "gt" if w in _OVER_WORDS else "lt"
+                _bare_cmps.append((_NEGATED_CMP[op] if negated else op, val))
+
+    if _than_cmps or _bare_cmps:
+        _mentioned = _first_mentioned_field(numeric_index, token_set)
+        _than_target = _bare_target = _mentioned
+        if _mentioned is None and numeric_fields:
+            _than_target = numeric_index.by_last_segment.get("age", numeric_fields[0])
+            _bare_target = numeric_fields[0]
+        for target, cmps in ((_than_target, _than_cmps), (_bare_target, _bare_cmps)):
+            for op, val in cmps:
+                # gt / gte (lt / lte) are one family: the first one found wins
+                if target and _cond_ops.get(target, _NO_OPS).isdisjoint((op[:2], op[:2] + "e")):
+                    _add_condition({"field": target, "operator": op, "value": val})
 
     # --- 6. Orphan numbers → pair with first unconditioned numeric field ---
     # Handles patterns like "show transaction #12345" or "order 42" where
     # the number value wasn't consumed by any condition scan.
-    _has_numeric_cond = any(c["field"] in numeric_fields for c in conditions)
+    _has_numeric_cond = not _cond_ops.keys().isdisjoint(numeric_fields)
     if not _has_numeric_cond and numeric_fields:
         for _oi, _ow in enumerate(words):
-            if _ow in _NOISE or _ow in _CLAUSE_BREAKS:
+            if tags[_oi] & (_T_NOISE | _T_BREAK) or _in_consumed_span(_oi):
                 continue
             # Skip if preceded by limit/sort words
-            if _oi > 0 and words[_oi - 1] in ("top", "first", "limit"):
+            if _oi > 0 and words[_oi - 1] in _LIMIT_WORDS:
                 continue
             val = _normalize_number(_ow)
             if isinstance(val, (int, float)):
                 target = None
                 for nf in numeric_fields:
-                    if not any(c["field"] == nf for c in conditions):
+                    if nf not in _cond_ops:
                         target = nf
                         break
                 if target:
-                    conditions.append({"field": target, "operator": "eq", "value": val})
+                    _add_condition({"field": target, "operator": "eq", "value": val})
                 break
 
     # -------- TEMPORAL CONDITIONS --------
     # Detect temporal expressions (today, yesterday, last month, etc.)
     # and apply them to date/time fields found in the schema.
-    for _ti, _tw in enumerate(words):
-        if _tw in _TEMPORAL_SINGLE or _tw in _TEMPORAL_MODIFIERS:
-            trange, consumed = _build_temporal_range(words, _ti)
-            if trange:
-                # Find a date/time field in the schema
-                _date_field = None
-                _date_hints = ("date", "time", "created", "updated", "timestamp",
-                               "hired", "joined", "started", "ended", "at",
-                               "created_at", "updated_at", "ordered")
-                for f in allowed_fields:
-                    fl = f.lower()
-                    if any(h in fl for h in _date_hints):
-                        _date_field = f
-                        break
-                if _date_field:
-                    if "gte" in trange and not any(
-                        c["field"] == _date_field and c["operator"] == "gte"
-                        for c in conditions
-                    ):
-                        conditions.append({"field": _date_field, "operator": "gte",
-                                           "value": trange["gte"]})
-                    if "lte" in trange and not any(
-                        c["field"] == _date_field and c["operator"] == "lte"
-                        for c in conditions
-                    ):
-                        conditions.append({"field": _date_field, "operator": "lte",
-                                           "value": trange["lte"]})
-                break  # only use first temporal expression
+    _anchors: Optional[_TimeAnchors] = None  # built on the first temporal word
+    # Most queries have no temporal word at all; skip the scan for those
+    if not _TEMPORAL_STARTS.isdisjoint(token_set):
+        for _ti, _tw in enumerate(words):
+            if _tw in _TEMPORAL_STARTS:
+                if _anchors is None:
+                    _anchors = _time_anchors()
+                trange, consumed = _build_temporal_range(words, _ti, _anchors)
+                if trange:
+                    # Find a date/time field in the schema
+                    _date_field = allowed_index.date_field
+                    if _date_field:
+                        if "gte" in trange and "gte" not in _cond_ops.get(_date_field, _NO_OPS):
+                            _add_condition({"field": _date_field, "operator": "gte",
+                                               "value": trange["gte"]})
+                        if "lte" in trange and "lte" not in _cond_ops.get(_date_field, _NO_OPS):
+                            _add_condition({"field": _date_field, "operator": "lte",
+                                               "value": trange["lte"]})
+                    break  # only use first temporal expression
 
     # -------- SUPERLATIVE → SORT + LIMIT --------
     # "best seller" → sort desc + limit 1,  "top 5" → limit 5,
     # "lowest price" → sort asc + limit 1
     if sort is None:
         for _si, _sw in enumerate(words):
+            # "at least 5" / "at most 5" are comparisons, not superlatives
+            if (_sw in _AT_BOUND_WORDS and _si and words[_si - 1] == "at"
+                    and _si + 1 < len(words)
+                    and isinstance(_normalize_number(words[_si + 1]), (int, float))):
+                continue
             if _sw in _SUPERLATIVE_DESC:
                 _sup_dir = "desc"
             elif _sw in _SUPERLATIVE_ASC:
@@ -1315,7 +1688,7 @@ def parse_to_ir(
                         limit = _sup_n
                     # Look for sort field after the number
                     if _si + 2 < len(words):
-                        _sup_f = _find_field_match(words[_si + 2], allowed_fields)
+                        _sup_f = _find_field_match(words[_si + 2], allowed_index)
                         if _sup_f:
                             sort = {"field": _sup_f, "direction": _sup_dir}
                     # Fallback: infer sort from numeric fields
@@ -1324,7 +1697,7 @@ def parse_to_ir(
                     break
             # "highest <field>" / "lowest <field>"
             if _si + 1 < len(words):
-                _sup_f = _find_field_match(words[_si + 1], allowed_fields)
+                _sup_f = _find_field_match(words[_si + 1], allowed_index)
                 if _sup_f:
                     sort = {"field": _sup_f, "direction": _sup_dir}
                     if limit is None:
@@ -1343,16 +1716,14 @@ def parse_to_ir(
     # "where" → project location/city fields
     if projection is None and operation == "find":
         for _qw, _qhints in _QUESTION_FIELD_HINTS.items():
-            if _qw not in words:
+            if _qw not in token_set:
                 continue
             _inferred: List[str] = []
             for hint in _qhints:
-                for f in allowed_fields:
-                    fl = f.lower()
-                    if hint in fl or fl.endswith("." + hint):
-                        if f not in _inferred:
-                            _inferred.append(f)
-                            break  # one match per hint
+                for f in allowed_index.by_question_hint[hint]:
+                    if f not in _inferred:
+                        _inferred.append(f)
+                        break  # one match per hint
             if _inferred and len(_inferred) < len(allowed_fields):
                 projection = _inferred
                 break
@@ -1360,25 +1731,23 @@ def parse_to_ir(
     # -------- SORT --------
 
     for i, w in enumerate(words):
-        if w in ("sorted", "sort", "order", "ordered"):
+        if w in _SORT_WORDS:
             if i + 2 < len(words) and words[i + 1] == "by":
-                match = _find_field_match(words[i + 2], allowed_fields)
+                match = _find_field_match(words[i + 2], allowed_index)
                 if match:
                     direction = "asc"
-                    if i + 3 < len(words) and words[i + 3] in (
-                        "descending", "desc", "down",
-                    ):
+                    if i + 3 < len(words) and words[i + 3] in _DESC_WORDS:
                         direction = "desc"
                     sort = {"field": match, "direction": direction}
 
     # If no explicit sort but "top/first N by <field>" was used, sort desc
     if sort is None:
         for i, w in enumerate(words):
-            if w in ("top", "first") and i + 1 < len(words):
+            if w in _TOP_WORDS and i + 1 < len(words):
                 # look for "by <field>" after the number
                 for j in range(i + 2, min(i + 5, len(words))):
                     if words[j] == "by" and j + 1 < len(words):
-                        match = _find_field_match(words[j + 1], allowed_fields)
+                        match = _find_field_match(words[j + 1], allowed_index)
                         if match:
                             sort = {"field": match, "direction": "desc"}
                         break
@@ -1386,20 +1755,15 @@ def parse_to_ir(
     # -------- LIMIT --------
 
     for i, w in enumerate(words):
-        if w in ("limit", "top", "first") and i + 1 < len(words):
-            try:
-                limit = int(words[i + 1])
-            except ValueError:
-                pass
+        if w in _LIMIT_WORDS and i + 1 < len(words):
+            n = _int_word(words[i + 1])
+            if n is not None:
+                limit = n
         # "N results / records / documents"
-        try:
-            n = int(w)
-            if i + 1 < len(words) and words[i + 1] in (
-                "results", "records", "documents", "docs", "rows",
-            ):
+        if i + 1 < len(words) and words[i + 1] in _RESULT_NOUNS:
+            n = _int_word(w)
+            if n is not None:
                 limit = n
-        except ValueError:
-            pass
 
     # -------- FINAL DECISION --------
 
@@ -1408,7 +1772,7 @@ def parse_to_ir(
 
     # allow bare "show all" / "list" with optional limit/sort
     if not conditions and operation == "find":
-        has_show = any(w in SHOW_KEYWORDS for w in words)
+        has_show = not SHOW_KEYWORDS.isdisjoint(token_set)
         if not (has_show or limit is not None or sort is not None):
             return None
 
@@ -1428,3 +1792,54 @@ def parse_to_ir(
             "needs_clarification": False,
         },
     }
+
+
+# ---------------------- BATCH PARSING ----------------------
+
+# Below this many queries a worker pool costs more to start than it saves
+PARSE_BATCH_MIN_PARALLEL = 64
+
+_WORKER_SCHEMA: Optional[Tuple[List[str], List[str]]] = None
+
+
+def _init_batch_worker(allowed_fields: List[str], numeric_fields: List[str]) -> None:
+    """Pool initializer: keep the schema and warm its field indexes once
+    per worker process instead of shipping them with every query."""
+    global _WORKER_SCHEMA
+    _WORKER_SCHEMA = (allowed_fields, numeric_fields)
+    _field_index(tuple(allowed_fields))
+    _field_index(tuple(numeric_fields))
+
+
+def _parse_in_worker(user_input: str) -> Optional[Dict[str, Any]]:
+    return parse_to_ir(user_input, *_WORKER_SCHEMA)
+
+
+def parse_batch(
+    queries: List[str],
+    allowed_fields: List[str] = None,
+    numeric_fields: List[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """Parse many queries against one schema, in order.
+
+    Parsing is CPU-bound pure Python, so large batches are spread over a
+    process pool (threads would serialise on the GIL); each worker gets
+    the schema once through its initializer.  Batches smaller than
+    ``PARSE_BATCH_MIN_PARALLEL`` are parsed in-process.
+    """
+    allowed_fields = list(allowed_fields or [])
+    numeric_fields = list(numeric_fields or [])
+    if len(queries) < PARSE_BATCH_MIN_PARALLEL:
+        return [parse_to_ir(q, allowed_fields, numeric_fields) for q in queries]
+
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_batch_worker,
+        initargs=(allowed_fields, numeric_fields),
+    ) as pool:
+        return list(pool.map(
+            _parse_in_worker, queries,
+            chunksize=max(1, len(queries) // (4 * workers)),
+        ))
@@ -4,87 +4,135 @@ Response formatter: builds the final JSON response for the API.
 Supports pagination metadata, index info, and large-dataset warnings.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 LARGE_DATASET_THRESHOLD = 100_000
 
 
-def paraphrase_ir(ir: Dict[str, Any]) -> str:
-    """Generate a human-readable description of the parsed IR."""
-    parts: List[str] = []
+# IR operator → wording used in the paraphrase (others are shown as-is)
+_OP_WORDS = {
+    "eq": "is", "gt": ">", "gte": ">=",
+    "lt": "<", "lte": "<=", "ne": "!=",
+    "in": "in", "exists": "exists",
+}
+
 
-    if ir["operation"] == "find":
-        parts.append("Showing records")
-    elif ir["operation"] == "aggregate":
-        agg_type = ir["aggregation"]["type"]
+def _paraphrase_parts(ir: Dict[str, Any]) -> Iterator[str]:
+    operation = ir["operation"]
+    if operation == "find":
+        yield "Showing records"
+    elif operation == "aggregate":
+        aggregation = ir["aggregation"]
+        agg_type = aggregation["type"]
         if agg_type == "count":
-            parts.append("Counting records")
+            yield "Counting records"
         else:
-            parts.append(f"Calculating {agg_type} of {ir['aggregation']['field']}")
+            yield f"Calculating {agg_type} of {aggregation['field']}"
 
-    for condition in ir.get("conditions", []):
-        field = condition["field"]
+    op_word = _OP_WORDS.get
+    for condition in ir.get("conditions") or ():
         operator = condition["operator"]
-        value = condition["value"]
+        yield (
+            f"where {condition['field']} {op_word(operator, operator)} "
+            f"{condition['value']}"
+        )
 
-        op_map = {
-            "eq": "is", "gt": ">", "gte": ">=",
-            "lt": "<", "lte": "<=", "ne": "!=",
-            "in": "in", "exists": "exists",
-        }
-        parts.append(f"where {field} {op_map.get(operator, operator)} {value}")
+    sort = ir.get("sort")
+    if sort:
+        yield f"sorted by {sort['field']} ({sort['direction']})"
 
-    if ir.get("sort"):
-        direction = ir["sort"]["direction"]
-        field = ir["sort"]["field"]
-        parts.append(f"sorted by {field} ({direction})")
+    projection = ir.get("projection")
+    if projection:
+        yield f"showing fields: {', '.join(projection)}"
 
-    if ir.get("projection"):
-        parts.append(f"showing fields: {', '.join(ir['projection'])}")
+    limit = ir.get("limit")
+    if limit:
+        yield f"limited to {limit} results"
 
-    if ir.get("limit"):
-        parts.append(f"limited to {ir['limit']} results")
 
-    return " ".join(parts) + "."
+def paraphrase_ir(ir: Dict[str, Any]) -> str:
+    """Generate a human-readable description of the parsed IR."""
+    return " ".join(_paraphrase_parts(ir)) + "."
 
 
-def clean_documents(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def clean_documents(
+    results: List[Dict[str, Any]], sanitise: bool = True,
+) -> List[Dict[str, Any]]:
     """Stringify ``_id`` and sanitise non-JSON-serialisable values (bytes,
     datetime, ObjectId, Decimal128, etc.) so FastAPI can encode the response.
 
+    The documents are freshly fetched and owned by the caller, so they are
+    sanitised in place rather than copied.  With ``sanitise=False`` (the
+    schema says every field is JSON-safe) only ``_id`` is touched.
+
     ``_id`` is kept so users can see and reference document identifiers in
     subsequent queries and mutation operations."""
-    cleaned = []
     for doc in results:
         if "_id" in doc:
             doc["_id"] = str(doc["_id"])
-        cleaned.append(_sanitise_value(doc))
-    return cleaned
+        if sanitise:
+            _sanitise_in_place(doc)
+    return results
 
 
-def _sanitise_value(obj: Any) -> Any:
-    """Recursively convert non-JSON-safe types to safe representations."""
-    if isinstance(obj, dict):
-        return {k: _sanitise_value(v) for k, v in obj.items()}
-    if isinstance(obj, list):
-        return [_sanitise_value(item) for item in obj]
-    if isinstance(obj, bytes):
-        # Binary fields (e.g. vector embeddings) — try UTF-8, else base64
+# Exact types that are already JSON-safe (subclasses take the slow path)
+_SAFE_TYPES = frozenset({int, float, str, bool, type(None)})
+
+
+def _sanitise_leaf(obj: Any) -> Any:
+    """Convert one non-container value to a JSON-safe representation."""
+    if isinstance(obj, (int, float, str, bool, type(None))):
+        return obj
+    if isinstance(obj, bytes):  # cold: binary fields (e.g. vector embeddings)
+        # try UTF-8, else placeholder
         try:
             return obj.decode("utf-8")
         except (UnicodeDecodeError, ValueError):
-            import base64
             return f"[binary {len(obj)} bytes]"
-    if isinstance(obj, (int, float, str, bool, type(None))):
-        return obj
     # datetime, ObjectId, Decimal128, etc.
     return str(obj)
 
 
+def _sanitise_in_place(obj: Any) -> Any:
+    """Same conversion as ``_sanitise_value``, but rewrites dicts and lists
+    in place with an explicit stack instead of rebuilding them recursively.
+
+    Returns *obj* (or its replacement, if *obj* itself is not a container).
+    """
+    if not isinstance(obj, (dict, list)):
+        return _sanitise_leaf(obj)
+    stack = [obj]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, value in items:
+            kind = type(value)
+            if kind in _SAFE_TYPES:
+                continue
+            if kind is dict or kind is list or isinstance(value, (dict, list)):
+                stack.append(value)
+            else:
+                # replacing an existing key/index is safe mid-iteration
+                container[key] = _sanitise_leaf(value)
+    return obj
+
+
+def _sanitise_value(obj: Any) -> Any:
+    """Recursively convert non-JSON-safe types to safe representations."""
+    if type(obj) in _SAFE_TYPES:
+        return obj
+    if isinstance(obj, dict):
+        return {k: _sanitise_value(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_sanitise_value(item) for item in obj]
+    return _sanitise_leaf(obj)
+
+
 def format_response(
     ir: Dict[str, Any],
     query_result: Dict[str, Any],
     indexes: Optional[List[Dict[str, Any]]] = None,
+    sanitise: bool = True,
 ) -> Dict[str, Any]:
     """Build the final response dict.
 
@@ -93,9 +141,13 @@ def format_response(
     ir : dict
         The validated intermediate representation.
     query_result : dict
-        Output from ``execute_query`` with keys: data, total_count, page, page_size.
+        Output from ``execute_query`` with keys: data, total_count, page,
+        page_size (and ``next_cursor`` under keyset pagination).
     indexes : list[dict] | None
         Index information for the collection (optional).
+    sanitise : bool
+        ``False`` skips sanitising find results beyond ``_id`` (see
+        ``schema_utils.needs_sanitise``).
     """
 
     interpretation = paraphrase_ir(ir)
@@ -109,7 +161,11 @@ def format_response(
     # so the frontend table renderer works uniformly.
     if ir["operation"] == "aggregate":
         value = data[0].get("result", 0) if data else 0
-        agg_data = clean_documents(data) if data else [{"result": value}]
+        if ir["aggregation"]["type"] == "count":
+            # $count yields at most one {"result": int}: nothing to sanitise
+            agg_data = [{"result": value}]
+        else:
+            agg_data = clean_documents(data) if data else [{"result": value}]
         response: Dict[str, Any] = {
             "interpretation": interpretation,
             "interpreted_ir": ir,
@@ -125,7 +181,7 @@ def format_response(
         return response
 
     # find result with pagination
-    cleaned = clean_documents(data)
+    cleaned = clean_documents(data, sanitise)
 
     response = {
         "interpretation": interpretation,
@@ -137,6 +193,10 @@ def format_response(
         "data": cleaned,
     }
 
+    # keyset pagination: opaque cursor for the next page (None = last page)
+    if "next_cursor" in query_result:
+        response["next_cursor"] = query_result["next_cursor"]
+
     if indexes is not None:
         response["indexes"] = indexes
 
@@ -17,9 +17,23 @@ MongoDB operator:
     unknown           — anything else (binary, null, ObjectId, …)
 """
 
+import atexit
 import datetime as _dt
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
 from typing import Any, Dict, List, Optional, Set, Tuple
 from pymongo import MongoClient
+from pymongo.errors import OperationFailure
+from db_executor import (
+    MAX_CACHED_CLIENTS,
+    READ_ONLY_CLIENT_OPTIONS,
+    SERVER_SELECTION_TIMEOUT_MS,
+    ClientLRU,
+)
 from logger import logger
 
 
@@ -38,8 +52,30 @@ TYPE_DATE = "date"
 TYPE_UNKNOWN = "unknown"
 
 
+# Exact Python type → schema type; subclasses take the isinstance path
+_TYPE_BY_CLASS: Dict[type, str] = {
+    bool: TYPE_BOOL,
+    _dt.datetime: TYPE_DATE,
+    _dt.date: TYPE_DATE,
+    int: TYPE_INT,
+    float: TYPE_FLOAT,
+    str: TYPE_STRING,
+    dict: TYPE_OBJECT,
+}
+
+
 def _detect_type(value: Any) -> str:
     """Classify a single Python value into a schema type string."""
+    ftype = _TYPE_BY_CLASS.get(type(value))
+    if ftype is not None:
+        return ftype
+    if type(value) is list:
+        return _detect_list_type(value)
+    return _detect_type_slow(value)
+
+
+def _detect_type_slow(value: Any) -> str:
+    """``_detect_type`` for subclasses (bson's SON, Int64, ...) and other types."""
     if isinstance(value, bool):
         return TYPE_BOOL
     if isinstance(value, _dt.datetime):
@@ -55,78 +91,311 @@ def _detect_type(value: Any) -> str:
     if isinstance(value, dict):
         return TYPE_OBJECT
     if isinstance(value, list):
-        if not value:
-            return TYPE_ARRAY_MIXED  # empty → unknown element type
-        has_str = any(isinstance(v, str) for v in value)
-        has_num = any(isinstance(v, (int, float)) for v in value)
-        has_dict = any(isinstance(v, dict) for v in value)
-        if has_dict:
-            return TYPE_ARRAY_OBJECTS
-        if has_str and not has_num:
-            return TYPE_ARRAY_STRINGS
-        if has_num and not has_str:
-            return TYPE_ARRAY_NUMBERS
-        return TYPE_ARRAY_MIXED
+        return _detect_list_type(value)
     return TYPE_UNKNOWN
 
 
-# ---------------------- IN-MEMORY SCHEMA CACHE ----------------------
+# Element kinds seen in an array, as bit flags
+_ELEM_STR, _ELEM_NUM, _ELEM_DICT = 1, 2, 4
+_ELEM_BY_CLASS: Dict[type, int] = {
+    str: _ELEM_STR, int: _ELEM_NUM, float: _ELEM_NUM, bool: _ELEM_NUM, dict: _ELEM_DICT,
+}
+# Array type by the kinds seen (any dict returns array_of_objects early);
+# empty arrays and other-only elements are array_mixed
+_LIST_TYPE_BY_ELEMS = {
+    0: TYPE_ARRAY_MIXED,
+    _ELEM_STR: TYPE_ARRAY_STRINGS,
+    _ELEM_NUM: TYPE_ARRAY_NUMBERS,
+    _ELEM_STR | _ELEM_NUM: TYPE_ARRAY_MIXED,
+}
+
+
+def _detect_list_type(value: List[Any]) -> str:
+    """Classify an array in one pass over its elements."""
+    seen = 0
+    for v in value:
+        kind = _ELEM_BY_CLASS.get(type(v))
+        if kind is None:
+            kind = 0
+            if isinstance(v, str):
+                kind |= _ELEM_STR
+            if isinstance(v, (int, float)):
+                kind |= _ELEM_NUM
+            if isinstance(v, dict):
+                kind |= _ELEM_DICT
+        if kind & _ELEM_DICT:
+            return TYPE_ARRAY_OBJECTS  # dicts win regardless of the rest
+        seen |= kind
+    return _LIST_TYPE_BY_ELEMS[seen]
+
+
+# Priority for merging a field's types across sampled docs — higher = more
+# specific.  A plain dict: a MappingProxyType would make every lookup slower.
+_TYPE_PRIORITY: Dict[str, int] = {
+    TYPE_UNKNOWN: 0,
+    TYPE_STRING: 1,
+    TYPE_BOOL: 1,
+    TYPE_DATE: 2,
+    TYPE_INT: 2,
+    TYPE_FLOAT: 2,
+    TYPE_ARRAY_MIXED: 3,
+    TYPE_ARRAY_NUMBERS: 4,
+    TYPE_ARRAY_STRINGS: 4,
+    TYPE_ARRAY_OBJECTS: 5,
+    TYPE_OBJECT: 5,
+}
+
+# Field types whose values may not be JSON-safe as decoded (bytes and
+# ObjectIds sample as ``unknown``)
+_UNSAFE_JSON_TYPES = frozenset({TYPE_UNKNOWN, TYPE_DATE, TYPE_ARRAY_MIXED})
+
+
+def needs_sanitise(field_types: Optional[Dict[str, str]]) -> bool:
+    """Whether documents matching *field_types* may hold values that need
+    ``clean_documents`` to sanitise them (no schema → assume they do).
+
+    ``_id`` is ignored: ``clean_documents`` always stringifies it.
+    """
+    if not field_types:
+        return True
+    return any(
+        ftype in _UNSAFE_JSON_TYPES
+        for field, ftype in field_types.items() if field != "_id"
+    )
+
+
+# ---------------------- SCHEMA CACHE ----------------------
 
 SchemaResult = Tuple[List[str], List[str], Dict[str, str]]
 """(allowed_fields, numeric_fields, field_types)"""
 
-schema_cache: Dict[str, SchemaResult] = {}
+# Keyed by (uri, db, collection)
+schema_cache: Dict[Tuple[str, str, str], SchemaResult] = {}
+
+
+IndexResult = Tuple[List[Dict[str, Any]], Set[str]]
+"""(indexes, indexed_fields)"""
+
+# Indexes are looked up on every query, and can change behind our back
+# more readily than the sampled schema, so entries expire after a while.
+INDEX_CACHE_TTL_S = 300
+
+# Keyed by (uri, db, collection); values are (expires_at, IndexResult)
+index_cache: Dict[Tuple[str, str, str], Tuple[float, IndexResult]] = {}
+
+
+# Second tier: a SQLite file shared by every worker process, so a schema
+# sampled by one uvicorn worker is reused by the others instead of being
+# re-sampled N times.  Rows are keyed by a hash of (uri, db, collection) —
+# URIs carry credentials — and expire after SCHEMA_DISK_CACHE_TTL seconds.
+# The file lives in the user's cache directory (not the shared temp dir).
+# Set SCHEMA_DISK_CACHE_PATH=off to disable.
+SCHEMA_DISK_CACHE_TTL = 3600
+SCHEMA_DISK_CACHE_PATH = (
+    os.getenv("SCHEMA_DISK_CACHE_PATH", "").strip()
+    or os.path.join(
+        os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "nlp-mongodb-interface",
+        "schema_cache.sqlite3",
+    )
+)
+
+_disk_cache: Optional[sqlite3.Connection] = None
+_disk_cache_failed = False
+_disk_cache_lock = threading.Lock()
 
+# stored_at of the disk row each in-memory schema was loaded from / written
+# as; a mismatch means another worker cleared, invalidated or re-sampled it
+_schema_stored_at: Dict[Tuple[str, str, str], Optional[float]] = {}
 
-def _cache_key(uri: str, db: str, collection: str) -> str:
-    return f"{uri}-{db}-{collection}"
+# The shared row is re-read at most this often per key, so memory hits
+# normally skip SQLite; another worker's clear or re-sample is picked up
+# within this many seconds.
+SCHEMA_RECHECK_INTERVAL_S = 5.0
+# monotonic time each in-memory schema was last confirmed against disk
+_schema_checked_at: Dict[Tuple[str, str, str], float] = {}
 
 
-def clear_schema_cache() -> None:
-    """Remove all cached schemas."""
+def _get_disk_cache() -> Optional[sqlite3.Connection]:
+    """Open the disk cache once (purging expired rows); ``None`` if disabled."""
+    global _disk_cache, _disk_cache_failed
+    if _disk_cache is not None or _disk_cache_failed or SCHEMA_DISK_CACHE_PATH == "off":
+        return _disk_cache
+    try:
+        os.makedirs(os.path.dirname(SCHEMA_DISK_CACHE_PATH) or ".", mode=0o700, exist_ok=True)
+        conn = sqlite3.connect(SCHEMA_DISK_CACHE_PATH, timeout=1.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_cache "
+            "(key TEXT PRIMARY KEY, stored_at REAL, schema TEXT)"
+        )
+        conn.execute(
+            "DELETE FROM schema_cache WHERE stored_at < ?",
+            (time.time() - SCHEMA_DISK_CACHE_TTL,),
+        )
+        conn.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Schema disk cache %s unavailable: %s", SCHEMA_DISK_CACHE_PATH, e)
+        _disk_cache_failed = True
+        return None
+    _disk_cache = conn
+    return conn
+
+
+def _disk_key(key: Tuple[str, str, str]) -> str:
+    return hashlib.blake2b("\x00".join(key).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _disk_cache_execute(sql: str, params: Tuple[Any, ...] = ()) -> Optional[List[Any]]:
+    """Run one statement against the disk cache (committing writes);
+    ``None`` if the cache is disabled or the statement failed."""
+    conn = _get_disk_cache()
+    if conn is None:
+        return None
+    try:
+        with _disk_cache_lock:
+            rows = conn.execute(sql, params).fetchall()
+            conn.commit()
+    except sqlite3.Error as e:
+        logger.warning("Schema disk cache error: %s", e)
+        return None
+    return rows
+
+
+def _disk_cache_get(key: Tuple[str, str, str]) -> Optional[Tuple[float, SchemaResult]]:
+    """``(stored_at, schema)`` for *key*, or ``None`` if absent or expired."""
+    rows = _disk_cache_execute(
+        "SELECT stored_at, schema FROM schema_cache WHERE key = ?", (_disk_key(key),),
+    )
+    if not rows or time.time() - rows[0][0] > SCHEMA_DISK_CACHE_TTL:
+        return None
+    allowed_fields, numeric_fields, field_types = json.loads(rows[0][1])
+    return rows[0][0], (allowed_fields, numeric_fields, field_types)
+
+
+def _disk_cache_put(key: Tuple[str, str, str], result: SchemaResult) -> Optional[float]:
+    """Store *result*; returns its ``stored_at`` (``None`` if not stored)."""
+    stored_at = time.time()
+    rows = _disk_cache_execute(
+        "INSERT OR REPLACE INTO schema_cache VALUES (?, ?, ?)",
+        (_disk_key(key), stored_at, json.dumps(result)),
+    )
+    return None if rows is None else stored_at
+
+
+def _memory_schema_current(key: Tuple[str, str, str]) -> bool:
+    """Whether the in-memory schema for *key* still matches the shared
+    cache (always true when the disk cache is off, unreadable, or never
+    took the entry)."""
+    stored_at = _schema_stored_at.get(key)
+    if stored_at is None or _get_disk_cache() is None:
+        return True
+    now = time.monotonic()
+    if now - _schema_checked_at.get(key, 0.0) < SCHEMA_RECHECK_INTERVAL_S:
+        return True
+    rows = _disk_cache_execute(
+        "SELECT stored_at FROM schema_cache WHERE key = ?", (_disk_key(key),),
+    )
+    if rows is None:
+        return True
+    current = (
+        bool(rows)
+        and rows[0][0] == stored_at
+        and time.time() - rows[0][0] <= SCHEMA_DISK_CACHE_TTL
+    )
+    if current:
+        _schema_checked_at[key] = now
+    return current
+
+
+def clear_schema_cache(shared: bool = True) -> None:
+    """Remove all cached schemas (and index lookups).
+
+    With *shared* (the default) the disk cache is emptied too, which every
+    worker notices within ``SCHEMA_RECHECK_INTERVAL_S`` seconds;
+    ``shared=False`` only drops this process's copies.
+    """
     schema_cache.clear()
+    _schema_stored_at.clear()
+    _schema_checked_at.clear()
+    index_cache.clear()
+    if shared:
+        _disk_cache_execute("DELETE FROM schema_cache")
 
 
 def invalidate_schema(uri: str, db: str, collection: str) -> None:
-    """Remove a single collection from the cache."""
-    key = _cache_key(uri, db, collection)
+    """Remove a single collection from the cache (in every worker)."""
+    key = (uri, db, collection)
     schema_cache.pop(key, None)
+    _schema_stored_at.pop(key, None)
+    _schema_checked_at.pop(key, None)
+    index_cache.pop(key, None)
+    _disk_cache_execute("DELETE FROM schema_cache WHERE key = ?", (_disk_key(key),))
+
+
+# ---------------------- CLIENT POOL ----------------------
+
+# Schema sampling and index lookups are read-only and hit the same few
+# clusters repeatedly, so clients are kept per URI instead of paying the
+# TLS handshake + server discovery on every cache miss.  MongoClient is
+# thread-safe and pools its own connections.  URIs come from requests, so
+# the pool is a bounded LRU that closes the clients it evicts.
+def _new_client(mongo_uri: str) -> MongoClient:
+    return MongoClient(
+        mongo_uri,
+        serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+        **READ_ONLY_CLIENT_OPTIONS,
+    )
 
 
-# ---------------------- DOCUMENT FLATTENING ----------------------
+_clients = ClientLRU(_new_client, MAX_CACHED_CLIENTS)
 
-def flatten_document(doc: Dict[str, Any], parent_key: str = "", sep: str = ".") -> Dict[str, Any]:
-    """Recursively flatten a nested document into dot-notation keys.
 
-    - Nested dicts are expanded (unlimited depth).
-    - Arrays of **objects** are expanded: the first element's fields are
-      used to discover nested paths (MongoDB natively supports dot-notation
-      queries into arrays, e.g. ``options.type`` matches ``{options: [{type: "x"}]}``)
-    - Arrays of primitives are treated as terminal fields.
-    - ``_id`` is included so users can query and reference documents by id.
-    """
-    items: Dict[str, Any] = {}
-    for key, value in doc.items():
-        new_key = f"{parent_key}{sep}{key}" if parent_key else key
-        if isinstance(value, dict):
-            items.update(flatten_document(value, new_key, sep))
-        elif isinstance(value, list) and value:
-            # Check if the array contains dicts (array of embedded documents)
-            dict_elements = [el for el in value if isinstance(el, dict)]
-            if dict_elements:
-                # Flatten all dict elements to discover all possible fields
-                for el in dict_elements:
-                    items.update(flatten_document(el, new_key, sep))
-            else:
-                # Array of primitives — treat as terminal
-                items[new_key] = value
-        else:
-            items[new_key] = value
-    return items
+def _get_client(mongo_uri: str) -> MongoClient:
+    """Return the cached read-only MongoClient for *mongo_uri*, creating it once."""
+    return _clients.get(mongo_uri)
+
+
+atexit.register(_clients.close_all)
 
 
 # ---------------------- SCHEMA SAMPLING ----------------------
 
+# Sampling only needs each value's *type*, so the server blanks top-level
+# strings to "" and binary payloads to null (both classify exactly as the
+# originals) before the documents go over the wire — long text and
+# embedded blobs are usually most of a sample's bytes.
+_SAMPLE_SHAPE_STAGE = {"$replaceRoot": {"newRoot": {"$arrayToObject": {"$map": {
+    "input": {"$objectToArray": "$$ROOT"},
+    "in": {"k": "$$this.k", "v": {"$switch": {
+        "branches": [
+            {"case": {"$eq": [{"$type": "$$this.v"}, "string"]}, "then": ""},
+            {"case": {"$eq": [{"$type": "$$this.v"}, "binData"]}, "then": None},
+        ],
+        "default": "$$this.v",
+    }}},
+}}}}}
+
+
+def _sample_documents(collection, sample_size: int) -> List[Dict[str, Any]]:
+    """*sample_size* random documents, with type-irrelevant payload trimmed.
+
+    ``$sample`` spreads the sample over the whole collection, so optional
+    fields that only later documents carry are still discovered (the first
+    N in natural order are often all from one early import).
+    """
+    try:
+        return list(collection.aggregate(
+            [{"$sample": {"size": sample_size}}, _SAMPLE_SHAPE_STAGE],
+            batchSize=sample_size,
+            allowDiskUse=False,
+        ))
+    except OperationFailure as e:
+        # e.g. servers without $objectToArray, or keys $arrayToObject rejects
+        logger.debug("Random schema sample failed (%s) — using plain find", e)
+        return list(collection.find().limit(sample_size))
+
+
 def get_collection_schema(
     mongo_uri: str,
     database_name: str,
@@ -146,53 +415,28 @@ def get_collection_schema(
     sub-fields AND the parent ``field`` itself is recorded with type
     ``array_of_objects`` so the compiler can apply ``$elemMatch`` etc.
     """
-    client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-    try:
-        db = client[database_name]
-        collection = db[collection_name]
-
-        cursor = collection.find().limit(sample_size)
-        docs = list(cursor)
-    finally:
-        client.close()
+    collection = _get_client(mongo_uri)[database_name][collection_name]
+    docs = _sample_documents(collection, sample_size)
 
     if not docs:
         return [], [], {}
 
-    all_fields: Set[str] = set()
-    numeric_fields: Set[str] = set()
+    # dicts used as insertion-ordered sets (values unused)
+    all_fields: Dict[str, Any] = {}
+    numeric_fields: Dict[str, None] = {}
     field_types: Dict[str, str] = {}
 
-    # Priority for type merging — higher = more specific
-    _type_priority = {
-        TYPE_UNKNOWN: 0,
-        TYPE_STRING: 1,
-        TYPE_BOOL: 1,
-        TYPE_DATE: 2,
-        TYPE_INT: 2,
-        TYPE_FLOAT: 2,
-        TYPE_ARRAY_MIXED: 3,
-        TYPE_ARRAY_NUMBERS: 4,
-        TYPE_ARRAY_STRINGS: 4,
-        TYPE_ARRAY_OBJECTS: 5,
-        TYPE_OBJECT: 5,
-    }
-
+    numeric = (int, float)
     for doc in docs:
-        # Detect raw (pre-flatten) types for top-level and nested fields
-        _detect_field_types_recursive(doc, "", field_types, _type_priority)
-
-        # Flatten for field discovery
-        flat = flatten_document(doc)
+        # One walk records the type of every field and collects the
+        # doc's dot-notation leaves for field discovery
+        flat: Dict[str, Any] = {}
+        _walk_fields(doc, "", field_types, _TYPE_PRIORITY, flat)
+        all_fields.update(flat)  # keys repeat across docs; merge in C
         for field, value in flat.items():
-            all_fields.add(field)
-            if isinstance(value, (int, float)) and not isinstance(value, bool):
-                numeric_fields.add(field)
-            # Also track types for flattened sub-fields
-            ftype = _detect_type(value)
-            existing = field_types.get(field)
-            if existing is None or _type_priority.get(ftype, 0) > _type_priority.get(existing, 0):
-                field_types[field] = ftype
+            # bool can't be subclassed, so an exact type check suffices
+            if isinstance(value, numeric) and type(value) is not bool:
+                numeric_fields[field] = None
 
     sorted_fields = sorted(all_fields)
     sorted_numeric = sorted(numeric_fields)
@@ -205,18 +449,27 @@ def get_collection_schema(
     return sorted_fields, sorted_numeric, field_types
 
 
-def _detect_field_types_recursive(
+def _walk_fields(
     doc: Dict[str, Any],
     parent_key: str,
     field_types: Dict[str, str],
     priority: Dict[str, int],
+    flat: Dict[str, Any],
     sep: str = ".",
 ) -> None:
-    """Walk a document recursively and record the type of every field.
+    """Walk a document recursively, recording the type of every field and
+    filling *flat* with its dot-notation leaves.
+
+    - Nested dicts are expanded (unlimited depth).
+    - Arrays of **objects** are expanded: every element's fields are used
+      to discover nested paths (MongoDB natively supports dot-notation
+      queries into arrays, e.g. ``options.type`` matches ``{options: [{type: "x"}]}``)
+    - Arrays of primitives are treated as terminal fields.
+    - ``_id`` is included so users can query and reference documents by id.
 
-    This handles nested dicts and arrays so that *parent* array fields
-    (e.g. ``options``) are correctly tagged as ``array_of_strings`` even
-    though ``flatten_document`` doesn't keep the parent key.
+    Every key is typed, including the *parent* of nested dicts and arrays
+    (e.g. ``options`` tagged ``array_of_strings``), which *flat* doesn't
+    keep.
     """
     for key, value in doc.items():
         full_key = f"{parent_key}{sep}{key}" if parent_key else key
@@ -225,13 +478,15 @@ def _detect_field_types_recursive(
         if existing is None or priority.get(ftype, 0) > priority.get(existing, 0):
             field_types[full_key] = ftype
         # Recurse into nested dicts
-        if isinstance(value, dict):
-            _detect_field_types_recursive(value, full_key, field_types, priority, sep)
+        if ftype == TYPE_OBJECT:
+            _walk_fields(value, full_key, field_types, priority, flat, sep)
         # Recurse into array elements that are dicts
-        elif isinstance(value, list):
+        elif ftype == TYPE_ARRAY_OBJECTS:
             for el in value:
                 if isinstance(el, dict):
-                    _detect_field_types_recursive(el, full_key, field_types, priority, sep)
+                    _walk_fields(el, full_key, field_types, priority, flat, sep)
+        else:
+            flat[full_key] = value
 
 
 # ---------------------- CACHED SCHEMA ACCESS ----------------------
@@ -246,15 +501,28 @@ def get_cached_schema(
 
     Returns ``(allowed_fields, numeric_fields, field_types)``.
     """
-    key = _cache_key(uri, db, collection)
+    key = (uri, db, collection)
 
     if key in schema_cache:
-        logger.info("Schema cache HIT for %s.%s", db, collection)
-        return schema_cache[key]
+        if _memory_schema_current(key):
+            logger.info("Schema cache HIT for %s.%s", db, collection)
+            return schema_cache[key]
+        # cleared, invalidated or re-sampled through another worker
+        del schema_cache[key]
+
+    entry = _disk_cache_get(key)
+    if entry is not None:
+        logger.info("Schema disk cache HIT for %s.%s", db, collection)
+        _schema_stored_at[key], result = entry
+        _schema_checked_at[key] = time.monotonic()
+        schema_cache[key] = result
+        return result
 
     logger.info("Schema cache MISS for %s.%s — sampling…", db, collection)
     result = get_collection_schema(uri, db, collection, sample_size)
     schema_cache[key] = result
+    _schema_stored_at[key] = _disk_cache_put(key, result)
+    _schema_checked_at[key] = time.monotonic()
     return result
 
 
@@ -272,14 +540,8 @@ def get_collection_indexes(
     - ``keys``: list of ``(field, direction)`` pairs
     - ``unique``: whether the index enforces uniqueness
     """
-    client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-    try:
-        db = client[database_name]
-        collection = db[collection_name]
-
-        raw_indexes = collection.index_information()
-    finally:
-        client.close()
+    collection = _get_client(mongo_uri)[database_name][collection_name]
+    raw_indexes = collection.index_information()
 
     indexes: List[Dict[str, Any]] = []
     for name, info in raw_indexes.items():
@@ -293,12 +555,29 @@ def get_collection_indexes(
 
 
 def get_indexed_fields(indexes: List[Dict[str, Any]]) -> Set[str]:
-    """Extract the set of indexed field names from index descriptions."""
-    fields: Set[str] = set()
-    for idx in indexes:
-        for key_pair in idx.get("keys", []):
-            if isinstance(key_pair, (list, tuple)) and len(key_pair) >= 1:
-                fields.add(str(key_pair[0]))
-            elif isinstance(key_pair, str):
-                fields.add(key_pair)
-    return fields
+    """Extract the set of indexed field names from index descriptions.
+
+    ``index_information()`` always gives keys as ``(field, direction)``
+    pairs; bare field-name strings (hand-built descriptions) are accepted
+    too, without slicing them down to their first character.
+    """
+    return {
+        key if type(key) is str else key[0]
+        for idx in indexes for key in idx.get("keys", ())
+    }
+
+
+def get_cached_indexes(uri: str, db: str, collection: str) -> IndexResult:
+    """Return ``(indexes, indexed_fields)`` for the collection, looking the
+    indexes up at most once per ``INDEX_CACHE_TTL_S``."""
+    key = (uri, db, collection)
+    now = time.monotonic()
+
+    entry = index_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    indexes = get_collection_indexes(uri, db, collection)
+    result = (indexes, get_indexed_fields(indexes))
+    index_cache[key] = (now + INDEX_CACHE_TTL_S, result)
+    return result